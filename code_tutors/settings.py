@@ -93,9 +93,47 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Take the write lock when a transaction begins, so a meeting's overlap
+        # check and insert cannot interleave with another booking's
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+        # A file rather than shared-cache memory, whose table locks fail at once instead of waiting
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Tests use a dummy cache so cached pages never leak between test cases.
+
+if ENVIRONMENT == 'production':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'cache',
+        }
+    }
+elif ENVIRONMENT == 'test':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# How long, in seconds, a computed dashboard context stays cached
+DASHBOARD_CACHE_TIMEOUT = 60 * 60
+
+# Where `seed --snapshot` saves, and `seed --restore` loads, database snapshots
+SEED_SNAPSHOT_DIR = BASE_DIR / 'snapshots'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
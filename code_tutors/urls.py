@@ -33,11 +33,14 @@ urlpatterns = [
     path('password/', views.PasswordView.as_view(), name='password'),
     path('profile/', views.ProfileUpdateView.as_view(), name='profile'),
     path('submit_review/', views.submit_review, name='submit_review'),
+    path('feeds/<str:token>/meetings.ics', views.meeting_feed, name='meeting_feed'),
 
     # ADMIN paths
     path('dashboard/lesson-request/', views.create_lesson_request, name='lesson_request'),
     path('dashboard/view-lesson-request/', views.view_lesson_request, name='view_lesson_request'),
     path('schedule-session/<int:student_id>/', views.schedule_session, name='schedule_session'),
+    path('schedule-session/all/', views.schedule_all_sessions, name='schedule_all_sessions'),
+    path('schedule-session/free-tutors/', views.free_tutors, name='free_tutors'),
     path('list/<str:list_type>/', views.user_list, name='user_list'),
 
     # TUTOR paths
@@ -45,6 +48,7 @@ urlpatterns = [
     path('tutor/hourly-rate/save', views.tutor_hourly_rate, name='tutor_hourly_rate'),
     path('tutor/subjects/save', views.tutor_subjects, name='tutor_subjects'),
     path('tutor/save-lesson-notes/', views.save_lesson_notes, name='save_lesson_notes'),
+    path('tutor/calendar/<int:year>/<int:month>/', views.tutor_calendar_json, name='tutor_calendar_json'),
 
     # STUDENT paths
 ]
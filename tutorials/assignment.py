@@ -0,0 +1,185 @@
+from datetime import date, datetime, timedelta
+from itertools import islice
+import numpy as np
+from django.db import transaction
+from django.db.models import Subquery
+from .availability import WEEKDAYS, AvailabilityMatrix, to_minutes
+from .matching import base_scores, ranked
+from .models import Lesson, Meeting
+from .scheduling import IntervalIndex, bulk_book_meetings
+from .seed_utils import purge_queryset
+from .stats import count_rows
+from .subjects import normalise_subject
+from .terms import next_occurrence, term_meetings
+
+# Free tutor-days tried per lesson before it is left unplaced, and of
+# those, how many blocked ones may be freed by moving the lesson holding them
+SCAN_LIMIT = 1000
+OPTIONS_PER_LESSON = 10
+# Tutors checked against the matrix at a time; most lessons are placed within the first batch
+OPTION_BATCH = 256
+
+def lesson_end_time(lesson):
+    return (datetime.combine(date.min, lesson.start_time) + timedelta(minutes=lesson.duration)).time()
+
+class AssignmentPlanner:
+    """
+    Assigns lesson requests to tutors and weekdays without double-booking anyone.
+
+    Each lesson can go to any of its requested days with a tutor who
+    teaches the subject, is free for the whole lesson that day and has no
+    upcoming meeting then. Lessons take the best such option, by rate and
+    load, that no already placed lesson overlaps; a lesson whose options
+    are all taken may displace the one lesson blocking an option, if that
+    lesson can move to another of its own (an augmenting path, as in
+    bipartite matching, over each tutor-day's time capacity).
+    """
+
+    def __init__(self, matrix, student_meetings=(), max_depth=2):
+        self.matrix = matrix
+        self.base_scores = base_scores(matrix)
+        # Subject -> rows of its tutors, best rate and load first
+        self.by_subject = {}
+        # Students' existing meetings by weekday, since the lessons repeat weekly;
+        # the tutors' are already in the matrix
+        self.student_busy = IntervalIndex()
+        for student_id, meeting_date, start, end in student_meetings:
+            self.student_busy.add((student_id, WEEKDAYS[meeting_date.weekday()]), to_minutes(start), to_minutes(end))
+        self.max_depth = max_depth
+        self.assignments = {}
+        # (tutor id or student id, weekday) -> [(start, end, lesson)] placed by this planner
+        self.tutor_days = {}
+        self.student_days = {}
+
+    def subject_rows(self, subject):
+        if subject not in self.by_subject:
+            rows = self.matrix.subject_rows(subject)
+            self.by_subject[subject] = ranked(self.matrix, rows, self.base_scores[rows])
+        return self.by_subject[subject]
+
+    def options(self, lesson):
+        """Yield the (tutor id, day) pairs the lesson could take, best first."""
+
+        start, end = self.span(lesson)
+        days = [
+            day for day in dict.fromkeys(lesson.days)
+            if day in WEEKDAYS and not self.student_busy.overlaps((lesson.student_id, day), start, end)
+        ]
+        if not days:
+            return
+        rows = self.subject_rows(normalise_subject(lesson.knowledge_area))
+        for offset in range(0, len(rows), OPTION_BATCH):
+            batch = rows[offset:offset + OPTION_BATCH]
+            fits = np.zeros((len(batch), len(days)), dtype=bool)
+            for column, day in enumerate(days):
+                available, booked = self.matrix.fit(batch, day, start, end)
+                fits[:, column] = available & ~booked
+            # Row-major, so each tutor's days are tried before the next tutor's
+            for position, column in zip(*(indices.tolist() for indices in np.nonzero(fits))):
+                yield int(self.matrix.tutor_ids[batch[position]]), days[column]
+
+    def span(self, lesson):
+        start = to_minutes(lesson.start_time)
+        return start, start + lesson.duration
+
+    def blockers(self, lesson, tutor_id, day):
+        start, end = self.span(lesson)
+        blockers = set()
+        for placed in [self.tutor_days.get((tutor_id, day), ()), self.student_days.get((lesson.student_id, day), ())]:
+            for other_start, other_end, other in placed:
+                if other_start < end and start < other_end:
+                    blockers.add(other)
+        return blockers
+
+    def place(self, lesson, tutor_id, day):
+        slot = (*self.span(lesson), lesson)
+        self.tutor_days.setdefault((tutor_id, day), []).append(slot)
+        self.student_days.setdefault((lesson.student_id, day), []).append(slot)
+        self.assignments[lesson] = (tutor_id, day)
+
+    def unplace(self, lesson):
+        tutor_id, day = self.assignments.pop(lesson)
+        for placed in [self.tutor_days[(tutor_id, day)], self.student_days[(lesson.student_id, day)]]:
+            placed[:] = [slot for slot in placed if slot[2] is not lesson]
+
+    def assign(self, lesson, visited, depth):
+        blocked = []
+        for tutor_id, day in islice(self.options(lesson), SCAN_LIMIT):
+            if not self.blockers(lesson, tutor_id, day):
+                self.place(lesson, tutor_id, day)
+                return True
+            if len(blocked) < OPTIONS_PER_LESSON:
+                blocked.append((tutor_id, day))
+        if depth == 0:
+            return False
+
+        for tutor_id, day in blocked:
+            blockers = self.blockers(lesson, tutor_id, day)
+            if len(blockers) != 1:
+                continue
+            blocker = blockers.pop()
+            # Only another of the tutor's lessons can move; the student's own lessons are theirs either way
+            if blocker in visited or blocker.student_id == lesson.student_id:
+                continue
+            visited.add(blocker)
+            previous = self.assignments[blocker]
+            self.unplace(blocker)
+            self.place(lesson, tutor_id, day)
+            if self.assign(blocker, visited, depth - 1):
+                return True
+            self.unplace(lesson)
+            self.place(blocker, *previous)
+        return False
+
+    def plan(self, lessons):
+        """Return {lesson: (tutor id, day)} for every lesson that could be placed, oldest requests first."""
+
+        for lesson in lessons:
+            self.assign(lesson, {lesson}, self.max_depth)
+        return self.assignments
+
+def build_meeting(lesson, tutor_id, day, start_date):
+    return Meeting(
+        tutor_id=tutor_id,
+        student_id=lesson.student_id,
+        date=next_occurrence(start_date, day),
+        day=day,
+        start_time=lesson.start_time,
+        end_time=lesson_end_time(lesson),
+        time_of_day=lesson.time_of_day or 'morning',
+        topic=lesson.get_knowledge_area_display(),
+        status='scheduled',
+        notes=lesson.notes or '',
+    )
+
+def assign_outstanding_lessons(start_date=None, dry_run=False):
+    """
+    Schedule every outstanding lesson request that can be placed, in one transaction.
+
+    Each placed request becomes a meeting on its weekday every week of its
+    term from start_date, all written with one bulk insert, and the request
+    is removed as schedule_session does. Returns the meetings and the
+    requests that could not be placed; with dry_run nothing is written.
+    """
+
+    start_date = start_date or date.today()
+    with transaction.atomic():
+        lessons = list(Lesson.objects.filter(start_time__isnull=False).order_by('created_at', 'id'))
+        student_meetings = Meeting.objects.filter(status='scheduled', date__gte=start_date).filter(
+            student_id__in=Subquery(Lesson.objects.values('student_id'))
+        ).values_list('student_id', 'date', 'start_time', 'end_time')
+        planner = AssignmentPlanner(AvailabilityMatrix.build(start_date), student_meetings)
+        assignments = planner.plan(lessons)
+
+        # The planner kept each weekday clear of every upcoming meeting, so the whole term is free
+        meetings = [
+            meeting
+            for lesson, (tutor_id, day) in sorted(assignments.items(), key=lambda item: item[0].id)
+            for meeting in term_meetings(build_meeting(lesson, tutor_id, day, start_date), lesson.term, [day])
+        ]
+        if not dry_run:
+            bulk_book_meetings(meetings)
+            # Purged without per-row signals, so the lessons are uncounted as a batch
+            purge_queryset(Lesson.objects.filter(id__in=[lesson.id for lesson in assignments]), log=lambda message: None)
+            count_rows(Lesson, assignments, -1)
+    return meetings, [lesson for lesson in lessons if lesson not in assignments]
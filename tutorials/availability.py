@@ -0,0 +1,251 @@
+import time
+from datetime import date
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from .dashboard_cache import bump_dashboard_version_on_commit
+from .models import Meeting, TutorAvailability, TutorProfile, User
+from .subjects import normalise_subject, taught_subjects
+
+AVAILABILITY_VERSION_KEY = 'availability-matrix-version'
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+AVAILABILITY_DAYS = dict(zip(
+    ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'], WEEKDAYS
+))
+# The grid of Lesson.TIME_CHOICES, over the whole day
+SLOT_MINUTES = 10
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+def get_availability_version():
+    return cache.get_or_set(AVAILABILITY_VERSION_KEY, time.time_ns, timeout=None)
+
+def bump_availability_version():
+    """Make every process rebuild its availability matrix, returning the new version if it follows on from the old one."""
+
+    try:
+        return cache.incr(AVAILABILITY_VERSION_KEY)
+    except ValueError:
+        cache.set(AVAILABILITY_VERSION_KEY, time.time_ns(), timeout=None)
+        return None
+
+def to_minutes(value):
+    return value.hour * 60 + value.minute
+
+def minute_span(start, end, cover=False):
+    """Return the [first, last) slots wholly inside start to end minutes, or with cover every slot they touch."""
+
+    if cover:
+        return start // SLOT_MINUTES, -(-end // SLOT_MINUTES)
+    return -(-start // SLOT_MINUTES), end // SLOT_MINUTES
+
+def slot_span(start_time, end_time, cover=False):
+    return minute_span(to_minutes(start_time), to_minutes(end_time), cover)
+
+class AvailabilityMatrix:
+    """
+    Every tutor's weekly free and booked time, as NumPy arrays of 10-minute slots.
+
+    free and booked have a row per tutor, a column per weekday and a cell
+    per slot of the day. free counts the availability slots covering each
+    cell and booked the upcoming scheduled meetings touching it, counts
+    rather than flags so one slot or meeting can be taken off without
+    rereading the rest. Whether each tutor is free for a lesson is then
+    one AND over the cells it needs, for all tutors at once. The rates,
+    subjects and meeting loads alongside make it the one in-memory copy
+    that both the free tutor lookups and matching read.
+    """
+
+    def __init__(self, tutors, subjects, slots, meetings, today):
+        tutors = list(tutors)
+        self.today = today
+        self.tutor_ids = np.array([tutor[0] for tutor in tutors], dtype=np.int64)
+        self.names = [(username, f"{first_name} {last_name}") for _, username, first_name, last_name, _ in tutors]
+        self.rows = {tutor_id: row for row, tutor_id in enumerate(self.tutor_ids.tolist())}
+        shape = (len(tutors), len(WEEKDAYS), SLOTS_PER_DAY)
+        self.free = np.zeros(shape, dtype=np.int8)
+        self.booked = np.zeros(shape, dtype=np.int16)
+        # Rates as given for display, and as floats with NaN for none for scoring
+        self.hourly_rates = [tutor[4] for tutor in tutors]
+        self.rates = np.array([np.nan if rate is None else float(rate) for rate in self.hourly_rates], dtype=np.float64)
+        # Upcoming scheduled meetings per tutor
+        self.loads = np.zeros(len(tutors), dtype=np.int32)
+
+        # Normalised subject, and knowledge area it covers -> which rows teach it
+        self.subjects = {}
+        for tutor_id, subject in subjects:
+            if tutor_id in self.rows:
+                for name in taught_subjects(subject):
+                    self.subject_mask(name)[self.rows[tutor_id]] = True
+        for tutor_id, day, start, end in slots:
+            self.add_availability(tutor_id, day, start, end)
+        for tutor_id, meeting_date, start, end in meetings:
+            self.add_meeting(tutor_id, meeting_date, start, end)
+
+    @classmethod
+    def build(cls, today):
+        """Load the matrix from the database, in four queries."""
+
+        return cls(
+            User.objects.filter(user_type='Tutor').order_by('id').values_list(
+                'id', 'username', 'first_name', 'last_name', 'tutor_profile__hourly_rate'
+            ),
+            TutorProfile.subject_index.through.objects.values_list('tutorprofile__tutor_id', 'subject__name'),
+            TutorAvailability.objects.filter(is_available=True).values_list('tutor_id', 'day', 'start_time', 'end_time'),
+            Meeting.objects.filter(status='scheduled', date__gte=today).values_list(
+                'tutor_id', 'date', 'start_time', 'end_time'
+            ),
+            today,
+        )
+
+    def subject_mask(self, subject):
+        if subject not in self.subjects:
+            self.subjects[subject] = np.zeros(len(self.tutor_ids), dtype=bool)
+        return self.subjects[subject]
+
+    def subject_rows(self, subject):
+        """Return the rows of the tutors teaching a subject, or of every tutor for None."""
+
+        if subject is None:
+            return np.arange(len(self.tutor_ids))
+        mask = self.subjects.get(normalise_subject(subject))
+        return np.flatnonzero(mask) if mask is not None else np.arange(0)
+
+    def add_availability(self, tutor_id, day, start_time, end_time, delta=1):
+        """Add, or with delta=-1 remove, an availability slot ('Monday'...). Return False if the tutor has no row."""
+
+        if tutor_id not in self.rows:
+            return False
+        if day in AVAILABILITY_DAYS:
+            first, last = slot_span(start_time, end_time)
+            self.free[self.rows[tutor_id], WEEKDAYS.index(AVAILABILITY_DAYS[day]), first:last] += delta
+        return True
+
+    def add_meeting(self, tutor_id, meeting_date, start_time, end_time, delta=1):
+        """Add, or with delta=-1 remove, a scheduled meeting. Return False if the tutor has no row."""
+
+        if tutor_id not in self.rows:
+            return False
+        if meeting_date >= self.today:
+            row = self.rows[tutor_id]
+            first, last = slot_span(start_time, end_time, cover=True)
+            self.booked[row, meeting_date.weekday(), first:last] += delta
+            self.loads[row] += delta
+        return True
+
+    def set_profile(self, tutor_id, hourly_rate, subjects):
+        """Replace a tutor's rate and normalised subjects. Return False if the tutor has no row."""
+
+        if tutor_id not in self.rows:
+            return False
+        row = self.rows[tutor_id]
+        self.hourly_rates[row] = hourly_rate
+        self.rates[row] = np.nan if hourly_rate is None else float(hourly_rate)
+        for mask in self.subjects.values():
+            mask[row] = False
+        for subject in subjects:
+            for name in taught_subjects(subject):
+                self.subject_mask(name)[row] = True
+        return True
+
+    def fit(self, rows, day, start, end):
+        """
+        Return, for each of rows, whether the tutor is available for all of
+        start to end minutes on a weekday, and whether they are booked during any of it.
+        """
+
+        first, last = minute_span(start, end, cover=True)
+        day = WEEKDAYS.index(day)
+        if first >= last or last > SLOTS_PER_DAY:
+            return np.zeros(len(rows), dtype=bool), np.zeros(len(rows), dtype=bool)
+        return (self.free[rows, day, first:last] > 0).all(axis=1), (self.booked[rows, day, first:last] > 0).any(axis=1)
+
+    def free_tutors(self, day, start_time, end_time, subject=None):
+        """
+        Return the tutors available and not booked for the whole of a weekly slot, in id order.
+
+        day is 'mon'...'sun'; with a subject, only the tutors teaching it
+        are considered.
+        """
+
+        rows = self.subject_rows(subject)
+        available, booked = self.fit(rows, day, to_minutes(start_time), to_minutes(end_time))
+        return [{
+            'tutor_id': int(self.tutor_ids[row]),
+            'username': self.names[row][0],
+            'full_name': self.names[row][1],
+        } for row in rows[available & ~booked].tolist()]
+
+_cached_matrix = (None, None)
+
+def get_availability_matrix():
+    """Return this process's availability matrix, rebuilding it when another process has changed it or the day has."""
+
+    global _cached_matrix
+    key = (get_availability_version(), date.today())
+    if _cached_matrix[0] != key:
+        _cached_matrix = (key, AvailabilityMatrix.build(key[1]))
+    return _cached_matrix[1]
+
+def update_availability_matrix(change):
+    """
+    Apply change to this process's matrix once the transaction commits, and make other processes rebuild theirs.
+
+    change takes the matrix and returns False if it cannot be applied, as
+    for a tutor added since it was built; the matrix is then dropped. It
+    is also dropped if its version was not the one just bumped from, as
+    it would otherwise miss another process's change.
+    """
+
+    def apply():
+        global _cached_matrix
+        key, matrix = _cached_matrix
+        version = bump_availability_version()
+        if matrix is not None and version is not None and key == (version - 1, date.today()) and change(matrix):
+            _cached_matrix = ((version, key[1]), matrix)
+        else:
+            _cached_matrix = (None, None)
+
+    transaction.on_commit(apply)
+
+def invalidate_availability_matrix():
+    update_availability_matrix(lambda matrix: False)
+
+def save_weekly_availability(tutor, slots):
+    """
+    Make a tutor's availability exactly slots, a set of (day, start_time, end_time).
+
+    Only the differences are written, in one transaction so a reader sees
+    the old week or the new one and never an empty one: new slots are bulk
+    created, kept slots stored as unavailable are switched back on and
+    dropped slots deleted in one statement. The bulk writes skip the model
+    signals, so the dashboard and matrix are updated here; the delete
+    sends its own. Returns the numbers created, updated and deleted.
+    """
+
+    with transaction.atomic():
+        existing = {
+            (slot.day, slot.start_time, slot.end_time): slot
+            for slot in TutorAvailability.objects.filter(tutor=tutor)
+        }
+        created = [
+            TutorAvailability(tutor=tutor, day=day, start_time=start_time, end_time=end_time, is_available=True)
+            for day, start_time, end_time in slots
+            if (day, start_time, end_time) not in existing
+        ]
+        updated = [slot for key, slot in existing.items() if key in slots and not slot.is_available]
+        for slot in updated:
+            slot.is_available = True
+        deleted = [slot.pk for key, slot in existing.items() if key not in slots]
+
+        if deleted:
+            TutorAvailability.objects.filter(pk__in=deleted).delete()
+        TutorAvailability.objects.bulk_create(created)
+        TutorAvailability.objects.bulk_update(updated, ['is_available'])
+
+        added = [(slot.day, slot.start_time, slot.end_time) for slot in created + updated]
+        if added:
+            bump_dashboard_version_on_commit(tutor.pk)
+            update_availability_matrix(lambda matrix: all(
+                matrix.add_availability(tutor.pk, day, start_time, end_time) for day, start_time, end_time in added
+            ))
+    return len(created), len(updated), len(deleted)
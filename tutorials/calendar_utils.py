@@ -1,69 +1,129 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import groupby
 import calendar
+from .models import Meeting
+
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+@lru_cache(maxsize=128)
+def month_skeleton(year, month):
+    """Return the month's weeks as tuples of dates, with None padding days outside it. Memoised per month."""
+
+    return tuple(
+        tuple(date(year, month, day) if day else None for day in week)
+        for week in calendar.monthcalendar(year, month)
+    )
+
+def meeting_cell(meeting):
+    """Return the calendar entry for a meeting."""
+
+    return {
+        'id': meeting.id, 
+        'start': meeting.start_time.strftime('%H:%M'),
+        'end': meeting.end_time.strftime('%H:%M'),
+        'topic': meeting.topic,
+        'student_name': f"{meeting.student.first_name} {meeting.student.last_name}",
+        'status': meeting.status,
+        'notes': meeting.notes or '',
+        'type': 'meeting'
+    }
+
+def day_cell(day, meetings, today):
+    return {
+        'day': day.day,
+        'date': day,
+        'is_current_month': True,
+        'is_today': day == today,
+        'slots': [],
+        'meetings': meetings,
+        'weekday': WEEKDAY_NAMES[day.weekday()]
+    }
+
+def empty_cell():
+    return {
+        'day': '',
+        'is_current_month': False,
+        'slots': [],
+        'meetings': []
+    }
 
 class TutorCalendar:
     def __init__(self, year=None, month=None):
         self.year = year or datetime.now().year
         self.month = month or datetime.now().month
-        
+
+    @staticmethod
+    def month_range(year, month):
+        """Return the first and last date of a month."""
+
+        return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+    @staticmethod
+    def week_range(day):
+        """Return the Monday and Sunday of the week containing day."""
+
+        monday = day - timedelta(days=day.weekday())
+        return monday, monday + timedelta(days=6)
+
+    @staticmethod
+    def get_meetings(start, end, **filters):
+        """Return the meetings between start and end inclusive, with their students, in one indexed query."""
+
+        return Meeting.objects.filter(date__range=(start, end), **filters).select_related('student')
+
+    @staticmethod
+    def iter_days(start, end, meetings, today=None):
+        """
+        Lazily yield a day cell for every date from start to end inclusive.
+
+        meetings must be ordered by date, as Meeting querysets are by default,
+        so they can be merged into the days in one pass without being held in
+        memory; pass queryset.iterator() to stream spans of many months.
+        """
+
+        today = today or date.today()
+        by_date = groupby(meetings, key=lambda meeting: meeting.date)
+        next_date, next_meetings = next(by_date, (None, ()))
+        day = start
+        while day <= end:
+            while next_date is not None and next_date < day:
+                next_date, next_meetings = next(by_date, (None, ()))
+            day_meetings = [meeting_cell(meeting) for meeting in next_meetings] if next_date == day else []
+            yield day_cell(day, day_meetings, today)
+            day += timedelta(days=1)
+
+    @classmethod
+    def iter_weeks(cls, start, end, meetings, today=None):
+        """Lazily yield the days from start to end as Monday-first weeks, padded with empty cells."""
+
+        week = [empty_cell() for _ in range(start.weekday())]
+        for cell in cls.iter_days(start, end, meetings, today):
+            week.append(cell)
+            if len(week) == 7:
+                yield week
+                week = []
+        if week:
+            yield week + [empty_cell() for _ in range(7 - len(week))]
+
     def get_calendar_data(self, availability_slots, meetings):
-        # Get the calendar for current month
-        cal = calendar.monthcalendar(self.year, self.month)
-        month_name = calendar.month_name[self.month]
-        today = datetime.now()
-        
-        meetings = meetings or []
+        today = date.today()
+
         meetings_dict = {}
-        for meeting in meetings:
-            date_key = meeting.date.day
-            if date_key not in meetings_dict:
-                meetings_dict[date_key] = []
-
-            meetings_dict[date_key].append({
-                'id': meeting.id, 
-                'start': meeting.start_time.strftime('%H:%M'),
-                'end': meeting.end_time.strftime('%H:%M'),
-                'topic': meeting.topic,
-                'student_name': f"{meeting.student.first_name} {meeting.student.last_name}",
-                'status': meeting.status,
-                'notes': meeting.notes or '',
-                'type': 'meeting'
-            })
-
-        # Process calendar weeks
-        processed_calendar = []
-        for week in cal:
-            week_data = []
-            for day in week:
-                if day == 0:
-                    week_data.append({
-                        'day': '',
-                        'is_current_month': False,
-                        'slots': [],
-                        'meetings': []
-                    })
-                else:
-                    date = datetime(self.year, self.month, day)
-                    weekday = date.strftime('%A')
-                    
-                    # Prioritize meetings over availability slots
-                    day_meetings = meetings_dict.get(day, [])
-                    # day_slots = [] if day in meetings_dict else availability_dict.get(day, [])
-                    
-                    week_data.append({
-                        'day': day,
-                        'is_current_month': True,
-                        'is_today': datetime.now().date() == date.date(),
-                        'slots': [],
-                        'meetings': day_meetings,
-                        'weekday': weekday
-                    })
-                    
-            processed_calendar.append(week_data)
-            
+        for meeting in meetings or []:
+            meetings_dict.setdefault(meeting.date.day, []).append(meeting_cell(meeting))
+
+        processed_calendar = [
+            [
+                day_cell(day, meetings_dict.get(day.day, []), today) if day else empty_cell()
+                for day in week
+            ]
+            for week in month_skeleton(self.year, self.month)
+        ]
+
         return {
             'weeks': processed_calendar,
-            'month_name': month_name,
+            'month_name': calendar.month_name[self.month],
             'year': self.year,
             'prev_month': {
                 'month': (self.month - 1) if self.month > 1 else 12,
@@ -0,0 +1,51 @@
+import time
+from datetime import date
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+def _version_key(user_id):
+    return f'dashboard-version:{user_id}'
+
+def get_dashboard_version(user_id):
+    """Return the user's current dashboard version, starting a new one if none is cached."""
+
+    return cache.get_or_set(_version_key(user_id), time.time_ns, timeout=None)
+
+def bump_dashboard_version(*user_ids):
+    """Invalidate every cached dashboard context of the given users."""
+
+    for user_id in user_ids:
+        try:
+            cache.incr(_version_key(user_id))
+        except ValueError:
+            # Never restart at an old version, or evicted keys could revive stale contexts
+            cache.set(_version_key(user_id), time.time_ns(), timeout=None)
+
+def bump_dashboard_version_on_commit(*user_ids):
+    """
+    Invalidate the users' dashboards once the current transaction commits.
+
+    Bumping earlier would let a concurrent request pick up the new version
+    while the writes are still invisible to it, and cache a stale context
+    under that version.
+    """
+
+    transaction.on_commit(lambda: bump_dashboard_version(*user_ids))
+
+def cached_dashboard_context(user, parts, build):
+    """
+    Return the dashboard context for user and parts, building and caching it on a miss.
+
+    The key holds the user's dashboard version, so bumping the version makes
+    every older context unreachable. It also holds today's date, since the
+    calendar marks the current day.
+    """
+
+    version = get_dashboard_version(user.pk)
+    key = ':'.join(str(part) for part in ['dashboard', user.pk, version, date.today(), *parts])
+    context = cache.get(key)
+    if context is None:
+        context = build()
+        cache.set(key, context, timeout=settings.DASHBOARD_CACHE_TIMEOUT)
+    return context
@@ -0,0 +1,71 @@
+import csv
+import json
+from itertools import islice
+
+EXPORT_CHUNK_SIZE = 500
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+USER_COLUMNS = ['username', 'email', 'first_name', 'last_name']
+STUDENT_COLUMNS = USER_COLUMNS + ['current_tutors']
+TUTOR_COLUMNS = USER_COLUMNS + ['subjects', 'hourly_rate', 'availability']
+# Leading characters that make a spreadsheet read a CSV cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def iter_annotated(users, annotate, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield users from a queryset read in chunks, annotating each chunk as a whole.
+
+    This keeps the related lookups to one query per chunk however many
+    users are exported, without holding the full list in memory.
+    """
+
+    iterator = users.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(iterator, chunk_size)):
+        annotate(chunk)
+        yield from chunk
+
+def user_row(user):
+    return {column: getattr(user, column) for column in USER_COLUMNS}
+
+def student_row(student):
+    return {**user_row(student), 'current_tutors': student.current_tutors}
+
+def tutor_row(tutor):
+    profile = getattr(tutor, 'tutor_profile', None)
+    return {
+        **user_row(tutor),
+        'subjects': profile.subjects if profile else [],
+        'hourly_rate': str(profile.hourly_rate) if profile and profile.hourly_rate is not None else None,
+        'availability': [
+            f"{slot.day} {slot.start_time:%H:%M}-{slot.end_time:%H:%M}" for slot in tutor.availability
+        ],
+    }
+
+class Echo:
+    """A file-like object that hands back what is written, so csv.writer can feed a stream."""
+
+    def write(self, value):
+        return value
+
+def csv_cell(value):
+    """Return a value as CSV text, quoting text a spreadsheet would run as a formula with a leading '."""
+
+    text = '; '.join(value) if isinstance(value, list) else ('' if value is None else str(value))
+    return f"'{text}" if text.startswith(FORMULA_PREFIXES) else text
+
+def iter_csv(rows, columns):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([csv_cell(row[column]) for column in columns])
+
+def iter_ndjson(rows, columns):
+    for row in rows:
+        yield json.dumps(row) + '\n'
+
+EXPORT_WRITERS = {
+    'csv': iter_csv,
+    'ndjson': iter_ndjson,
+}
@@ -122,10 +122,21 @@ class SignUpForm(NewPasswordMixin, forms.ModelForm):
 
 class MeetingForm(forms.ModelForm):
     """Form to schedule meetings/tutoring sessions"""
+    repeat_weekly = forms.BooleanField(
+        required=False,
+        label="Repeat weekly on the requested days until the end of the term",
+    )
+
     class Meta:
         model = Meeting
         fields = ['tutor', 'date', 'day', 'start_time', 'end_time', 'time_of_day', 'topic', 'status', 'notes']
 
+    def clean(self):
+        cleaned_data = super().clean()
+        # A repeated meeting may not fall on the entered date at all, so only the dates booked are checked
+        self.instance.check_conflicts = not cleaned_data.get('repeat_weekly')
+        return cleaned_data
+
 
 class LessonRequestForm(forms.ModelForm):
     TIME_CHOICES = [
@@ -228,5 +239,19 @@ class TutorAvailabilityForm(forms.Form):
     start_time = forms.TimeField()
     end_time = forms.TimeField()
 
+class FreeTutorsForm(forms.Form):
+    """Form to look up the tutors free for a weekly slot"""
+    day = forms.ChoiceField(choices=Meeting.DAYS_CHOICES)
+    start_time = forms.TimeField(input_formats=['%H:%M'])
+    end_time = forms.TimeField(input_formats=['%H:%M'])
+    subject = forms.CharField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start_time, end_time = cleaned_data.get('start_time'), cleaned_data.get('end_time')
+        if start_time and end_time and end_time <= start_time:
+            raise ValidationError("The end time must be after the start time.")
+        return cleaned_data
+
 class TutorHourlyRateForm(forms.Form):
     hourly_rate = forms.DecimalField(max_digits=6, decimal_places=2, min_value=0)
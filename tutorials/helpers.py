@@ -1,9 +1,10 @@
 from django.conf import settings
 from django.shortcuts import redirect, render
 from django.core.exceptions import PermissionDenied
-from django.http import HttpResponseForbidden
-from django.core.paginator import Paginator
+from django.http import HttpResponseForbidden, QueryDict, StreamingHttpResponse
+from django.db.models import Prefetch, QuerySet, prefetch_related_objects
 from functools import wraps
+from urllib.parse import urlencode
 from datetime import datetime, timedelta, time
 from .models import ( 
     User,
@@ -13,6 +14,21 @@ from .models import (
     TutorProfile
 )
 from .calendar_utils import TutorCalendar
+from .pagination import KeysetPaginator
+from .dashboard_cache import cached_dashboard_context
+from .exports import (
+    EXPORT_CONTENT_TYPES,
+    EXPORT_WRITERS,
+    STUDENT_COLUMNS,
+    TUTOR_COLUMNS,
+    iter_annotated,
+    student_row,
+    tutor_row,
+)
+from .search import search_users
+from .subjects import filter_by_subjects
+from .stats import OUTSTANDING_REQUESTS, STUDENTS, TUTORS, get_stats, scheduled_meetings_stat
+from .forms import TutorSubjectsForm
 
 def login_prohibited(view_function):
     """Decorator for view functions that redirect users away if they are logged in."""
@@ -43,30 +59,90 @@ def user_role_required(roles):
         return wrap
     return decorator
 
-def admin_dashboard_context():
-    total_students = User.objects.filter(user_type='Student').count()
-    total_tutors = User.objects.filter(user_type='Tutor').count()
-    '''requests = Request.objects.filter(student__user_type='Student').order_by('-submitted_at')'''
-    requests = Lesson.objects.all().order_by('-created_at')
+LESSON_FEED_PAGE_SIZE = 20
+LESSON_FEED_FILTERS = {
+    'knowledge_area': ('knowledge_area', 'Any subject', Lesson.KNOWLEDGE_AREAS),
+    'term': ('term', 'Any term', Lesson.TERMS),
+    'venue': ('venue_preference', 'Any venue', Lesson.VENUE_PREFERENCES),
+}
+
+def admin_dashboard_context(params=None):
+    """Build the admin dashboard context: the maintained stats, plus one page of the lesson request feed."""
+
+    params = params if params is not None else QueryDict()
+    this_week = scheduled_meetings_stat(datetime.now().date())
+    stats = get_stats(STUDENTS, TUTORS, OUTSTANDING_REQUESTS, this_week)
+    return {
+        'total_students': stats[STUDENTS],
+        'total_tutors': stats[TUTORS],
+        'outstanding_requests': stats[OUTSTANDING_REQUESTS],
+        'meetings_this_week': stats[this_week],
+        **get_lesson_request_feed(params),
+    }
+
+def get_lesson_request_feed(params, page_size=LESSON_FEED_PAGE_SIZE):
+    """
+    Return one page of outstanding lesson requests, newest first.
+
+    Pages by keyset on (created_at, id), with ties in creation order, rather
+    than by offset, so every page is a single indexed query joined to the
+    student, however many requests exist. Filters on knowledge_area, term and
+    venue are read from params and ignored when they are not valid choices.
+    """
+
+    lessons = Lesson.objects.select_related('student')
+
+    filters = {}
+    for param, (field, blank_label, choices) in LESSON_FEED_FILTERS.items():
+        value = params.get(param)
+        if value in dict(choices):
+            filters[param] = value
+            lessons = lessons.filter(**{field: value})
+
+    page = KeysetPaginator(lessons, ['-created_at', 'id'], page_size).get_page(params.get('after'))
+    requests = page.object_list
+    next_query = urlencode({**filters, 'after': page.next_cursor}) if page.has_next() else None
+
     return {
-        'total_students': total_students,
-        'total_tutors': total_tutors,
         'requests': requests,
+        'request_filters': filters,
+        'request_filter_fields': [
+            {'name': param, 'blank_label': blank_label, 'choices': choices, 'selected': filters.get(param, '')}
+            for param, (field, blank_label, choices) in LESSON_FEED_FILTERS.items()
+        ],
+        'is_first_page': not page.has_previous(),
+        'first_page_query': urlencode(filters),
+        'next_page_query': next_query,
     }
 
 def tutor_dashboard_context(request, current_user):
-    tutor_profile, created = TutorProfile.objects.get_or_create(tutor=current_user)
+    """Return the tutor dashboard context for the requested month, cached per tutor."""
+
     current_date = datetime.now()
     month = int(request.GET.get('month')) if request.GET.get('month') else current_date.month
     year = int(request.GET.get('year')) if request.GET.get('year') else current_date.year
 
-    meetings = Meeting.objects.filter(
-        tutor=current_user, 
-        date__year=year,
-        date__month=month
-    ).select_related('student')
+    return cached_dashboard_context(
+        current_user,
+        ['tutor', year, month],
+        lambda: build_tutor_dashboard_context(current_user, year, month)
+    )
 
-    availability_slots = TutorAvailability.objects.filter(tutor=request.user)
+def build_tutor_dashboard_context(current_user, year, month):
+    """
+    Build the tutor dashboard context.
+
+    Runs three queries: the tutor profile (a few more on the first visit,
+    when get_or_create inserts it), the month's meetings with their students,
+    and the tutor's availability slots. Querysets are evaluated once and
+    reused by the calendar and the template.
+    """
+
+    tutor_profile, created = TutorProfile.objects.get_or_create(tutor=current_user)
+
+    meetings = TutorCalendar.get_meetings(*TutorCalendar.month_range(year, month), tutor=current_user)
+
+    availability_slots = TutorAvailability.objects.filter(tutor=current_user)
 
     calendar = TutorCalendar(year, month)
     calendar_data = calendar.get_calendar_data(
@@ -75,9 +151,7 @@ def tutor_dashboard_context(request, current_user):
     )
 
     subject_choices = {
-        'STEM' : ['Mathematics', 'Computer Science', 'Physics', 'Chemistry', 'Biology'],
-        'Languages' : ['English', 'Spanish', 'French', 'German'],
-        'Humanities' : ['Geography', 'History', 'Philosophy', 'Religious Studies']
+        'Computer Programming' : [subject for subject, label in TutorSubjectsForm.SUBJECT_CHOICES],
     }
 
     return {
@@ -90,32 +164,61 @@ def tutor_dashboard_context(request, current_user):
         'meetings': meetings,
     }
 
+def student_dashboard_context(request, current_user):
+    """Return the student dashboard context for the requested week, cached per student."""
+
+    week_start = get_week_start(request)
+    return cached_dashboard_context(
+        current_user,
+        ['student', week_start],
+        lambda: build_week_schedule(current_user, week_start)
+    )
+
+USER_LIST_ORDERING = ['last_name', 'first_name', 'id']
+USER_COUNT_CACHE_TIMEOUT = 60
+
 def get_students_for_tutor(tutor):
     meetings = Meeting.objects.filter(tutor=tutor)
     students = meetings.values_list('student', flat=True)
-    return User.objects.filter(id__in=students).order_by('username')
+    return User.objects.filter(id__in=students).order_by(*USER_LIST_ORDERING)
 
 def get_all_students():
-    return User.objects.filter(user_type='Student').order_by('username')
+    return User.objects.filter(user_type='Student').order_by(*USER_LIST_ORDERING)
 
 def annotate_students_with_tutors(users):
+    """Set current_tutors on each student to the usernames of their scheduled tutors, in one query."""
+
+    tutors_by_student = {user.id: [] for user in users}
+    pairs = (
+        Meeting.objects.filter(student__in=tutors_by_student.keys(), status='scheduled')
+        .values_list('student_id', 'tutor__username')
+        .order_by('student_id', 'tutor__username')
+        .distinct()
+    )
+    for student_id, tutor_username in pairs:
+        tutors_by_student[student_id].append(tutor_username)
     for user in users:
-        tutor_usernames = Meeting.objects.filter(student=user, status='scheduled').values_list('tutor__username', flat=True)
-        user.current_tutors = list(set(tutor_usernames))
+        user.current_tutors = tutors_by_student[user.id]
 
 def get_all_tutors():
-    return User.objects.filter(user_type='Tutor').order_by('username')
+    return User.objects.filter(user_type='Tutor').select_related('tutor_profile').order_by(*USER_LIST_ORDERING)
 
-def filter_tutors_by_subjects(users, subject_filters):
-    return [
-        user for user in users 
-        if hasattr(user, 'tutor_profile') and any(subject in subject_filters for subject in user.tutor_profile.subjects)
-    ]
+def filter_tutors_by_subjects(users, subject_filters, match_all=False):
+    """Return the tutors teaching any (or, with match_all, every) subject in subject_filters, as a queryset."""
+
+    if not isinstance(users, QuerySet):
+        users = get_all_tutors().filter(id__in=[user.id for user in users])
+    return filter_by_subjects(users, subject_filters, match_all)
 
 def annotate_tutors_with_availability(users):
-    availability = TutorAvailability.objects.filter(tutor__in=users).order_by('tutor', 'day', 'start_time')
+    """Set availability on each tutor to their slots, prefetched for all of them in one query."""
+
+    prefetch_related_objects(
+        users,
+        Prefetch('availability_slots', queryset=TutorAvailability.objects.order_by('day', 'start_time'))
+    )
     for user in users:
-        user.availability = availability.filter(tutor=user)
+        user.availability = user.availability_slots.all()
 
 def handle_students_list(request):
     if request.user.user_type == 'Tutor':
@@ -124,17 +227,17 @@ def handle_students_list(request):
     else:
         users = get_all_students()
         title = "Student List"
-    annotate_students_with_tutors(users)
     return users, title
 
 def handle_tutors_list(request):
     filters = {}
     users = get_all_tutors()
     subject_filters = request.GET.getlist('subjects', [])
+    match_all = request.GET.get('match') == 'all'
     if subject_filters:
-        users = filter_tutors_by_subjects(users, subject_filters)
+        users = filter_tutors_by_subjects(users, subject_filters, match_all)
         filters['subjects'] = subject_filters
-    annotate_tutors_with_availability(users)
+        filters['match'] = 'all' if match_all else 'any'
     title = "Tutor List"
     return users, title, filters
 
@@ -149,16 +252,53 @@ def get_subject_choices():
     from .views import TutorSubjectsForm
     return TutorSubjectsForm.SUBJECT_CHOICES
 
+def as_user_queryset(users):
+    if isinstance(users, QuerySet):
+        return users
+    return User.objects.filter(id__in=[user.id for user in users])
+
+def handle_user_search(request, users, filters):
+    """Narrow a user list to the ?q= search, recording it in the list filters."""
+
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return users
+    filters['q'] = query
+    return search_users(as_user_queryset(users), query)
+
 def paginate_users(request, users, items_per_page=25):
-    paginator = Paginator(users, items_per_page)
-    page_number = request.GET.get('page')
-    return paginator.get_page(page_number)
+    """Return the page of users at ?cursor=, seeking by name so deep pages cost the same as the first."""
+
+    users = as_user_queryset(users)
+    paginator = KeysetPaginator(users, USER_LIST_ORDERING, items_per_page, count_timeout=USER_COUNT_CACHE_TIMEOUT)
+    return paginator.get_page(request.GET.get('cursor'))
+
+def export_user_list(users, list_type, export_format):
+    """Stream every user in the list as CSV or NDJSON, annotated a chunk at a time."""
+
+    users = as_user_queryset(users).order_by(*USER_LIST_ORDERING)
+    if list_type == 'students':
+        rows = map(student_row, iter_annotated(users, annotate_students_with_tutors))
+        columns = STUDENT_COLUMNS
+    else:
+        rows = map(tutor_row, iter_annotated(users.select_related('tutor_profile'), annotate_tutors_with_availability))
+        columns = TUTOR_COLUMNS
+    response = StreamingHttpResponse(
+        EXPORT_WRITERS[export_format](rows, columns),
+        content_type=EXPORT_CONTENT_TYPES[export_format]
+    )
+    response['Content-Disposition'] = f'attachment; filename="{list_type}.{export_format}"'
+    return response
 
 def render_user_list(request, users, title, filters):
+    filter_query = request.GET.copy()
+    filter_query.pop('cursor', None)
+    filter_query.pop('format', None)
     return render(request, 'partials/lists.html', {
         'users': users,
         'title': title,
         'filters': filters,
+        'filter_query': filter_query.urlencode(),
         'subjects': get_subject_choices(),
     })
 
@@ -179,24 +319,44 @@ def delete_lesson_request(lesson_request):
     if lesson_request:
         lesson_request.delete()
 
-def get_meetings_sorted(user):
-    """Organize lessons by time of day and day of the week."""
+WEEK_DAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+TIMES_OF_DAY = ['morning', 'afternoon', 'evening']
 
-    meetings_sorted = {
-        'morning': { 'mon': [], 'tue': [], 'wed': [], 'thu': [], 'fri': [], 'sat': [], 'sun': [] },
-        'afternoon': { 'mon': [], 'tue': [], 'wed': [], 'thu': [], 'fri': [], 'sat': [], 'sun': [] },
-        'evening': { 'mon': [], 'tue': [], 'wed': [], 'thu': [], 'fri': [], 'sat': [], 'sun': [] },
-    }
+def get_week_start(request):
+    """Return the Monday of the week named by ?week=YYYY-MM-DD, defaulting to this week."""
 
-    for meeting in Meeting.objects.filter(student=user):
-        time_of_day = meeting.time_of_day
-        day = meeting.day
-        if time_of_day not in meetings_sorted:
-            continue
+    try:
+        day = datetime.strptime(request.GET.get('week', ''), '%Y-%m-%d').date()
+    except ValueError:
+        day = datetime.now().date()
+    return day - timedelta(days=day.weekday())
 
-        if day not in meetings_sorted[time_of_day]:
-            continue
+def build_week_schedule(user, week_start):
+    """
+    Group a student's meetings for one week into a time of day x day grid.
 
-        meetings_sorted[time_of_day][day].append(meeting)
-    
-    return meetings_sorted
+    Runs a single query for the week's meetings with their tutors and fills
+    the grid in one pass, so the cost does not grow with the student's history.
+    """
+
+    week_end = week_start + timedelta(days=6)
+    grid = {time_of_day: {day: [] for day in WEEK_DAYS} for time_of_day in TIMES_OF_DAY}
+
+    meetings = Meeting.objects.filter(
+        student=user,
+        date__range=(week_start, week_end)
+    ).select_related('tutor')
+
+    for meeting in meetings:
+        row = grid.get(meeting.time_of_day)
+        if row is not None:
+            row[WEEK_DAYS[meeting.date.weekday()]].append(meeting)
+
+    return {
+        'meetings_sorted': grid,
+        'week_start': week_start,
+        'week_end': week_end,
+        'week_dates': [week_start + timedelta(days=offset) for offset in range(7)],
+        'prev_week': week_start - timedelta(days=7),
+        'next_week': week_start + timedelta(days=7),
+    }
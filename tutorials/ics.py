@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+from django.core import signing
+
+FEED_SALT = 'tutorials.meeting-feed'
+STATUSES = {
+    'scheduled': 'CONFIRMED',
+    'completed': 'CONFIRMED',
+    'cancelled': 'CANCELLED',
+}
+
+def feed_token(user):
+    """Return the signed token that identifies a user's meeting feed without a login."""
+
+    return signing.dumps(user.pk, salt=FEED_SALT)
+
+def feed_user_id(token):
+    """Return the user id signed into token, or None if the token is invalid."""
+
+    try:
+        return signing.loads(token, salt=FEED_SALT)
+    except signing.BadSignature:
+        return None
+
+def escape_text(value):
+    return (
+        value.replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+def fold(line):
+    """Fold a content line into 75-octet pieces, as RFC 5545 requires."""
+
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    pieces = []
+    while encoded:
+        limit = 75 if not pieces else 74
+        cut = min(limit, len(encoded))
+        # Never split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        pieces.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+    return '\r\n '.join(pieces) + '\r\n'
+
+def format_utc(moment):
+    return moment.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+def format_local(day, moment):
+    return datetime.combine(day, moment).strftime('%Y%m%dT%H%M%S')
+
+def meeting_event(meeting, host):
+    """Return the VEVENT lines for a meeting."""
+
+    description = f"Tutor: {meeting.tutor.full_name()}\nStudent: {meeting.student.full_name()}"
+    if meeting.notes:
+        description += f"\n\n{meeting.notes}"
+    return [
+        'BEGIN:VEVENT',
+        f'UID:meeting-{meeting.pk}@{host}',
+        f'DTSTAMP:{format_utc(meeting.updated_at)}',
+        f'LAST-MODIFIED:{format_utc(meeting.updated_at)}',
+        f'DTSTART:{format_local(meeting.date, meeting.start_time)}',
+        f'DTEND:{format_local(meeting.date, meeting.end_time)}',
+        f'SUMMARY:{escape_text(meeting.topic or "Tutoring session")}',
+        f'DESCRIPTION:{escape_text(description)}',
+        f'STATUS:{STATUSES.get(meeting.status, "CONFIRMED")}',
+        'END:VEVENT',
+    ]
+
+def iter_calendar(meetings, name, host):
+    """Yield an iCalendar document for meetings piece by piece, one event at a time."""
+
+    yield ''.join(fold(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Code Tutors//Meetings//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{escape_text(name)}',
+    ])
+    for meeting in meetings:
+        yield ''.join(fold(line) for line in meeting_event(meeting, host))
+    yield fold('END:VCALENDAR')
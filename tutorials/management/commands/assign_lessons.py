@@ -0,0 +1,29 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from tutorials.assignment import assign_outstanding_lessons
+
+class Command(BaseCommand):
+    """Build automation command to schedule the outstanding lesson requests in one batch."""
+
+    help = 'Assigns every outstanding lesson request to a free tutor and schedules its weekly sessions for the term'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start',
+            help='First date sessions may be scheduled on, as YYYY-MM-DD (default: today)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report the assignment without writing any meetings',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start_date = date.fromisoformat(options['start']) if options['start'] else None
+        except ValueError:
+            raise CommandError("--start must be a date in YYYY-MM-DD format")
+
+        meetings, unassigned = assign_outstanding_lessons(start_date, dry_run=options['dry_run'])
+        verb = 'Would schedule' if options['dry_run'] else 'Scheduled'
+        print(f"{verb} {len(meetings)} sessions; {len(unassigned)} requests could not be placed.")
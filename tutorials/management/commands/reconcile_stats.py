@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from tutorials.stats import rebuild_stats
+
+class Command(BaseCommand):
+    """Build automation command to recount the dashboard stats."""
+
+    help = 'Rebuilds every dashboard stat counter from the counted tables'
+
+    def handle(self, *args, **options):
+        for name, value in sorted(rebuild_stats().items()):
+            print(f"{name}: {value}")
@@ -1,7 +1,13 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import Group
 from django.utils import timezone
 from tutorials.models import Meeting, TutorProfile, TutorAvailability, User, Lesson
+from tutorials.scheduling import find_conflicts
+from tutorials.search import rebuild_search_index
+from tutorials.stats import rebuild_stats
+from tutorials.seed_utils import BulkSeeder, ADMIN_RATIO, DEFAULT_TUTOR_RATIO, save_snapshot, restore_snapshot
 from datetime import timedelta, datetime, time
 
 
@@ -47,13 +53,162 @@ class Command(BaseCommand):
         super().__init__()
         self.faker = Faker('en_GB')
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Build rows in memory and write them with bulk_create in batched transactions',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows written per transaction in bulk mode',
+        )
+        parser.add_argument('--users', type=int, default=self.USER_COUNT, help='Total number of users')
+        parser.add_argument('--lessons', type=int, default=self.LESSON_COUNT, help='Total number of lesson requests')
+        parser.add_argument('--meetings', type=int, default=self.MEETING_COUNT, help='Total number of meetings')
+        parser.add_argument(
+            '--tutor-profiles', type=int, default=self.TUTOR_PROFILE_COUNT, help='Total number of tutor profiles'
+        )
+        parser.add_argument(
+            '--availabilities', type=int, default=self.TUTOR_AVAILABILITY_COUNT,
+            help='Total number of tutor availability slots',
+        )
+        parser.add_argument(
+            '--tutor-ratio', type=float, default=DEFAULT_TUTOR_RATIO,
+            help='Share of generated users who are tutors (bulk mode)',
+        )
+        parser.add_argument('--seed', type=int, default=None, help='Seed for a deterministic dataset')
+        parser.add_argument(
+            '--workers', type=int, default=1, help='Number of processes generating rows (bulk mode)'
+        )
+        parser.add_argument(
+            '--snapshot', metavar='NAME', help='Save the database under NAME once seeding has finished'
+        )
+        parser.add_argument(
+            '--restore', metavar='NAME', help='Replace the database with snapshot NAME instead of seeding'
+        )
+        parser.add_argument(
+            '--shard-size', type=int, default=10000, help='Number of rows generated per worker task (bulk mode)'
+        )
+
     def handle(self, *args, **options):
+        if not 0 <= options['tutor_ratio'] <= 1 - ADMIN_RATIO:
+            raise CommandError(f"--tutor-ratio must be between 0 and {1 - ADMIN_RATIO}")
+
+        self.USER_COUNT = options['users']
+        self.LESSON_COUNT = options['lessons']
+        self.MEETING_COUNT = options['meetings']
+        self.TUTOR_PROFILE_COUNT = options['tutor_profiles']
+        self.TUTOR_AVAILABILITY_COUNT = options['availabilities']
+
+        if options['restore']:
+            self.restore(options['restore'])
+            rebuild_stats()
+            rebuild_search_index()
+            cache.clear()
+            return
+
+        if options['bulk']:
+            self.bulk_seed(options)
+        else:
+            self.seed(options)
+        # Bulk inserts skip the signals that maintain the dashboard stats, search table and cache
+        rebuild_stats()
+        rebuild_search_index()
+        cache.clear()
+
+        if options['snapshot']:
+            self.snapshot(options['snapshot'])
+
+    def seed(self, options):
+        if options['seed'] is not None:
+            random.seed(options['seed'])
+            self.faker.seed_instance(options['seed'])
+
         self.create_users()
         self.create_lessons()
         self.create_meetings()
         self.create_tutor_profiles()
         self.create_tutor_availabilities()
+
+    def snapshot(self, name):
+        try:
+            path = save_snapshot(name, settings.SEED_SNAPSHOT_DIR)
+        except ValueError as e:
+            raise CommandError(e)
+        print(f"Saved snapshot {path}")
+
+    def restore(self, name):
+        try:
+            path = restore_snapshot(name, settings.SEED_SNAPSHOT_DIR)
+        except (ValueError, FileNotFoundError) as e:
+            raise CommandError(e)
+        print(f"Restored snapshot {path}")
     
+    def bulk_seed(self, options):
+        seeder = BulkSeeder(
+            Command.DEFAULT_PASSWORD,
+            batch_size=options['batch_size'],
+            seed=options['seed'],
+            workers=options['workers'],
+            shard_size=options['shard_size'],
+            tutor_ratio=options['tutor_ratio'],
+            log=lambda message: print(message, end='\r'),
+        )
+        print(f"Seeding with --seed {seeder.seed}")
+
+        seeder.seed_users(user_fixtures, self.USER_COUNT)
+        print("User seeding complete.")
+
+        tutor = User.objects.get(username='@janedoe')
+        student = User.objects.get(username='@charlie')
+
+        seeder.seed_lessons(self.LESSON_COUNT, fixtures=[{
+            'student_id': student.id,
+            'knowledge_area': 'python',
+            'term': 'sept-dec',
+            'start_time': time(10, 0),
+            'duration': 60,
+            'end_time': time(11, 0),
+            'days': ['mon', 'wed', 'fri'],
+            'time_of_day': 'morning',
+            'venue_preference': 'online',
+            'approved': True,
+        }])
+        print("Lesson seeding complete.")
+
+        seeder.seed_meetings(self.MEETING_COUNT, fixtures=[{
+            'tutor_id': tutor.id,
+            'student_id': student.id,
+            'date': datetime.now().date(),
+            'day': 'mon',
+            'start_time': time(10, 0),
+            'end_time': time(11, 0),
+            'time_of_day': 'morning',
+            'topic': 'Python',
+            'status': 'scheduled',
+            'notes': 'Some notes',
+        }])
+        print("Meeting seeding complete.")
+
+        seeder.seed_tutor_profiles(self.TUTOR_PROFILE_COUNT, fixtures=[{
+            'tutor_id': tutor.id,
+            'hourly_rate': 30,
+            'subjects': ['C++', 'Python'],
+        }])
+        print("Tutor profile seeding complete.")
+
+        seeder.seed_tutor_availabilities(self.TUTOR_AVAILABILITY_COUNT, fixtures=[{
+            'tutor_id': tutor.id,
+            'day': 'Tuesday',
+            'start_time': time(14, 0),
+            'end_time': time(17, 0),
+            'is_available': True,
+        }])
+        print("Tutor availability seeding complete.")
+
     def create_users(self):
         self.generate_user_fixtures()
         self.generate_random_users()
@@ -204,14 +359,9 @@ class Command(BaseCommand):
 
     def try_create_meeting(self, data):
         try:
-            existing_meetings = Meeting.objects.filter(
-                tutor=data['tutor'],
-                date=data['date'],
-                start_time=data['start_time'],
-                end_time=data['end_time']
-            )
-            if existing_meetings.exists():
-                print('Meeting already exists')
+            if find_conflicts(data['tutor'].id, data['student'].id, data['date'],
+                              data['start_time'], data['end_time']).exists():
+                print('Meeting overlaps an existing one')
                 return 
 
             Meeting.objects.create(
@@ -223,7 +373,7 @@ class Command(BaseCommand):
                 end_time=data['end_time'],
                 time_of_day=data['time_of_day'],
                 topic=data['topic'],
-                status=['status'],
+                status=data['status'],
                 notes=data['notes']
             )
 
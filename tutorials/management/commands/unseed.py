@@ -1,16 +1,53 @@
+from django.core.cache import cache
 from django.core.management.base import BaseCommand, CommandError
 from tutorials.models import Meeting, TutorProfile, TutorAvailability, User, Lesson
+from tutorials.search import rebuild_search_index
+from tutorials.stats import rebuild_stats
+from tutorials.seed_utils import purge_queryset
 
 class Command(BaseCommand):
     """Build automation command to unseed the database."""
     
     help = 'Seeds the database with sample data'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fast',
+            action='store_true',
+            help='Delete rows with chunked raw SQL instead of loading them through the ORM collector',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows deleted per statement in fast mode',
+        )
+
     def handle(self, *args, **options):
         """Unseed the database."""
 
-        User.objects.filter(is_staff=False).delete()
-        Lesson.objects.all().delete()
-        Meeting.objects.all().delete()
-        TutorProfile.objects.all().delete()
-        TutorAvailability.objects.all().delete()
+        if options['fast']:
+            self.fast_unseed(options['batch_size'])
+        else:
+            User.objects.filter(is_staff=False).delete()
+            Lesson.objects.all().delete()
+            Meeting.objects.all().delete()
+            TutorProfile.objects.all().delete()
+            TutorAvailability.objects.all().delete()
+        # Raw SQL purges skip the signals that maintain the dashboard stats, search table and cache
+        rebuild_stats()
+        rebuild_search_index()
+        cache.clear()
+
+    def fast_unseed(self, batch_size):
+        """Purge child tables first, then every non-staff user and whatever still depends on them."""
+
+        for queryset in [
+            Meeting.objects.all(),
+            Lesson.objects.all(),
+            TutorAvailability.objects.all(),
+            TutorProfile.objects.all(),
+            User.objects.filter(is_staff=False),
+        ]:
+            purged = purge_queryset(queryset, batch_size, log=lambda message: print(message, end='\r'))
+            print(f"Purged {purged} {queryset.model._meta.verbose_name_plural}.")
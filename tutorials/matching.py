@@ -0,0 +1,65 @@
+import numpy as np
+from .availability import WEEKDAYS, get_availability_matrix, to_minutes
+
+# How much each signal adds to a tutor's score. Teaching the subject is a
+# requirement rather than a weight, so only those tutors are ranked.
+AVAILABILITY_WEIGHT = 3
+CONFLICT_WEIGHT = 3
+RATE_WEIGHT = 1
+LOAD_WEIGHT = 1
+
+def base_scores(matrix):
+    """Return the rate and load part of every tutor's score, which does not depend on the lesson."""
+
+    known = ~np.isnan(matrix.rates)
+    min_rate = matrix.rates[known].min() if known.any() else 0
+    rate_range = ((matrix.rates[known].max() - min_rate) if known.any() else 0) or 1
+    rate_scores = np.where(known, 1 - (matrix.rates - min_rate) / rate_range, 0.5)
+    max_load = matrix.loads.max(initial=0) or 1
+    return RATE_WEIGHT * rate_scores + LOAD_WEIGHT * (1 - matrix.loads / max_load)
+
+def ranked(matrix, rows, scores):
+    """Return rows ordered best score first, ties going to the older tutor."""
+
+    return rows[np.lexsort((matrix.tutor_ids[rows], -scores))]
+
+def match(matrix, knowledge_area, days, start_time, duration, limit=5):
+    """
+    Return the `limit` best tutors for a weekly lesson, best first.
+
+    Every tutor of the subject is scored at once from the availability
+    matrix: the days the lesson fits their availability, the days it
+    clashes with a meeting, and their rate and load.
+    """
+
+    days = [day for day in days if day in WEEKDAYS]
+    rows = matrix.subject_rows(knowledge_area)
+    covered = np.zeros((len(rows), len(days)), dtype=bool)
+    conflicted = np.zeros((len(rows), len(days)), dtype=bool)
+    if start_time:
+        start = to_minutes(start_time)
+        for column, day in enumerate(days):
+            covered[:, column], conflicted[:, column] = matrix.fit(rows, day, start, start + duration)
+    day_weight = 1 / max(len(days), 1)
+    scores = (
+        base_scores(matrix)[rows]
+        + AVAILABILITY_WEIGHT * covered.sum(axis=1) * day_weight
+        - CONFLICT_WEIGHT * conflicted.sum(axis=1) * day_weight
+    )
+    positions = np.lexsort((matrix.tutor_ids[rows], -scores))[:limit]
+
+    return [{
+        'tutor_id': int(matrix.tutor_ids[rows[position]]),
+        'username': matrix.names[rows[position]][0],
+        'full_name': matrix.names[rows[position]][1],
+        'hourly_rate': matrix.hourly_rates[rows[position]],
+        'load': int(matrix.loads[rows[position]]),
+        'covered_days': [day for day, fits in zip(days, covered[position]) if fits],
+        'conflicted_days': [day for day, clashes in zip(days, conflicted[position]) if clashes],
+        'score': round(float(scores[position]), 3),
+    } for position in positions.tolist()]
+
+def match_tutors(lesson, limit=5):
+    """Return the best tutors for a lesson request, ranked by availability, conflicts, rate and load."""
+
+    return match(get_availability_matrix(), lesson.knowledge_area, lesson.days, lesson.start_time, lesson.duration, limit)
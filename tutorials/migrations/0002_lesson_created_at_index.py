@@ -0,0 +1,17 @@
+# Generated by Django 5.1.2 on 2026-10-18 19:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(fields=['-created_at', 'id'], name='lesson_created_at_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.2 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0002_lesson_created_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
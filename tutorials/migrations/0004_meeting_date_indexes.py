@@ -0,0 +1,21 @@
+# Generated by Django 5.1.2 on 2026-10-18 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0003_dashboard_stat'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['tutor', 'date'], name='meeting_tutor_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['student', 'date'], name='meeting_student_date_idx'),
+        ),
+    ]
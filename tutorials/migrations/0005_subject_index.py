@@ -0,0 +1,53 @@
+# Generated by Django 5.1.2 on 2026-10-18 19:52
+
+from django.db import migrations, models
+
+
+def index_existing_subjects(apps, schema_editor):
+    """Fill the subject index from every profile's subjects list."""
+
+    Subject = apps.get_model('tutorials', 'Subject')
+    TutorProfile = apps.get_model('tutorials', 'TutorProfile')
+    Through = TutorProfile.subject_index.through
+
+    rows = [
+        (profile_id, {' '.join(str(name).split()).casefold() for name in subjects or []} - {''})
+        for profile_id, subjects in TutorProfile.objects.values_list('id', 'subjects')
+    ]
+    names = {name for profile_id, profile_names in rows for name in profile_names}
+    Subject.objects.bulk_create([Subject(name=name) for name in sorted(names)], ignore_conflicts=True)
+    subject_ids = dict(Subject.objects.values_list('name', 'id'))
+    Through.objects.bulk_create(
+        [
+            Through(tutorprofile_id=profile_id, subject_id=subject_ids[name])
+            for profile_id, profile_names in rows
+            for name in profile_names
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0004_meeting_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Subject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='subject_index',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='tutor_profiles', to='tutorials.subject'),
+        ),
+        migrations.RunPython(index_existing_subjects, migrations.RunPython.noop),
+    ]
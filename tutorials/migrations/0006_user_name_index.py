@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-18 19:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('tutorials', '0005_subject_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['user_type', 'last_name', 'first_name', 'id'], name='user_type_name_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+SEARCH_FIELDS = ['username', 'first_name', 'last_name', 'email']
+
+
+def create_search_index(apps, schema_editor):
+    """Create the FTS5 user search table on SQLite, or trigram indexes on PostgreSQL."""
+
+    columns = ', '.join(SEARCH_FIELDS)
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'CREATE VIRTUAL TABLE tutorials_user_search USING fts5({columns})')
+        schema_editor.execute(
+            f'INSERT INTO tutorials_user_search (rowid, {columns}) SELECT id, {columns} FROM tutorials_user'
+        )
+    elif schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for field in SEARCH_FIELDS:
+            schema_editor.execute(
+                f'CREATE INDEX tutorials_user_{field}_trgm ON tutorials_user USING gin (UPPER({field}) gin_trgm_ops)'
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE tutorials_user_search')
+    elif schema_editor.connection.vendor == 'postgresql':
+        for field in SEARCH_FIELDS:
+            schema_editor.execute(f'DROP INDEX tutorials_user_{field}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0006_user_name_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-18 20:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0007_user_search'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='meeting',
+            name='meeting_tutor_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='meeting',
+            name='meeting_student_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['tutor', 'date', 'start_time'], name='meeting_tutor_slot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['student', 'date', 'start_time'], name='meeting_student_slot_idx'),
+        ),
+    ]
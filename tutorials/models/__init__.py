@@ -1,6 +1,8 @@
 from .user import User
 from .lesson import Lesson
 from .meeting import Meeting
+from .subject import Subject
 from .tutor_profile import TutorProfile
 from .tutor_availability import TutorAvailability
-from .review import Review
\ No newline at end of file
+from .review import Review
+from .dashboard_stat import DashboardStat
@@ -0,0 +1,10 @@
+from django.db import models
+
+class DashboardStat(models.Model):
+    """Model for a named counter that is kept up to date as the counted rows change."""
+
+    name = models.CharField(max_length=50, unique=True)
+    value = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
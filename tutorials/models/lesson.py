@@ -58,6 +58,12 @@ class Lesson(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Serves the admin dashboard's newest-first keyset feed
+            models.Index(fields=['-created_at', 'id'], name='lesson_created_at_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if self.start_time and self.duration is not None:
             self.time_of_day = self.get_time_of_day()
@@ -1,8 +1,9 @@
 
 from django.db import models
 from tutorials.models.user import User
+from .saved_state import SavedStateMixin
 
-class Meeting(models.Model):
+class Meeting(SavedStateMixin, models.Model):
     """Model for scheduling meetings between tutors and students."""
     
     STATUS_CHOICES = [
@@ -73,11 +74,25 @@ class Meeting(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
 
+    # Cleared when the meeting only seeds a weekly series, whose own dates are checked when booked
+    check_conflicts = True
+
+    def clean(self):
+        from tutorials.scheduling import check_meeting_conflicts
+        if self.check_conflicts:
+            check_meeting_conflicts(self)
+
     def time_range(self):
         return f"{self.start_time.strftime('%H:%M')} - {self.end_time.strftime('%H:%M')}"
 
     class Meta:
         ordering = ['date', 'start_time']
+        indexes = [
+            # Serve the calendar and schedule date__range lookups per tutor and per student,
+            # and the overlap checks' start_time range within a day
+            models.Index(fields=['tutor', 'date', 'start_time'], name='meeting_tutor_slot_idx'),
+            models.Index(fields=['student', 'date', 'start_time'], name='meeting_student_slot_idx'),
+        ]
 
     def __str__(self):
 
@@ -0,0 +1,60 @@
+import copy
+from functools import cache
+from types import SimpleNamespace
+from django.db import models
+
+@cache
+def _json_fields(model):
+    return frozenset(field.attname for field in model._meta.concrete_fields if isinstance(field, models.JSONField))
+
+def _snapshot(model, field_names, values):
+    """Return values, copying JSON values as they can be changed in place."""
+
+    json_fields = _json_fields(model)
+    if not json_fields:
+        return values
+    return [copy.deepcopy(value) if name in json_fields else value for name, value in zip(field_names, values)]
+
+class SavedStateMixin:
+    """
+    Remember the field values a row has in the database, so post_save and
+    post_delete receivers can compare an instance against them.
+
+    The values are captured in from_db, which only keeps a reference to the
+    row already fetched, and refreshed after each save. Receivers do their
+    own work only when a row is written, not every time one is loaded.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_values = (field_names, _snapshot(cls, field_names, values))
+        return instance
+
+    def saved_state(self):
+        """Return the row as stored before the current save, or None if it has never been saved."""
+
+        if not hasattr(self, '_saved_values'):
+            return None
+        state = SimpleNamespace(**dict(zip(*self._saved_values)))
+        # Fields deferred when loaded, and not assigned since, are unchanged by a save
+        for field in self._meta.concrete_fields:
+            if not hasattr(state, field.attname):
+                setattr(state, field.attname, getattr(self, field.attname))
+        return state
+
+    def save(self, *args, **kwargs):
+        if hasattr(self, '_saved_values'):
+            field_names, values = self._saved_values
+            # Read the stored values of fields that were deferred when loaded but have been assigned since
+            assigned = [
+                field.attname for field in self._meta.concrete_fields
+                if field.attname not in field_names and field.attname in self.__dict__
+            ]
+            if assigned:
+                stored = type(self)._base_manager.filter(pk=self.pk).values_list(*assigned).first() or ()
+                self._saved_values = ([*field_names, *assigned], [*values, *stored])
+        super().save(*args, **kwargs)
+        deferred = self.get_deferred_fields()
+        field_names = [field.attname for field in self._meta.concrete_fields if field.attname not in deferred]
+        self._saved_values = (field_names, _snapshot(type(self), field_names, [getattr(self, name) for name in field_names]))
@@ -0,0 +1,12 @@
+from django.db import models
+
+class Subject(models.Model):
+    """Model for a normalised subject name, indexing the tutors who teach it."""
+
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
@@ -1,9 +1,10 @@
 
 from django.db import models
+from .saved_state import SavedStateMixin
 from .user import User
     
 
-class TutorAvailability(models.Model):
+class TutorAvailability(SavedStateMixin, models.Model):
     """Model for storing tutor availability."""
     
     DAYS_OF_WEEK = [
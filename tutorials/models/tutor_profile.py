@@ -2,9 +2,11 @@ from django.core.validators import  MinValueValidator
 
 from django.db import models
 
+from .saved_state import SavedStateMixin
+from .subject import Subject
 from .user import User
 
-class TutorProfile(models.Model):
+class TutorProfile(SavedStateMixin, models.Model):
     """Model for storing tutor-specific information."""
     
     tutor = models.OneToOneField(
@@ -23,6 +25,9 @@ class TutorProfile(models.Model):
     )
 
     subjects = models.JSONField(default=list, blank=True)
+
+    # Normalised copy of subjects, kept in sync by signals, so filters can join on an index
+    subject_index = models.ManyToManyField(Subject, related_name='tutor_profiles', blank=True, editable=False)
     
     def __str__(self):
         return f"{self.tutor.username}'s Profile"
@@ -3,8 +3,9 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from libgravatar import Gravatar
 import hashlib
+from .saved_state import SavedStateMixin
 
-class User(AbstractUser):
+class User(SavedStateMixin, AbstractUser):
     """Model used for user authentication, and team member related information."""
 
     username = models.CharField(
@@ -36,6 +37,10 @@ class User(AbstractUser):
         """Model options."""
 
         ordering = ['last_name', 'first_name']
+        indexes = [
+            # Serves keyset pagination of the user lists
+            models.Index(fields=['user_type', 'last_name', 'first_name', 'id'], name='user_type_name_idx'),
+        ]
 
     def full_name(self):
         """Return a string containing the user's full name."""
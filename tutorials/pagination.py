@@ -0,0 +1,120 @@
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db.models import Q
+
+class KeysetPage:
+    """One page of a KeysetPaginator, with cursors to its neighbours."""
+
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the last row seen instead of by OFFSET.
+
+    Every page, however deep, is one indexed range query of per_page + 1 rows.
+    Pages are addressed by opaque cursors that encode the ordering values of
+    the row at the page boundary. The ordering must end in a unique field so
+    that no two rows tie. The total is only counted when asked for, and is
+    cached for count_timeout seconds when that is set.
+    """
+
+    def __init__(self, queryset, ordering, per_page=25, count_timeout=None):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = per_page
+        self.count_timeout = count_timeout
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    def encode_cursor(self, direction, obj):
+        values = [getattr(obj, field.attname) for field in self._model_fields()]
+        # str() keeps full precision; DjangoJSONEncoder would round datetimes to milliseconds
+        raw = json.dumps([direction, values], default=str)
+        return urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        """Return the (direction, values) in cursor, or None if it is missing or invalid."""
+
+        if not cursor:
+            return None
+        try:
+            direction, values = json.loads(urlsafe_b64decode(cursor.encode()))
+            if direction not in ('next', 'previous') or len(values) != len(self.fields):
+                return None
+            return direction, [field.to_python(value) for field, value in zip(self._model_fields(), values)]
+        except (ValueError, TypeError, UnicodeError, ValidationError):
+            return None
+
+    def _model_fields(self):
+        return [self.queryset.model._meta.get_field(name) for name in self.fields]
+
+    def _seek(self, values, forward):
+        """Return the condition for rows strictly after values, or strictly before them going backwards."""
+
+        condition = Q()
+        for index, name in enumerate(self.ordering):
+            descending = name.startswith('-')
+            lookup = 'lt' if descending == forward else 'gt'
+            equal = {field: value for field, value in zip(self.fields[:index], values[:index])}
+            condition |= Q(**equal, **{f'{self.fields[index]}__{lookup}': values[index]})
+        return condition
+
+    def get_page(self, cursor=None):
+        decoded = self.decode_cursor(cursor)
+        direction, values = decoded if decoded else ('next', None)
+        forward = direction == 'next'
+
+        ordering = self.ordering if forward else [
+            name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering
+        ]
+        rows = self.queryset.order_by(*ordering)
+        if values is not None:
+            rows = rows.filter(self._seek(values, forward))
+        rows = list(rows[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+
+        has_next = has_more if forward else values is not None
+        has_previous = values is not None if forward else has_more
+        return KeysetPage(
+            rows,
+            self,
+            next_cursor=self.encode_cursor('next', rows[-1]) if has_next and rows else None,
+            previous_cursor=self.encode_cursor('previous', rows[0]) if has_previous and rows else None,
+        )
+
+    @property
+    def count(self):
+        """Count every row, reusing a cached total when count_timeout is set."""
+
+        if self.count_timeout is None:
+            return self.queryset.count()
+        try:
+            sql = str(self.queryset.query)
+        except EmptyResultSet:
+            return 0
+        key = 'keyset-count:' + hashlib.md5(sql.encode()).hexdigest()
+        return cache.get_or_set(key, self.queryset.count, timeout=self.count_timeout)
@@ -0,0 +1,192 @@
+from bisect import bisect_left
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Q
+from .availability import update_availability_matrix
+from .dashboard_cache import bump_dashboard_version_on_commit
+from .models import Meeting, User
+from .stats import count_rows
+
+def find_conflicts(tutor_id, student_id, date, start_time, end_time, exclude_pk=None):
+    """
+    Return the scheduled meetings of the tutor or student that overlap the given slot.
+
+    Each side is a range seek on its (person, date, start_time) index.
+    Meetings that only touch the slot, ending as it starts, do not overlap.
+    """
+
+    conflicts = Meeting.objects.filter(
+        Q(tutor_id=tutor_id) | Q(student_id=student_id),
+        date=date,
+        status='scheduled',
+        start_time__lt=end_time,
+        end_time__gt=start_time,
+    )
+    if exclude_pk is not None:
+        conflicts = conflicts.exclude(pk=exclude_pk)
+    return conflicts
+
+def check_meeting_conflicts(meeting):
+    """Raise ValidationError if a scheduled meeting would overlap another of its tutor's or student's."""
+
+    if meeting.status != 'scheduled' or None in (meeting.tutor_id, meeting.student_id, meeting.date):
+        return
+    if meeting.start_time is None or meeting.end_time is None:
+        return
+    if meeting.end_time <= meeting.start_time:
+        raise ValidationError("A meeting must end after it starts.", code='invalid_times')
+
+    conflict = (
+        find_conflicts(meeting.tutor_id, meeting.student_id, meeting.date,
+                       meeting.start_time, meeting.end_time, meeting.pk)
+        .select_related('tutor', 'student')
+        .first()
+    )
+    if conflict is not None:
+        busy = conflict.tutor if conflict.tutor_id == meeting.tutor_id else conflict.student
+        raise ValidationError(
+            "%(user)s already has a meeting from %(start)s to %(end)s on %(date)s.",
+            code='overlap',
+            params={
+                'user': busy.username,
+                'start': conflict.start_time.strftime('%H:%M'),
+                'end': conflict.end_time.strftime('%H:%M'),
+                'date': conflict.date,
+            },
+        )
+
+def save_meeting(meeting):
+    """
+    Save a meeting after checking it for overlaps, so concurrent bookings cannot both pass.
+
+    On SQLite every transaction begins IMMEDIATE, taking the write lock
+    before the check; elsewhere the tutor and student rows are locked, in
+    id order, so bookings for either of them queue behind each other.
+    """
+
+    with transaction.atomic():
+        lock_users([meeting.tutor_id, meeting.student_id])
+        check_meeting_conflicts(meeting)
+        meeting.save()
+    return meeting
+
+def lock_users(user_ids):
+    if connection.features.has_select_for_update:
+        list(User.objects.select_for_update().filter(id__in=user_ids).order_by('id').values_list('id', flat=True))
+
+def bulk_book_meetings(meetings):
+    """
+    Insert meetings already checked for overlaps in one statement.
+
+    bulk_create skips the signals that keep the dashboards, availability
+    matrix and weekly counters current, so they are updated here, once per
+    batch.
+    Call this inside the transaction the overlap checks ran in.
+    """
+
+    meetings = Meeting.objects.bulk_create(meetings)
+    count_rows(Meeting, meetings)
+    bump_dashboard_version_on_commit(*{user_id for meeting in meetings for user_id in (meeting.tutor_id, meeting.student_id)})
+    booked = [
+        (meeting.tutor_id, meeting.date, meeting.start_time, meeting.end_time)
+        for meeting in meetings if meeting.status == 'scheduled'
+    ]
+    update_availability_matrix(lambda matrix: all(matrix.add_meeting(*meeting) for meeting in booked))
+    return meetings
+
+def book_meetings(meetings):
+    """
+    Check a batch of new meetings for overlaps in memory, then insert them in one statement.
+
+    The scheduled meetings of the batch's tutors and students over its
+    dates are read in one query, and each new meeting is checked against
+    those and the batch before it. If any overlap, nothing is saved and
+    the ValidationError lists their dates.
+    """
+
+    scheduled = [meeting for meeting in meetings if meeting.status == 'scheduled']
+    for meeting in scheduled:
+        if meeting.end_time <= meeting.start_time:
+            raise ValidationError("A meeting must end after it starts.", code='invalid_times')
+
+    with transaction.atomic():
+        tutor_ids = {meeting.tutor_id for meeting in scheduled}
+        student_ids = {meeting.student_id for meeting in scheduled}
+        lock_users(tutor_ids | student_ids)
+        dates = [meeting.date for meeting in scheduled]
+        booked = MeetingIntervals(Meeting.objects.filter(
+            Q(tutor_id__in=tutor_ids) | Q(student_id__in=student_ids),
+            status='scheduled',
+            date__range=(min(dates), max(dates)),
+        ).values_list('tutor_id', 'student_id', 'date', 'start_time', 'end_time') if scheduled else ())
+
+        overlapping = []
+        for meeting in scheduled:
+            slot = (meeting.tutor_id, meeting.student_id, meeting.date, meeting.start_time, meeting.end_time)
+            if slot in booked:
+                overlapping.append(meeting.date)
+            else:
+                booked.add(slot)
+        if overlapping:
+            raise ValidationError(
+                "The tutor or student already has a meeting at this time on %(dates)s.",
+                code='overlap',
+                params={'dates': ', '.join(str(meeting_date) for meeting_date in overlapping)},
+            )
+        return bulk_book_meetings(meetings)
+
+class IntervalIndex:
+    """
+    Booked [start, end) intervals per key, for checking many bookings in memory.
+
+    Overlapping intervals are merged as they are added, so each key's
+    intervals stay disjoint and sorted, and an overlap check is a binary
+    search against the one interval that could overlap.
+    """
+
+    def __init__(self):
+        self.starts = {}
+        self.ends = {}
+
+    def overlaps(self, key, start, end):
+        starts = self.starts.get(key)
+        if not starts:
+            return False
+        position = bisect_left(starts, end)
+        return position > 0 and self.ends[key][position - 1] > start
+
+    def add(self, key, start, end):
+        starts = self.starts.setdefault(key, [])
+        ends = self.ends.setdefault(key, [])
+        first = bisect_left(ends, start)
+        last = bisect_left(starts, end)
+        if first < last:
+            start = min(start, starts[first])
+            end = max(end, ends[last - 1])
+        starts[first:last] = [start]
+        ends[first:last] = [end]
+
+class MeetingIntervals:
+    """
+    The tutor and student bookings of many meetings, as a set of (tutor_id, student_id, date, start, end).
+
+    A slot is "in" the set when it overlaps a booking of its tutor or its
+    student, so the bulk seeder can treat overlaps as duplicates.
+    """
+
+    def __init__(self, slots=()):
+        self.index = IntervalIndex()
+        for slot in slots:
+            self.add(slot)
+
+    def keys(self, tutor_id, student_id, date):
+        return [('tutor', tutor_id, date), ('student', student_id, date)]
+
+    def __contains__(self, slot):
+        tutor_id, student_id, date, start, end = slot
+        return any(self.index.overlaps(key, start, end) for key in self.keys(tutor_id, student_id, date))
+
+    def add(self, slot):
+        tutor_id, student_id, date, start, end = slot
+        for key in self.keys(tutor_id, student_id, date):
+            self.index.add(key, start, end)
@@ -0,0 +1,67 @@
+import re
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from .models import User
+
+SEARCH_TABLE = 'tutorials_user_search'
+SEARCH_FIELDS = ['username', 'first_name', 'last_name', 'email']
+
+def uses_fts():
+    """Whether users are searched through the SQLite FTS5 table rather than indexed prefix lookups."""
+
+    return connection.vendor == 'sqlite'
+
+def search_tokens(query):
+    return re.findall(r'\w+', query)[:10]
+
+def search_users(users, query):
+    """
+    Narrow a user queryset to those whose username, names or email have a word starting with each search token.
+
+    On SQLite this is an FTS5 MATCH against the search table; elsewhere it
+    falls back to prefix lookups, which trigram indexes can serve.
+    """
+
+    tokens = search_tokens(query)
+    if not tokens:
+        return users
+    if uses_fts():
+        expression = ' AND '.join(f'"{token}"*' for token in tokens)
+        return users.filter(id__in=RawSQL(f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', [expression]))
+
+    for token in tokens:
+        matches = Q(username__istartswith=f'@{token}')
+        for field in SEARCH_FIELDS:
+            matches |= Q(**{f'{field}__istartswith': token})
+        users = users.filter(matches)
+    return users
+
+def search_values(user):
+    return [getattr(user, field) or '' for field in SEARCH_FIELDS]
+
+def index_user(user):
+    """Write a user's searchable fields to the search table."""
+
+    if uses_fts():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, {", ".join(SEARCH_FIELDS)}) VALUES (%s, %s, %s, %s, %s)',
+                [user.pk, *search_values(user)]
+            )
+
+def unindex_user(user_id):
+    if uses_fts():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [user_id])
+
+def rebuild_search_index():
+    """Refill the search table from the user table, for after bulk writes that skip signals."""
+
+    if uses_fts():
+        columns = ', '.join(SEARCH_FIELDS)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, {columns}) SELECT id, {columns} FROM {User._meta.db_table}'
+            )
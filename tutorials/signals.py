@@ -0,0 +1,180 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .availability import AvailabilityMatrix, invalidate_availability_matrix, update_availability_matrix
+from .dashboard_cache import bump_dashboard_version_on_commit
+from .models import Lesson, Meeting, TutorAvailability, TutorProfile, User
+from .search import index_user, search_values, unindex_user
+from .subjects import normalise_subjects, sync_subject_index
+from .stats import increment_stat, row_stat
+
+@receiver([post_save, post_delete], sender=Meeting)
+def invalidate_meeting_dashboards(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    bump_dashboard_version_on_commit(instance.tutor_id, instance.student_id)
+
+@receiver([post_save, post_delete], sender=TutorAvailability)
+@receiver([post_save, post_delete], sender=TutorProfile)
+def invalidate_tutor_dashboard(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    bump_dashboard_version_on_commit(instance.tutor_id)
+
+""" Dashboard stats """
+
+def _move_stat(old_stat, new_stat):
+    """Move a row's contribution from old_stat to new_stat."""
+
+    if old_stat != new_stat:
+        if old_stat:
+            increment_stat(old_stat, -1)
+        if new_stat:
+            increment_stat(new_stat)
+
+# Saves compare against the row as stored, so they only touch the counters
+# when the user type, meeting status or week changes.
+
+@receiver(post_save, sender=User)
+def count_saved_user(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    old_stat = None if created else row_stat(sender, instance.saved_state() or instance)
+    _move_stat(old_stat, row_stat(sender, instance))
+
+@receiver(post_save, sender=Meeting)
+def count_saved_meeting(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    old_stat = None if created else row_stat(sender, instance.saved_state() or instance)
+    _move_stat(old_stat, row_stat(sender, instance))
+
+@receiver(post_delete, sender=User)
+def uncount_deleted_user(sender, instance, **kwargs):
+    _move_stat(row_stat(sender, instance.saved_state() or instance), None)
+
+@receiver(post_delete, sender=Meeting)
+def uncount_deleted_meeting(sender, instance, **kwargs):
+    _move_stat(row_stat(sender, instance.saved_state() or instance), None)
+
+@receiver(post_save, sender=Lesson)
+def count_saved_lesson(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    if created:
+        _move_stat(None, row_stat(sender, instance))
+
+@receiver(post_delete, sender=Lesson)
+def uncount_deleted_lesson(sender, instance, **kwargs):
+    _move_stat(row_stat(sender, instance), None)
+
+""" Subject index """
+
+@receiver(post_save, sender=TutorProfile)
+def index_saved_subjects(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    # A new profile starts with an empty index, whatever it was constructed with
+    indexed = [] if created else normalise_subjects((instance.saved_state() or instance).subjects)
+    if normalise_subjects(instance.subjects) != indexed:
+        sync_subject_index(instance)
+
+""" User search """
+
+@receiver(post_save, sender=User)
+def index_saved_user(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    # Logins save last_login only, and skip the search table entirely
+    old = None if created else instance.saved_state()
+    if old is None or search_values(instance) != search_values(old):
+        index_user(instance)
+
+@receiver(post_delete, sender=User)
+def unindex_deleted_user(sender, instance, **kwargs):
+    unindex_user(instance.pk)
+
+""" Availability matrix """
+
+def _availability_slot(slot):
+    if not slot.is_available:
+        return None
+    # Times assigned as strings are only converted when read back from the database
+    to_time = TutorAvailability._meta.get_field('start_time').to_python
+    return slot.tutor_id, slot.day, to_time(slot.start_time), to_time(slot.end_time)
+
+def _booked_meeting(meeting):
+    if meeting.status != 'scheduled' or None in (meeting.date, meeting.start_time, meeting.end_time):
+        return None
+    to_time = Meeting._meta.get_field('start_time').to_python
+    return meeting.tutor_id, Meeting._meta.get_field('date').to_python(meeting.date), to_time(meeting.start_time), to_time(meeting.end_time)
+
+def _move_in_matrix(add, old, new):
+    """Update the matrix from an instance's old entry to its new one, leaving it alone if they match."""
+
+    if old != new:
+        update_availability_matrix(lambda matrix: (
+            (old is None or add(matrix, *old, delta=-1)) and (new is None or add(matrix, *new))
+        ))
+
+@receiver(post_save, sender=TutorAvailability)
+def move_saved_availability(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    old = None if created else _availability_slot(instance.saved_state() or instance)
+    _move_in_matrix(AvailabilityMatrix.add_availability, old, _availability_slot(instance))
+
+@receiver(post_save, sender=Meeting)
+def move_saved_meeting(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    old = None if created else _booked_meeting(instance.saved_state() or instance)
+    _move_in_matrix(AvailabilityMatrix.add_meeting, old, _booked_meeting(instance))
+
+@receiver(post_delete, sender=TutorAvailability)
+def remove_deleted_availability(sender, instance, **kwargs):
+    _move_in_matrix(AvailabilityMatrix.add_availability, _availability_slot(instance.saved_state() or instance), None)
+
+@receiver(post_delete, sender=Meeting)
+def remove_deleted_meeting(sender, instance, **kwargs):
+    _move_in_matrix(AvailabilityMatrix.add_meeting, _booked_meeting(instance.saved_state() or instance), None)
+
+def _matrix_profile(profile):
+    # Rates assigned as strings or floats are only converted when read back from the database
+    hourly_rate = TutorProfile._meta.get_field('hourly_rate').to_python(profile.hourly_rate)
+    return profile.tutor_id, hourly_rate, normalise_subjects(profile.subjects)
+
+@receiver(post_save, sender=TutorProfile)
+def move_saved_profile(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    old = None if created else _matrix_profile(instance.saved_state() or instance)
+    new = _matrix_profile(instance)
+    if old != new:
+        update_availability_matrix(lambda matrix: (
+            (old is None or old[0] == new[0] or matrix.set_profile(old[0], None, [])) and matrix.set_profile(*new)
+        ))
+
+@receiver(post_delete, sender=TutorProfile)
+def remove_deleted_profile(sender, instance, **kwargs):
+    update_availability_matrix(lambda matrix: matrix.set_profile(instance.tutor_id, None, []))
+
+def _matrix_tutor(user):
+    """Return the row a user has in the matrix, or None if they are not a tutor."""
+
+    if user is None or user.user_type != 'Tutor':
+        return None
+    return user.id, user.username, user.first_name, user.last_name
+
+@receiver(post_save, sender=User)
+def invalidate_saved_tutor(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    # Only tutors have rows, so students, admins and logins leave the matrix alone
+    old = None if created else _matrix_tutor(instance.saved_state())
+    if old != _matrix_tutor(instance):
+        invalidate_availability_matrix()
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_tutor(sender, instance, **kwargs):
+    if _matrix_tutor(instance.saved_state() or instance):
+        invalidate_availability_matrix()
@@ -0,0 +1,127 @@
+from collections import Counter
+from datetime import date, timedelta
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+from django.db.models.functions import TruncWeek
+from .models import DashboardStat, Lesson, Meeting, User
+
+STUDENTS = 'students'
+TUTORS = 'tutors'
+OUTSTANDING_REQUESTS = 'outstanding_requests'
+USER_TYPE_STATS = {'Student': STUDENTS, 'Tutor': TUTORS}
+
+def week_start(day):
+    return day - timedelta(days=day.weekday())
+
+def scheduled_meetings_stat(day):
+    """Return the name of the counter of scheduled meetings in the week containing day."""
+
+    return f'scheduled_meetings:{week_start(day).isoformat()}'
+
+def count_stat(name):
+    """Count the value of a counter from scratch."""
+
+    if name == STUDENTS:
+        return User.objects.filter(user_type='Student').count()
+    if name == TUTORS:
+        return User.objects.filter(user_type='Tutor').count()
+    if name == OUTSTANDING_REQUESTS:
+        return Lesson.objects.count()
+    if name.startswith('scheduled_meetings:'):
+        start = date.fromisoformat(name.split(':', 1)[1])
+        return Meeting.objects.filter(
+            status='scheduled',
+            date__range=(start, start + timedelta(days=6))
+        ).count()
+    raise ValueError(f"Unknown stat {name!r}")
+
+def weekly_meeting_counts(meetings):
+    """Return the weekly counter name and count of each week the scheduled meetings fall in."""
+
+    weeks = (
+        meetings.filter(status='scheduled')
+        .annotate(week=TruncWeek('date'))
+        .values('week')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    return {scheduled_meetings_stat(row['week']): row['total'] for row in weeks}
+
+def count_stats(names):
+    """Count several counters from scratch, the weekly meeting counters in one grouped query."""
+
+    weekly = [name for name in names if name.startswith('scheduled_meetings:')]
+    counts = {name: count_stat(name) for name in names if name not in weekly}
+    if weekly:
+        starts = [date.fromisoformat(name.split(':', 1)[1]) for name in weekly]
+        totals = weekly_meeting_counts(Meeting.objects.filter(date__range=(min(starts), max(starts) + timedelta(days=6))))
+        counts.update({name: totals.get(name, 0) for name in weekly})
+    return counts
+
+def increment_stat(name, delta=1):
+    """Add delta to a counter in the database, counting it from scratch if it does not exist yet."""
+
+    if not DashboardStat.objects.filter(name=name).update(value=F('value') + delta):
+        # The change being counted is already saved, so the fresh count includes it
+        DashboardStat.objects.update_or_create(name=name, defaults={'value': count_stat(name)})
+
+def row_stat(model, row):
+    """Return the counter a User, Meeting or Lesson row currently counts towards, if any."""
+
+    if model is User:
+        return USER_TYPE_STATS.get(row.user_type)
+    if model is Lesson:
+        return OUTSTANDING_REQUESTS
+    if model is Meeting and row.status == 'scheduled' and row.date:
+        # Dates assigned as ISO strings are only converted when read back from the database
+        return scheduled_meetings_stat(Meeting._meta.get_field('date').to_python(row.date))
+    return None
+
+def count_rows(model, rows, delta=1):
+    """
+    Add rows just inserted, or with delta=-1 take off rows just removed, from the counters.
+
+    Bulk writes skip the signals that count single rows, so they count
+    their batch here instead: one update for the counters that exist and
+    one grouped count for the weeks that do not, however many it touches.
+    """
+
+    deltas = Counter(filter(None, (row_stat(model, row) for row in rows)))
+    if not deltas:
+        return
+    existing = set(DashboardStat.objects.filter(name__in=deltas).values_list('name', flat=True))
+    if existing:
+        DashboardStat.objects.filter(name__in=existing).update(value=F('value') + Case(
+            *[When(name=name, then=Value(delta * deltas[name])) for name in sorted(existing)], default=Value(0)
+        ))
+    missing = deltas.keys() - existing
+    if missing:
+        # The rows being counted are already written, so the fresh counts include them
+        DashboardStat.objects.bulk_create(
+            [DashboardStat(name=name, value=value) for name, value in count_stats(missing).items()],
+            ignore_conflicts=True
+        )
+
+def get_stats(*names):
+    """Return a dict of the named counters, read in one query and counted only if missing."""
+
+    stats = dict(DashboardStat.objects.filter(name__in=names).values_list('name', 'value'))
+    missing = {name: count_stat(name) for name in names if name not in stats}
+    if missing:
+        DashboardStat.objects.bulk_create(
+            [DashboardStat(name=name, value=value) for name, value in missing.items()],
+            ignore_conflicts=True
+        )
+    return {**stats, **missing}
+
+def rebuild_stats():
+    """Recount every counter from scratch, replacing whatever was stored."""
+
+    stats = {name: count_stat(name) for name in [STUDENTS, TUTORS, OUTSTANDING_REQUESTS]}
+    stats[scheduled_meetings_stat(date.today())] = 0
+    stats.update(weekly_meeting_counts(Meeting.objects.all()))
+
+    with transaction.atomic():
+        DashboardStat.objects.all().delete()
+        DashboardStat.objects.bulk_create(DashboardStat(name=name, value=value) for name, value in stats.items())
+    return stats
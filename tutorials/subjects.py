@@ -0,0 +1,74 @@
+from django.db import transaction
+from django.db.models import Count
+from .models import Subject, TutorProfile
+
+def normalise_subject(name):
+    """Return the indexed form of a subject name: whitespace collapsed and casefolded."""
+
+    return ' '.join(str(name).split()).casefold()
+
+def normalise_subjects(names):
+    return sorted({normalise_subject(name) for name in names or []} - {''})
+
+# Subjects from TutorSubjectsForm.SUBJECT_CHOICES that cover one of
+# Lesson.KNOWLEDGE_AREAS under another name, by normalised name
+SUBJECT_KNOWLEDGE_AREAS = {
+    'python/tensorflow': 'python',
+}
+
+def taught_subjects(subject):
+    """Return a normalised subject with the lesson knowledge area it covers, for matching tutors to lessons."""
+
+    area = SUBJECT_KNOWLEDGE_AREAS.get(subject)
+    return [subject] if area is None else [subject, area]
+
+def get_subjects(names):
+    """Return the Subject rows for already normalised names, creating any that are missing."""
+
+    subjects = list(Subject.objects.filter(name__in=names))
+    if len(subjects) < len(names):
+        Subject.objects.bulk_create([Subject(name=name) for name in names], ignore_conflicts=True)
+        subjects = list(Subject.objects.filter(name__in=names))
+    return subjects
+
+def sync_subject_index(profile):
+    """Make a profile's subject index match its subjects list."""
+
+    profile.subject_index.set(get_subjects(normalise_subjects(profile.subjects)))
+
+def rebuild_subject_index(profiles=None, batch_size=1000):
+    """Rebuild the subject index of profiles, or of every profile, with bulk writes instead of signals."""
+
+    profiles = TutorProfile.objects.all() if profiles is None else profiles
+    rows = [(profile_id, normalise_subjects(subjects)) for profile_id, subjects in profiles.values_list('id', 'subjects')]
+    subject_ids = {
+        subject.name: subject.id
+        for subject in get_subjects(sorted({name for profile_id, names in rows for name in names}))
+    }
+    Through = TutorProfile.subject_index.through
+    with transaction.atomic():
+        Through.objects.filter(tutorprofile_id__in=profiles.values('id')).delete()
+        Through.objects.bulk_create(
+            (
+                Through(tutorprofile_id=profile_id, subject_id=subject_ids[name])
+                for profile_id, names in rows
+                for name in names
+            ),
+            batch_size=batch_size
+        )
+
+def filter_by_subjects(tutors, names, match_all=False):
+    """
+    Narrow a tutor queryset to those teaching any, or all, of the named subjects.
+
+    Matching is a join on the indexed subject relation, so the result stays a
+    lazy queryset that the paginator can slice in the database.
+    """
+
+    names = normalise_subjects(names)
+    if not names:
+        return tutors
+    profiles = TutorProfile.objects.filter(subject_index__name__in=names)
+    if match_all:
+        profiles = profiles.values('tutor_id').annotate(matched=Count('subject_index')).filter(matched=len(names))
+    return tutors.filter(id__in=profiles.values('tutor_id'))
@@ -0,0 +1,61 @@
+import copy
+from datetime import date, timedelta
+from django.core.exceptions import ValidationError
+from .availability import WEEKDAYS
+
+# The first and last (month, day) of each of Lesson.TERMS; none runs over the new year
+TERM_DATES = {
+    'sept-dec': ((9, 1), (12, 31)),
+    'jan-april': ((1, 1), (4, 30)),
+    'may-july': ((5, 1), (7, 31)),
+}
+
+def term_dates(term, today=None):
+    """Return the first and last dates of the term's next sitting that has not ended by today."""
+
+    today = today or date.today()
+    (first_month, first_day), (last_month, last_day) = TERM_DATES[term]
+    year = today.year if (today.month, today.day) <= (last_month, last_day) else today.year + 1
+    return date(year, first_month, first_day), date(year, last_month, last_day)
+
+def next_occurrence(start_date, day):
+    """Return the first date on or after start_date that falls on the weekday day ('mon'...'sun')."""
+
+    return start_date + timedelta(days=(WEEKDAYS.index(day) - start_date.weekday()) % 7)
+
+def weekly_dates(days, first, last):
+    """Return every date from first to last, inclusive, that falls on one of the weekdays, in order."""
+
+    dates = []
+    for day in dict.fromkeys(days):
+        if day in WEEKDAYS:
+            occurrence = next_occurrence(first, day)
+            while occurrence <= last:
+                dates.append(occurrence)
+                occurrence += timedelta(weeks=1)
+    return sorted(dates)
+
+def term_meetings(meeting, term, days):
+    """
+    Repeat an unsaved meeting on each of the weekdays, every week to the end of the term.
+
+    The copies start from the meeting's date, or the term's first day if
+    that is later, and differ from it only in their date and day. Raises
+    ValidationError if none of the weekdays falls in that time.
+    """
+
+    first, last = term_dates(term, meeting.date)
+    first = max(first, meeting.date)
+    meetings = []
+    for meeting_date in weekly_dates(days, first, last):
+        occurrence = copy.copy(meeting)
+        occurrence.date = meeting_date
+        occurrence.day = WEEKDAYS[meeting_date.weekday()]
+        meetings.append(occurrence)
+    if not meetings:
+        raise ValidationError(
+            "None of the requested days falls between %(first)s and the end of the term on %(last)s.",
+            code='no_occurrences',
+            params={'first': first, 'last': last},
+        )
+    return meetings
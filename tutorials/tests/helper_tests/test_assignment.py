@@ -0,0 +1,121 @@
+from contextlib import redirect_stdout
+from datetime import date, time
+from io import StringIO
+from decimal import Decimal
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from tutorials.assignment import AssignmentPlanner, assign_outstanding_lessons
+from tutorials.availability import AvailabilityMatrix
+from tutorials.models import Lesson, Meeting, TutorAvailability
+from tutorials.stats import OUTSTANDING_REQUESTS, get_stats, rebuild_stats, scheduled_meetings_stat
+
+def lesson(pk, student_id, days, start, duration=60, knowledge_area='python'):
+    return Lesson(pk=pk, student_id=student_id, knowledge_area=knowledge_area, days=days,
+                  start_time=start, duration=duration)
+
+class AssignmentPlannerTests(TestCase):
+    def index(self, tutors, slots, meetings=()):
+        return AvailabilityMatrix(
+            [(pk, f'@tutor{pk}', 'Tutor', str(pk), Decimal(rate)) for pk, rate in tutors],
+            [(pk, 'python') for pk, _ in tutors],
+            slots,
+            meetings,
+            date(2025, 1, 6),
+        )
+
+    def test_each_lesson_goes_to_a_free_tutor(self):
+        index = self.index([(1, 10), (2, 20)], [(1, 'Monday', time(9), time(12)), (2, 'Monday', time(9), time(12))])
+        lessons = [lesson(1, 10, ['mon'], time(10)), lesson(2, 11, ['mon'], time(10, 30))]
+        plan = AssignmentPlanner(index).plan(lessons)
+        self.assertEqual({lesson.pk: assignment for lesson, assignment in plan.items()},
+                         {1: (1, 'mon'), 2: (2, 'mon')})
+
+    def test_back_to_back_lessons_share_a_tutor(self):
+        index = self.index([(1, 10)], [(1, 'Monday', time(9), time(12))])
+        plan = AssignmentPlanner(index).plan([lesson(1, 10, ['mon'], time(9)), lesson(2, 11, ['mon'], time(10))])
+        self.assertEqual(len(plan), 2)
+
+    def test_a_student_is_not_double_booked(self):
+        index = self.index([(1, 10), (2, 10)], [(1, 'Monday', time(9), time(12)), (2, 'Monday', time(9), time(12))])
+        plan = AssignmentPlanner(index).plan([lesson(1, 10, ['mon'], time(10)), lesson(2, 10, ['mon'], time(10, 30))])
+        self.assertEqual(len(plan), 1)
+
+    def test_existing_meetings_block_tutor_and_student(self):
+        monday = date(2025, 1, 6)
+        index = self.index([(1, 10)], [(1, 'Monday', time(9), time(12))], [(1, monday, time(10), time(11))])
+        self.assertEqual(AssignmentPlanner(index).plan([lesson(1, 10, ['mon'], time(10))]), {})
+
+        index = self.index([(1, 10)], [(1, 'Monday', time(9), time(12))])
+        planner = AssignmentPlanner(index, [(10, monday, time(10), time(11))])
+        self.assertEqual(planner.plan([lesson(1, 10, ['mon'], time(10))]), {})
+
+    def test_displaced_lesson_moves_to_another_option(self):
+        # The flexible lesson takes Monday, its first day, but the later
+        # lesson can only go there, so the flexible one moves to Tuesday
+        index = self.index([(1, 10)], [(1, 'Monday', time(9), time(12)), (1, 'Tuesday', time(9), time(12))])
+        flexible = lesson(1, 10, ['mon', 'tue'], time(10))
+        fixed = lesson(2, 11, ['mon'], time(10))
+        plan = AssignmentPlanner(index).plan([flexible, fixed])
+        self.assertEqual(plan[flexible][1], 'tue')
+        self.assertEqual(plan[fixed][1], 'mon')
+
+    def test_without_augmenting_the_later_lesson_is_unplaced(self):
+        index = self.index([(1, 10)], [(1, 'Monday', time(9), time(12)), (1, 'Tuesday', time(9), time(12))])
+        flexible = lesson(1, 10, ['mon', 'tue'], time(10))
+        fixed = lesson(2, 11, ['mon'], time(10))
+        plan = AssignmentPlanner(index, max_depth=0).plan([flexible, fixed])
+        self.assertEqual(list(plan), [flexible])
+
+class AssignOutstandingLessonsTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/tests/fixtures/lessons.json',
+                'tutorials/tests/fixtures/tutor_profile.json',
+                'tutorials/tests/fixtures/tutor_availability.json']
+
+    def setUp(self):
+        self.start = date(2030, 1, 7)
+        rebuild_stats()
+
+    def test_assigns_and_removes_placeable_requests(self):
+        meetings, unassigned = assign_outstanding_lessons(self.start)
+        # Python on Monday 10:00 fits janedoe; C++ on Monday/Tuesday 13:00 fits janedoe's Monday too.
+        # Each runs every Monday of its term: 17 from 7 January to April, 18 from September to December
+        self.assertEqual(len(meetings), 35)
+        self.assertEqual(unassigned, [])
+        python = Meeting.objects.filter(student__username='@charlie')
+        self.assertEqual(python.count(), 18)
+        self.assertEqual((python.first().date, python.last().date), (date(2030, 9, 2), date(2030, 12, 30)))
+        self.assertEqual({(meeting.tutor.username, meeting.day, meeting.start_time, meeting.end_time) for meeting in python},
+                         {('@janedoe', 'mon', time(10), time(11))})
+        cpp = Meeting.objects.filter(student__username='@mikemiles')
+        self.assertEqual((cpp.count(), cpp.first().date), (17, self.start))
+        self.assertFalse(Lesson.objects.exists())
+        stats = get_stats(OUTSTANDING_REQUESTS, scheduled_meetings_stat(self.start))
+        self.assertEqual(stats, {OUTSTANDING_REQUESTS: 0, scheduled_meetings_stat(self.start): 1})
+
+    def test_unplaceable_requests_stay_outstanding(self):
+        TutorAvailability.objects.all().delete()
+        meetings, unassigned = assign_outstanding_lessons(self.start)
+        self.assertEqual(meetings, [])
+        self.assertEqual(len(unassigned), 2)
+        self.assertEqual(Lesson.objects.count(), 2)
+
+    def test_dry_run_writes_nothing(self):
+        meetings, unassigned = assign_outstanding_lessons(self.start, dry_run=True)
+        self.assertEqual(len(meetings), 35)
+        self.assertFalse(Meeting.objects.exists())
+        self.assertEqual(Lesson.objects.count(), 2)
+
+    def test_meetings_are_bulk_created(self):
+        with CaptureQueriesContext(connection) as queries:
+            assign_outstanding_lessons(self.start)
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "tutorials_meeting"')]
+        self.assertEqual(len(inserts), 1)
+
+    def test_assign_lessons_command(self):
+        with redirect_stdout(StringIO()) as output:
+            call_command('assign_lessons', '--start', '2030-01-07', '--dry-run')
+        self.assertIn('Would schedule 35 sessions; 0 requests could not be placed.', output.getvalue())
+        self.assertFalse(Meeting.objects.exists())
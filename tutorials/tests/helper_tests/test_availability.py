@@ -0,0 +1,196 @@
+from datetime import date, time, timedelta
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from tutorials import availability
+from tutorials.availability import AvailabilityMatrix, get_availability_matrix, save_weekly_availability, slot_span
+from tutorials.models import Meeting, TutorAvailability, User
+
+class AvailabilityMatrixTests(TestCase):
+    def setUp(self):
+        self.today = date(2030, 1, 7)
+        self.matrix = AvailabilityMatrix(
+            [(1, '@one', 'One', 'Tutor', None), (2, '@two', 'Two', 'Tutor', None), (3, '@three', 'Three', 'Tutor', None)],
+            [(1, 'java'), (2, 'java'), (3, 'python')],
+            [
+                (1, 'Tuesday', time(9), time(17)),
+                (2, 'Tuesday', time(14), time(15)),
+                (2, 'Tuesday', time(15), time(16)),
+                (3, 'Tuesday', time(9), time(17)),
+            ],
+            [(1, date(2030, 1, 8), time(16), time(17))],
+            self.today,
+        )
+
+    def usernames(self, *args, **kwargs):
+        return [tutor['username'] for tutor in self.matrix.free_tutors(*args, **kwargs)]
+
+    def test_slot_span(self):
+        self.assertEqual(slot_span(time(14), time(15, 30)), (84, 93))
+        self.assertEqual(slot_span(time(14, 5), time(15, 25)), (85, 92))
+        self.assertEqual(slot_span(time(14, 5), time(15, 25), cover=True), (84, 93))
+
+    def test_free_tutors_by_subject(self):
+        self.assertEqual(self.usernames('tue', time(14), time(15, 30), 'Java'), ['@one', '@two'])
+        self.assertEqual(self.usernames('tue', time(14), time(15, 30)), ['@one', '@two', '@three'])
+        self.assertEqual(self.usernames('tue', time(14), time(15, 30), 'scala'), [])
+
+    def test_slot_must_be_wholly_available(self):
+        self.assertEqual(self.usernames('tue', time(13, 50), time(15), 'java'), ['@one'])
+        self.assertEqual(self.usernames('wed', time(14), time(15)), [])
+
+    def test_booked_time_is_not_free(self):
+        self.assertEqual(self.usernames('tue', time(15), time(16), 'java'), ['@one', '@two'])
+        self.assertEqual(self.usernames('tue', time(15, 30), time(16, 10), 'java'), [])
+        self.assertEqual(self.usernames('tue', time(17), time(17)), [])
+
+    def test_incremental_changes(self):
+        self.matrix.add_meeting(1, date(2030, 1, 8), time(16), time(17), delta=-1)
+        self.matrix.add_availability(2, 'Tuesday', time(15), time(16), delta=-1)
+        self.assertEqual(self.usernames('tue', time(15), time(16), 'java'), ['@one'])
+        # Past meetings do not count, and unknown tutors cannot be added
+        self.matrix.add_meeting(1, date(2030, 1, 1), time(15), time(16))
+        self.assertEqual(self.usernames('tue', time(15), time(16), 'java'), ['@one'])
+        self.assertFalse(self.matrix.add_availability(4, 'Tuesday', time(9), time(17)))
+
+    def test_profile_changes(self):
+        # Form subjects count for the knowledge area they cover
+        self.assertTrue(self.matrix.set_profile(2, 25, ['python/tensorflow']))
+        self.assertEqual(self.usernames('tue', time(14), time(16), 'python'), ['@two', '@three'])
+        self.assertEqual(self.usernames('tue', time(14), time(16), 'java'), ['@one'])
+        self.assertEqual(self.matrix.rates.tolist()[1], 25)
+        self.assertFalse(self.matrix.set_profile(4, None, []))
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AvailabilityMatrixUpdateTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/tests/fixtures/tutor_profile.json',
+                'tutorials/tests/fixtures/tutor_availability.json']
+
+    def setUp(self):
+        cache.clear()
+        availability._cached_matrix = (None, None)
+        self.tutor = User.objects.get(username='@janedoe')
+        self.student = User.objects.get(username='@charlie')
+        self.monday = date.today() + timedelta(days=7 - date.today().weekday())
+        self.matrix = get_availability_matrix()
+
+    def tearDown(self):
+        availability._cached_matrix = (None, None)
+
+    def usernames(self, *args):
+        return [tutor['username'] for tutor in get_availability_matrix().free_tutors(*args)]
+
+    def test_saves_and_deletes_update_the_matrix_in_place(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            meeting = Meeting.objects.create(
+                tutor=self.tutor, student=self.student, date=self.monday, day='mon',
+                start_time='10:00', end_time='11:00', topic='Python'
+            )
+        with self.assertNumQueries(0):
+            self.assertIs(get_availability_matrix(), self.matrix)
+            self.assertEqual(self.usernames('mon', time(10), time(11), 'python'), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            meeting.start_time, meeting.end_time = time(12), time(13)
+            meeting.save()
+        self.assertEqual(self.usernames('mon', time(10), time(11), 'python'), ['@janedoe'])
+        self.assertEqual(self.usernames('mon', time(12), time(13), 'python'), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            meeting.delete()
+            TutorAvailability.objects.create(tutor=self.tutor, day='Friday', start_time='09:00', end_time='10:00')
+        self.assertIs(get_availability_matrix(), self.matrix)
+        self.assertEqual(self.usernames('mon', time(12), time(13), 'python'), ['@janedoe'])
+        self.assertEqual(self.usernames('fri', time(9), time(10), 'java'), ['@janedoe'])
+
+    def test_another_process_change_forces_a_rebuild(self):
+        availability.bump_availability_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            TutorAvailability.objects.create(tutor=self.tutor, day='Friday', start_time='09:00', end_time='10:00')
+        self.assertIsNot(get_availability_matrix(), self.matrix)
+        self.assertEqual(self.usernames('fri', time(9), time(10), 'java'), ['@janedoe'])
+
+    def test_new_tutors_force_a_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user('@newtutor', first_name='New', last_name='Tutor',
+                                     email='new@example.org', password='Password123', user_type='Tutor')
+        self.assertIsNot(get_availability_matrix(), self.matrix)
+
+    def test_only_tutor_changes_force_a_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.first_name = 'Charles'
+            self.student.save()
+            self.tutor.save(update_fields=['last_login'])
+        self.assertIs(get_availability_matrix(), self.matrix)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tutor.first_name = 'Janet'
+            self.tutor.save()
+        self.assertIsNot(get_availability_matrix(), self.matrix)
+
+    def test_deferred_loads_update_the_matrix_in_place(self):
+        slot = TutorAvailability.objects.only('id').get(tutor=self.tutor)
+        with self.captureOnCommitCallbacks(execute=True):
+            slot.is_available = False
+            slot.save()
+        self.assertIs(get_availability_matrix(), self.matrix)
+        self.assertEqual(self.usernames('mon', time(10), time(11), 'python'), [])
+
+    def test_weekly_availability_saves_update_the_matrix_in_place(self):
+        slots = {('Monday', time(9), time(18)), ('Friday', time(9), time(10))}
+        with self.captureOnCommitCallbacks(execute=True):
+            save_weekly_availability(self.tutor, slots)
+        self.assertIs(get_availability_matrix(), self.matrix)
+        self.assertEqual(self.usernames('fri', time(9), time(10), 'java'), ['@janedoe'])
+
+        slots.remove(('Friday', time(9), time(10)))
+        with self.captureOnCommitCallbacks(execute=True):
+            save_weekly_availability(self.tutor, slots)
+        self.assertIs(get_availability_matrix(), self.matrix)
+        self.assertEqual(self.usernames('fri', time(9), time(10), 'java'), [])
+
+class SaveWeeklyAvailabilityTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/tests/fixtures/tutor_availability.json']
+
+    def setUp(self):
+        self.tutor = User.objects.get(username='@janedoe')
+        self.monday = TutorAvailability.objects.get(tutor=self.tutor, day='Monday')
+
+    def slots(self):
+        return {
+            (slot.day, slot.start_time, slot.end_time): slot.is_available
+            for slot in TutorAvailability.objects.filter(tutor=self.tutor)
+        }
+
+    def test_only_differences_are_written(self):
+        monday = ('Monday', self.monday.start_time, self.monday.end_time)
+        slots = {monday, ('Tuesday', time(9), time(12)), ('Tuesday', time(14), time(17))}
+        self.assertEqual(save_weekly_availability(self.tutor, slots), (2, 0, 0))
+        self.assertEqual(self.slots(), dict.fromkeys(slots, True))
+        self.assertTrue(TutorAvailability.objects.filter(pk=self.monday.pk).exists())
+
+        self.assertEqual(save_weekly_availability(self.tutor, slots), (0, 0, 0))
+        slots.remove(('Tuesday', time(14), time(17)))
+        self.assertEqual(save_weekly_availability(self.tutor, slots), (0, 0, 1))
+        self.assertEqual(self.slots(), dict.fromkeys(slots, True))
+
+    def test_kept_unavailable_slots_are_switched_on(self):
+        TutorAvailability.objects.filter(pk=self.monday.pk).update(is_available=False)
+        monday = ('Monday', self.monday.start_time, self.monday.end_time)
+        self.assertEqual(save_weekly_availability(self.tutor, {monday}), (0, 1, 0))
+        self.assertEqual(self.slots(), {monday: True})
+
+    def test_other_tutors_are_untouched(self):
+        save_weekly_availability(self.tutor, set())
+        self.assertEqual(self.slots(), {})
+        self.assertEqual(TutorAvailability.objects.count(), 1)
+
+    def test_a_full_week_is_saved_in_a_fixed_number_of_queries(self):
+        TutorAvailability.objects.filter(pk=self.monday.pk).update(is_available=False)
+        slots = {(day, time(9), time(17)) for day in ['Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']}
+        slots.add(('Monday', self.monday.start_time, self.monday.end_time))
+        # Savepoint, read, bulk insert, bulk update and release
+        with self.assertNumQueries(5):
+            save_weekly_availability(self.tutor, slots)
+        self.assertEqual(self.slots(), dict.fromkeys(slots, True))
@@ -1,9 +1,10 @@
 from django.conf import settings
 from django.test import TestCase
 from django.urls import reverse
-from django.http import HttpRequest
-from tutorials.helpers import admin_dashboard_context, tutor_dashboard_context
-from tutorials.models import User
+from django.http import HttpRequest, QueryDict
+from datetime import date
+from tutorials.helpers import admin_dashboard_context, get_lesson_request_feed, tutor_dashboard_context, build_week_schedule, get_week_start
+from tutorials.models import User, Lesson
 
 class AdminDashboardContextTests(TestCase):
     fixtures = ['tutorials/tests/fixtures/other_users.json', 'tutorials/tests/fixtures/lessons.json']
@@ -13,8 +14,46 @@ class AdminDashboardContextTests(TestCase):
         
         self.assertEqual(context['total_students'], 2)
         self.assertEqual(context['total_tutors'], 2)
-        self.assertEqual(context['requests'].count(), 2)
-        self.assertEqual(context['requests'].first().knowledge_area, 'python')  # Most recent lesson
+        self.assertEqual(len(context['requests']), 2)
+        self.assertEqual(context['requests'][0].knowledge_area, 'python')  # Most recent lesson
+
+class LessonRequestFeedTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json', 'tutorials/tests/fixtures/lessons.json']
+
+    def setUp(self):
+        self.student = User.objects.get(username='@charlie')
+        for index in range(5):
+            Lesson.objects.create(student=self.student, knowledge_area='java', term='may-july',
+                                  duration=60, days=['mon'], venue_preference='online')
+
+    def test_pages_follow_cursor_without_gaps(self):
+        seen = []
+        params = QueryDict()
+        while True:
+            feed = get_lesson_request_feed(params, page_size=3)
+            seen.extend(lesson.id for lesson in feed['requests'])
+            if not feed['next_page_query']:
+                break
+            params = QueryDict(feed['next_page_query'])
+        expected = list(Lesson.objects.order_by('-created_at', 'id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_filters_apply_and_carry_into_next_page(self):
+        feed = get_lesson_request_feed(QueryDict('knowledge_area=java&venue=online'), page_size=3)
+        self.assertTrue(all(lesson.knowledge_area == 'java' for lesson in feed['requests']))
+        self.assertEqual(feed['request_filters'], {'knowledge_area': 'java', 'venue': 'online'})
+        self.assertIn('knowledge_area=java', feed['next_page_query'])
+
+    def test_invalid_filters_and_cursor_are_ignored(self):
+        feed = get_lesson_request_feed(QueryDict('term=winter&after=nonsense'), page_size=10)
+        self.assertEqual(len(feed['requests']), 7)
+        self.assertTrue(feed['is_first_page'])
+        self.assertIsNone(feed['next_page_query'])
+
+    def test_page_is_one_query(self):
+        with self.assertNumQueries(1):
+            feed = get_lesson_request_feed(QueryDict(), page_size=3)
+            [lesson.student.username for lesson in feed['requests']]
 
 class TutorDashboardContextTests(TestCase):
     fixtures = ['tutorials/fixtures/test_meetings.json', 
@@ -26,6 +65,7 @@ class TutorDashboardContextTests(TestCase):
         self.client.login(username=self.tutor.username, password="Password123")
         self.request = HttpRequest()
         self.request.user = self.tutor
+        self.request.GET = QueryDict('month=12&year=2024')  # month of the fixture meetings
 
     def test_tutor_dashboard_context(self):
         context = tutor_dashboard_context(self.request, self.tutor)
@@ -40,4 +80,37 @@ class TutorDashboardContextTests(TestCase):
         self.assertEqual(availability.tutor, self.tutor)
         self.assertIn('Monday', [slot.day for slot in context['availability_slots']])
         self.assertIn('calendar_data', context)
-        self.assertIsInstance(context['calendar_data'], dict)
\ No newline at end of file
+        self.assertIsInstance(context['calendar_data'], dict)
+class WeekScheduleTests(TestCase):
+    fixtures = ['tutorials/fixtures/test_meetings.json',
+                'tutorials/tests/fixtures/other_users.json']
+
+    def setUp(self):
+        self.student = User.objects.get(username="@charlie")
+
+    def test_only_meetings_in_week_are_included(self):
+        context = build_week_schedule(self.student, date(2024, 12, 9))
+        meetings = [meeting for days in context['meetings_sorted'].values() for day in days.values() for meeting in day]
+        self.assertEqual([meeting.date for meeting in meetings], [date(2024, 12, 9)])
+        self.assertIn(meetings[0], context['meetings_sorted'][meetings[0].time_of_day]['mon'])
+
+    def test_week_navigation(self):
+        context = build_week_schedule(self.student, date(2024, 12, 9))
+        self.assertEqual(context['prev_week'], date(2024, 12, 2))
+        self.assertEqual(context['next_week'], date(2024, 12, 16))
+        self.assertEqual(context['week_end'], date(2024, 12, 15))
+        self.assertEqual(len(context['week_dates']), 7)
+
+    def test_runs_a_single_query(self):
+        with self.assertNumQueries(1):
+            build_week_schedule(self.student, date(2024, 12, 16))
+
+    def test_get_week_start_snaps_to_monday(self):
+        request = HttpRequest()
+        request.GET = QueryDict('week=2024-12-12')
+        self.assertEqual(get_week_start(request), date(2024, 12, 9))
+
+    def test_get_week_start_ignores_invalid_week(self):
+        request = HttpRequest()
+        request.GET = QueryDict('week=soon')
+        self.assertEqual(get_week_start(request).weekday(), 0)
@@ -0,0 +1,102 @@
+from datetime import date, time
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from tutorials.dashboard_cache import bump_dashboard_version, cached_dashboard_context, get_dashboard_version
+from tutorials.models import User, Meeting, TutorAvailability, TutorProfile
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DashboardCacheTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/tests/fixtures/tutor_profile.json']
+
+    def setUp(self):
+        cache.clear()
+        self.tutor = User.objects.get(username='@janedoe')
+        self.student = User.objects.get(username='@charlie')
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return {'builds': self.builds}
+
+    def test_context_is_built_once(self):
+        cached_dashboard_context(self.tutor, ['tutor', 2024, 12], self.build)
+        context = cached_dashboard_context(self.tutor, ['tutor', 2024, 12], self.build)
+        self.assertEqual(context, {'builds': 1})
+
+    def test_parts_are_cached_separately(self):
+        cached_dashboard_context(self.tutor, ['tutor', 2024, 12], self.build)
+        cached_dashboard_context(self.tutor, ['tutor', 2025, 1], self.build)
+        self.assertEqual(self.builds, 2)
+
+    def test_bump_invalidates_context(self):
+        cached_dashboard_context(self.tutor, ['tutor', 2024, 12], self.build)
+        bump_dashboard_version(self.tutor.pk)
+        cached_dashboard_context(self.tutor, ['tutor', 2024, 12], self.build)
+        self.assertEqual(self.builds, 2)
+
+    def test_bump_without_version_starts_a_new_one(self):
+        version = get_dashboard_version(self.tutor.pk)
+        cache.delete(f'dashboard-version:{self.tutor.pk}')
+        bump_dashboard_version(self.tutor.pk)
+        self.assertGreater(get_dashboard_version(self.tutor.pk), version)
+
+    def test_meeting_changes_bump_tutor_and_student(self):
+        versions = [get_dashboard_version(self.tutor.pk), get_dashboard_version(self.student.pk)]
+        with self.captureOnCommitCallbacks(execute=True):
+            meeting = Meeting.objects.create(tutor=self.tutor, student=self.student, date=date(2024, 12, 2),
+                                             start_time=time(10, 0), end_time=time(11, 0))
+        self.assertNotEqual(get_dashboard_version(self.tutor.pk), versions[0])
+        self.assertNotEqual(get_dashboard_version(self.student.pk), versions[1])
+
+        version = get_dashboard_version(self.student.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            meeting.delete()
+        self.assertNotEqual(get_dashboard_version(self.student.pk), version)
+
+    def test_changes_bump_only_after_commit(self):
+        version = get_dashboard_version(self.tutor.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            TutorAvailability.objects.create(tutor=self.tutor, day='Monday', start_time=time(9, 0), end_time=time(10, 0))
+            self.assertEqual(get_dashboard_version(self.tutor.pk), version)
+        self.assertNotEqual(get_dashboard_version(self.tutor.pk), version)
+
+    def test_availability_and_profile_changes_bump_tutor(self):
+        version = get_dashboard_version(self.tutor.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            TutorAvailability.objects.create(tutor=self.tutor, day='Monday', start_time=time(9, 0), end_time=time(10, 0))
+        self.assertNotEqual(get_dashboard_version(self.tutor.pk), version)
+
+        version = get_dashboard_version(self.tutor.pk)
+        profile = TutorProfile.objects.get(tutor=self.tutor)
+        profile.hourly_rate = 30
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        self.assertNotEqual(get_dashboard_version(self.tutor.pk), version)
+
+    def test_cached_tutor_dashboard_skips_the_database(self):
+        self.client.login(username='@janedoe', password='Password123')
+        self.client.get(reverse('dashboard'))
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('calendar_data', response.context)
+
+    def test_cached_tutor_dashboard_shows_new_availability(self):
+        self.client.login(username='@janedoe', password='Password123')
+        self.client.get(reverse('dashboard'))
+        with self.captureOnCommitCallbacks(execute=True):
+            TutorAvailability.objects.create(tutor=self.tutor, day='Monday', start_time=time(9, 0), end_time=time(10, 0))
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(len(response.context['availability_slots']), TutorAvailability.objects.filter(tutor=self.tutor).count())
+
+    def test_cached_student_dashboard_skips_the_database(self):
+        self.client.login(username='@charlie', password='Password123')
+        self.client.get(reverse('dashboard'))
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('meetings_sorted', response.context)
@@ -0,0 +1,140 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from tutorials import availability
+from tutorials.availability import AvailabilityMatrix, get_availability_matrix
+from tutorials.matching import match, match_tutors
+from tutorials.models import Lesson, Meeting, TutorAvailability, TutorProfile, User
+
+def next_weekday(weekday):
+    today = date.today()
+    return today + timedelta(days=(weekday - today.weekday()) % 7 or 7)
+
+class MatchTests(TestCase):
+    def setUp(self):
+        self.matrix = AvailabilityMatrix(
+            [
+                (1, '@cheap', 'Cheap', 'Tutor', Decimal('10.00')),
+                (2, '@pricey', 'Pricey', 'Tutor', Decimal('40.00')),
+                (3, '@busy', 'Busy', 'Tutor', Decimal('10.00')),
+                (4, '@norate', 'No', 'Rate', None),
+                (5, '@tensorflow', 'Tensor', 'Flow', Decimal('80.00')),
+            ],
+            [(1, 'python'), (2, 'python'), (3, 'python'), (4, 'java'), (5, 'python/tensorflow')],
+            [
+                (1, 'Monday', time(9), time(12)),
+                (2, 'Monday', time(9), time(17)),
+                (2, 'Wednesday', time(9), time(17)),
+                (3, 'Monday', time(9), time(17)),
+                (3, 'Wednesday', time(9), time(17)),
+            ],
+            [(3, next_weekday(0), time(10, 30), time(11, 30))],
+            date.today(),
+        )
+
+    def match(self, **kwargs):
+        lesson = {'knowledge_area': 'Python', 'days': ['mon', 'wed'], 'start_time': time(10), 'duration': 60}
+        lesson.update(kwargs)
+        return match(self.matrix, **lesson)
+
+    def test_only_tutors_of_the_subject_are_ranked(self):
+        self.assertEqual([match['username'] for match in self.match(knowledge_area='java')], ['@norate'])
+        self.assertEqual(self.match(knowledge_area='scala'), [])
+
+    def test_ranks_by_availability_conflicts_rate_and_load(self):
+        matches = self.match()
+        self.assertEqual([match['username'] for match in matches], ['@pricey', '@cheap', '@busy', '@tensorflow'])
+        self.assertEqual(matches[0]['covered_days'], ['mon', 'wed'])
+        self.assertEqual(matches[2]['conflicted_days'], ['mon'])
+        self.assertEqual(matches[2]['load'], 1)
+
+    def test_form_subjects_match_their_knowledge_area(self):
+        self.assertIn('@tensorflow', [match['username'] for match in self.match()])
+        self.assertEqual([match['username'] for match in self.match(knowledge_area='Python/Tensorflow')], ['@tensorflow'])
+
+    def test_slot_must_cover_whole_lesson(self):
+        matches = self.match(start_time=time(11, 30))
+        cheap = next(match for match in matches if match['username'] == '@cheap')
+        self.assertEqual(cheap['covered_days'], [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.match(limit=2)), 2)
+
+    def test_lesson_without_start_time_ranks_on_rate_and_load(self):
+        matches = self.match(start_time=None)
+        self.assertEqual(matches[0]['username'], '@cheap')
+        self.assertEqual(matches[0]['covered_days'], [])
+        self.assertEqual(matches[0]['conflicted_days'], [])
+
+class MatchTutorsTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/tests/fixtures/lessons.json',
+                'tutorials/tests/fixtures/tutor_profile.json',
+                'tutorials/tests/fixtures/tutor_availability.json']
+
+    def setUp(self):
+        self.lesson = Lesson.objects.get(pk=1)
+        self.tutor1 = User.objects.get(username='@janedoe')
+        self.tutor2 = User.objects.get(username='@leslielowe')
+
+    def test_matrix_builds_in_four_queries(self):
+        with self.assertNumQueries(4):
+            get_availability_matrix()
+
+    def test_matches_fixture_tutors(self):
+        matches = match_tutors(self.lesson)
+        self.assertEqual([match['tutor_id'] for match in matches], [self.tutor1.id, self.tutor2.id])
+        self.assertEqual(matches[0]['covered_days'], ['mon'])
+
+    def test_matches_see_new_meetings(self):
+        match_tutors(self.lesson)
+        Meeting.objects.create(
+            tutor=self.tutor1, student=self.lesson.student, date=next_weekday(0), day='mon',
+            start_time=time(10), end_time=time(11), topic='Python'
+        )
+        TutorAvailability.objects.create(tutor=self.tutor2, day='Monday', start_time=time(9), end_time=time(12))
+        matches = match_tutors(self.lesson)
+        self.assertEqual(matches[0]['tutor_id'], self.tutor2.id)
+        self.assertEqual(matches[1]['conflicted_days'], ['mon'])
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class MatchingUpdateTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/tests/fixtures/lessons.json',
+                'tutorials/tests/fixtures/tutor_profile.json',
+                'tutorials/tests/fixtures/tutor_availability.json']
+
+    def setUp(self):
+        cache.clear()
+        availability._cached_matrix = (None, None)
+        self.lesson = Lesson.objects.get(pk=1)
+        self.tutor1 = User.objects.get(username='@janedoe')
+        self.matrix = get_availability_matrix()
+
+    def tearDown(self):
+        availability._cached_matrix = (None, None)
+
+    def test_bookings_are_matched_without_a_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Meeting.objects.create(
+                tutor=self.tutor1, student=self.lesson.student, date=next_weekday(0), day='mon',
+                start_time=time(10), end_time=time(11), topic='Python'
+            )
+        with self.assertNumQueries(0):
+            matches = match_tutors(self.lesson)
+        self.assertIs(get_availability_matrix(), self.matrix)
+        jane = next(match for match in matches if match['tutor_id'] == self.tutor1.id)
+        self.assertEqual(jane['conflicted_days'], ['mon'])
+        self.assertEqual(jane['load'], 1)
+
+    def test_profile_changes_are_matched_without_a_rebuild(self):
+        profile = TutorProfile.objects.get(tutor=self.tutor1)
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.subjects = ['Ruby']
+            profile.hourly_rate = Decimal('5.00')
+            profile.save()
+        self.assertIs(get_availability_matrix(), self.matrix)
+        self.assertNotIn(self.tutor1.id, [match['tutor_id'] for match in match_tutors(self.lesson)])
+        self.assertEqual(self.matrix.free_tutors('mon', time(10), time(11), 'ruby')[0]['username'], '@janedoe')
+        self.assertEqual(self.matrix.hourly_rates[self.matrix.rows[self.tutor1.id]], Decimal('5.00'))
@@ -0,0 +1,80 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from tutorials.models import User
+from tutorials.pagination import KeysetPaginator
+
+ORDERING = ['last_name', 'first_name', 'id']
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create([
+            User(username=f'@user{index}', email=f'user{index}@example.org',
+                 first_name=f'First{index % 3}', last_name=f'Last{index % 4}')
+            for index in range(23)
+        ])
+        cls.expected = list(User.objects.order_by(*ORDERING).values_list('id', flat=True))
+
+    def ids(self, page):
+        return [user.id for user in page]
+
+    def test_forward_pages_cover_every_row_once(self):
+        paginator = KeysetPaginator(User.objects.all(), ORDERING, per_page=5)
+        seen, cursor = [], None
+        while True:
+            page = paginator.get_page(cursor)
+            seen.extend(self.ids(page))
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_cursor_returns_to_earlier_page(self):
+        paginator = KeysetPaginator(User.objects.all(), ORDERING, per_page=5)
+        first = paginator.get_page()
+        second = paginator.get_page(first.next_cursor)
+        third = paginator.get_page(second.next_cursor)
+        back = paginator.get_page(third.previous_cursor)
+        self.assertEqual(self.ids(back), self.ids(second))
+        self.assertTrue(back.has_next() and back.has_previous())
+        start = paginator.get_page(back.previous_cursor)
+        self.assertEqual(self.ids(start), self.ids(first))
+        self.assertFalse(start.has_previous())
+
+    def test_descending_ordering(self):
+        paginator = KeysetPaginator(User.objects.all(), ['-last_name', 'id'], per_page=4)
+        first = paginator.get_page()
+        second = paginator.get_page(first.next_cursor)
+        expected = list(User.objects.order_by('-last_name', 'id').values_list('id', flat=True))
+        self.assertEqual(self.ids(first) + self.ids(second), expected[:8])
+
+    def test_deep_page_is_one_query_without_offset(self):
+        paginator = KeysetPaginator(User.objects.all(), ORDERING, per_page=5)
+        cursor = paginator.get_page(paginator.get_page(paginator.get_page().next_cursor).next_cursor).next_cursor
+        with CaptureQueriesContext(connection) as queries:
+            paginator.get_page(cursor)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('OFFSET', queries[0]['sql'])
+
+    def test_invalid_cursor_gives_first_page(self):
+        paginator = KeysetPaginator(User.objects.all(), ORDERING, per_page=5)
+        for cursor in ['nonsense', 'WyJuZXh0IiwgWzFdXQ==']:
+            self.assertEqual(self.ids(paginator.get_page(cursor)), self.expected[:5])
+
+    def test_count_is_only_run_when_asked(self):
+        paginator = KeysetPaginator(User.objects.all(), ORDERING, per_page=5)
+        with self.assertNumQueries(1):
+            paginator.get_page()
+        self.assertEqual(paginator.count, 23)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_count_is_cached(self):
+        cache.clear()
+        self.assertEqual(KeysetPaginator(User.objects.all(), ORDERING, count_timeout=60).count, 23)
+        with self.assertNumQueries(0):
+            self.assertEqual(KeysetPaginator(User.objects.all(), ORDERING, count_timeout=60).count, 23)
+
+    def test_count_of_empty_filter(self):
+        self.assertEqual(KeysetPaginator(User.objects.filter(id__in=[]), ORDERING, count_timeout=60).count, 0)
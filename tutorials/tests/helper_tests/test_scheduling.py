@@ -0,0 +1,178 @@
+import threading
+from datetime import date, time, timedelta
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from tutorials.models import Meeting, User
+from tutorials.scheduling import (
+    IntervalIndex,
+    MeetingIntervals,
+    book_meetings,
+    check_meeting_conflicts,
+    find_conflicts,
+    save_meeting,
+)
+
+class IntervalIndexTests(TestCase):
+    def setUp(self):
+        self.index = IntervalIndex()
+        self.index.add('a', 10, 20)
+        self.index.add('a', 30, 40)
+
+    def test_overlaps(self):
+        self.assertTrue(self.index.overlaps('a', 15, 16))
+        self.assertTrue(self.index.overlaps('a', 5, 11))
+        self.assertTrue(self.index.overlaps('a', 19, 31))
+        self.assertTrue(self.index.overlaps('a', 0, 50))
+
+    def test_touching_intervals_do_not_overlap(self):
+        self.assertFalse(self.index.overlaps('a', 20, 30))
+        self.assertFalse(self.index.overlaps('a', 0, 10))
+        self.assertFalse(self.index.overlaps('a', 40, 50))
+
+    def test_keys_are_separate(self):
+        self.assertFalse(self.index.overlaps('b', 15, 16))
+
+    def test_overlapping_adds_are_merged(self):
+        self.index.add('a', 15, 35)
+        self.assertEqual(self.index.starts['a'], [10])
+        self.assertEqual(self.index.ends['a'], [40])
+        self.index.add('a', 50, 60)
+        self.index.add('a', 0, 5)
+        self.assertEqual(self.index.starts['a'], [0, 10, 50])
+        self.assertFalse(self.index.overlaps('a', 40, 50))
+
+    def test_meeting_intervals_check_tutor_and_student(self):
+        day = date(2025, 1, 6)
+        slots = MeetingIntervals([(1, 2, day, time(10), time(11))])
+        self.assertIn((1, 3, day, time(10, 30), time(11, 30)), slots)
+        self.assertIn((4, 2, day, time(9, 30), time(10, 30)), slots)
+        self.assertNotIn((1, 2, day, time(11), time(12)), slots)
+        self.assertNotIn((1, 2, date(2025, 1, 7), time(10), time(11)), slots)
+
+class MeetingConflictTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/fixtures/test_meetings.json']
+
+    def setUp(self):
+        self.tutor = User.objects.get(username='@janedoe')
+        self.other_tutor = User.objects.get(username='@leslielowe')
+        self.student = User.objects.get(username='@charlie')
+        self.booked = Meeting.objects.filter(tutor=self.tutor).first()
+
+    def meeting(self, **kwargs):
+        data = {
+            'tutor': self.tutor,
+            'student': self.booked.student,
+            'date': self.booked.date,
+            'day': self.booked.day,
+            'start_time': self.booked.start_time,
+            'end_time': self.booked.end_time,
+            'topic': 'Python',
+        }
+        data.update(kwargs)
+        return Meeting(**data)
+
+    def test_find_conflicts_matches_tutor_or_student(self):
+        booked = self.booked
+        self.assertEqual(list(find_conflicts(self.tutor.id, 0, booked.date, booked.start_time, booked.end_time)), [booked])
+        self.assertEqual(list(find_conflicts(0, booked.student_id, booked.date, booked.start_time, booked.end_time)), [booked])
+        self.assertFalse(find_conflicts(self.other_tutor.id, 0, booked.date, booked.start_time, booked.end_time).exists())
+
+    def test_overlap_is_rejected(self):
+        with self.assertRaises(ValidationError) as error:
+            check_meeting_conflicts(self.meeting(tutor=self.other_tutor))
+        self.assertEqual(error.exception.code, 'overlap')
+
+    def test_back_to_back_meetings_are_allowed(self):
+        check_meeting_conflicts(self.meeting(start_time=self.booked.end_time, end_time=time(23, 0)))
+
+    def test_meeting_does_not_conflict_with_itself(self):
+        self.booked.notes = 'Updated'
+        check_meeting_conflicts(self.booked)
+
+    def test_moving_a_meeting_onto_another_is_rejected(self):
+        other = Meeting.objects.filter(tutor=self.tutor).exclude(pk=self.booked.pk).first()
+        other.date, other.start_time, other.end_time = self.booked.date, self.booked.start_time, self.booked.end_time
+        with self.assertRaises(ValidationError):
+            other.full_clean()
+
+    def test_cancelled_meetings_do_not_conflict(self):
+        self.booked.status = 'cancelled'
+        self.booked.save()
+        check_meeting_conflicts(self.meeting())
+        check_meeting_conflicts(self.meeting(pk=self.booked.pk, status='cancelled'))
+
+    def test_meeting_must_end_after_it_starts(self):
+        with self.assertRaises(ValidationError) as error:
+            check_meeting_conflicts(self.meeting(start_time=time(12), end_time=time(11)))
+        self.assertEqual(error.exception.code, 'invalid_times')
+
+    def test_save_meeting(self):
+        meeting = save_meeting(self.meeting(start_time=time(6), end_time=time(7)))
+        self.assertIsNotNone(meeting.pk)
+        with self.assertRaises(ValidationError):
+            save_meeting(self.meeting(start_time=time(6, 30), end_time=time(7, 30)))
+        self.assertEqual(Meeting.objects.filter(start_time=time(6, 30)).count(), 0)
+
+    def test_book_meetings_inserts_a_free_batch(self):
+        meetings = [self.meeting(date=date(2030, 1, 7 + week * 7), start_time=time(6), end_time=time(7)) for week in range(4)]
+        with CaptureQueriesContext(connection) as queries:
+            book_meetings(meetings)
+        meeting_queries = [query['sql'].split()[0] for query in queries if '"tutorials_meeting"' in query['sql']]
+        # One overlap read and one insert; the weekly counters are updated apart
+        self.assertEqual(meeting_queries[:2], ['SELECT', 'INSERT'])
+        self.assertNotIn('INSERT', meeting_queries[2:])
+        self.assertEqual(Meeting.objects.filter(start_time=time(6)).count(), 4)
+
+    def test_book_meetings_saves_nothing_if_any_overlap(self):
+        meetings = [
+            self.meeting(date=self.booked.date - timedelta(weeks=1)),
+            self.meeting(tutor=self.other_tutor),
+            self.meeting(date=self.booked.date + timedelta(weeks=1)),
+        ]
+        with self.assertRaises(ValidationError) as error:
+            book_meetings(meetings)
+        self.assertEqual(error.exception.code, 'overlap')
+        self.assertIn(str(self.booked.date), error.exception.messages[0])
+        self.assertFalse(Meeting.objects.filter(date=meetings[0].date).exists())
+
+    def test_book_meetings_checks_the_batch_against_itself(self):
+        meetings = [self.meeting(date=date(2030, 1, 7), start_time=time(6), end_time=time(7))] * 2
+        with self.assertRaises(ValidationError):
+            book_meetings(meetings)
+
+class ConcurrentBookingTests(TransactionTestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json']
+
+    def test_parallel_bookings_of_one_slot_save_once(self):
+        tutor = User.objects.get(username='@janedoe')
+        students = list(User.objects.filter(user_type='Student'))
+        barrier = threading.Barrier(8)
+        outcomes = []
+
+        def book(index):
+            try:
+                barrier.wait()
+                save_meeting(Meeting(
+                    tutor=tutor, student=students[index % len(students)], date=date(2025, 1, 6), day='mon',
+                    start_time=time(10, index), end_time=time(11, index), topic='Python'
+                ))
+                outcomes.append('saved')
+            except ValidationError:
+                outcomes.append('overlap')
+            except Exception as error:
+                # Recorded rather than raised, since a thread's exception would not fail the test
+                outcomes.append(repr(error))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book, args=[index]) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(outcomes), ['overlap'] * 7 + ['saved'])
+        self.assertEqual(Meeting.objects.filter(tutor=tutor).count(), 1)
@@ -0,0 +1,60 @@
+from django.test import TestCase
+from tutorials.models import User
+from tutorials.search import rebuild_search_index, search_tokens, search_users
+
+class UserSearchTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json']
+
+    def setUp(self):
+        # Loading fixtures skips the receivers that index users
+        rebuild_search_index()
+
+    def search(self, query, users=None):
+        users = User.objects.all() if users is None else users
+        return sorted(search_users(users, query).values_list('username', flat=True))
+
+    def test_search_tokens(self):
+        self.assertEqual(search_tokens(' Jane  doe@example.org '), ['Jane', 'doe', 'example', 'org'])
+        self.assertEqual(search_tokens('"*()'), [])
+
+    def test_blank_query_returns_all_users(self):
+        self.assertEqual(len(self.search('  ')), 5)
+
+    def test_matches_word_prefixes_across_fields(self):
+        self.assertEqual(self.search('jan'), ['@janedoe'])
+        self.assertEqual(self.search('Lowe'), ['@leslielowe'])
+        self.assertEqual(self.search('charlie@example'), ['@charlie'])
+
+    def test_every_token_must_match(self):
+        self.assertEqual(self.search('jane doe'), ['@janedoe'])
+        self.assertEqual(self.search('jane lowe'), [])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('jane OR "mike" NOT*'), [])
+
+    def test_narrows_given_queryset(self):
+        self.assertEqual(self.search('jane', User.objects.filter(user_type='Student')), [])
+
+    def test_saved_changes_are_indexed(self):
+        user = User.objects.get(username='@charlie')
+        user.first_name = 'Carlos'
+        user.save()
+        self.assertEqual(self.search('carlos'), ['@charlie'])
+        self.assertEqual(self.search('charlie'), ['@charlie'])
+
+    def test_created_and_deleted_users_are_indexed(self):
+        user = User.objects.create(username='@newbie', email='newbie@example.org', first_name='New', last_name='Bie')
+        self.assertEqual(self.search('newbie'), ['@newbie'])
+        user.delete()
+        self.assertEqual(self.search('newbie'), [])
+
+    def test_login_save_skips_index(self):
+        user = User.objects.get(username='@charlie')
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+
+    def test_rebuild_indexes_bulk_created_users(self):
+        User.objects.bulk_create([User(username='@bulky', email='bulky@example.org', first_name='Bulk', last_name='Y')])
+        self.assertEqual(self.search('bulky'), [])
+        rebuild_search_index()
+        self.assertEqual(self.search('bulky'), ['@bulky'])
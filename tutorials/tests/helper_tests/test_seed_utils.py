@@ -0,0 +1,176 @@
+import tempfile
+from unittest import mock
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from tutorials.models import DashboardStat, User, Lesson, Meeting, Review, TutorProfile, TutorAvailability
+from tutorials.seed_utils import (
+    BulkSeeder,
+    chunked,
+    purge_queryset,
+    restore_snapshot,
+    save_snapshot,
+    snapshot_path,
+)
+from tutorials.stats import count_stat, rebuild_stats
+
+class ChunkedTests(TestCase):
+    def test_chunked_splits_into_batches(self):
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+    def test_chunked_empty(self):
+        self.assertEqual(list(chunked([], 2)), [])
+
+class BulkSeederTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json']
+
+    def setUp(self):
+        self.seeder = BulkSeeder('Password123', batch_size=7, shard_size=5, log=lambda message: None)
+
+    def test_seed_users_tops_up_to_total(self):
+        self.seeder.seed_users([], 40)
+        self.assertEqual(User.objects.count(), 40)
+
+    def test_seed_users_hashes_password_once(self):
+        self.seeder.seed_users([], 10)
+        users = User.objects.filter(id__gt=6)
+        self.assertEqual(len({user.password for user in users}), 1)
+        self.assertTrue(users[0].check_password('Password123'))
+
+    def test_seed_users_skips_existing_fixtures(self):
+        fixture = {'username': '@janedoe', 'email': 'janedoe@example.org',
+                   'first_name': 'Jane', 'last_name': 'Doe', 'group': 'Tutor'}
+        self.seeder.seed_users([fixture], 5)
+        self.assertEqual(User.objects.filter(username='@janedoe').count(), 1)
+
+    def test_build_user_suffixes_duplicates(self):
+        data = {'username': '@janedoe', 'email': 'janedoe@example.org',
+                'first_name': 'Jane', 'last_name': 'Doe'}
+        user = self.seeder.build_user(data, {'@janedoe'}, {'janedoe@example.org'})
+        self.assertEqual(user.username, '@janedoe2')
+        self.assertEqual(user.email, 'janedoe2@example.org')
+
+    def test_seed_users_adds_groups(self):
+        self.seeder.seed_users([], 12)
+        for user in User.objects.filter(id__gt=6):
+            self.assertTrue(user.groups.filter(name=user.user_type).exists())
+        self.assertEqual(Group.objects.count(), 3)
+
+    def test_seed_lessons_sets_derived_fields(self):
+        self.seeder.seed_lessons(9)
+        self.assertEqual(Lesson.objects.count(), 9)
+        lesson = Lesson.objects.first()
+        self.assertEqual(lesson.time_of_day, lesson.get_time_of_day())
+        self.assertIsNotNone(lesson.end_time)
+
+    def test_seed_meetings_are_unique_per_tutor_slot(self):
+        self.seeder.seed_meetings(20)
+        keys = list(Meeting.objects.values_list('tutor_id', 'date', 'start_time', 'end_time'))
+        self.assertEqual(len(keys), 20)
+        self.assertEqual(len(set(keys)), 20)
+
+    def test_seed_tutor_profiles_one_per_tutor(self):
+        self.seeder.seed_tutor_profiles(10)
+        self.assertEqual(TutorProfile.objects.count(), User.objects.filter(user_type='Tutor').count())
+
+    def test_seed_tutor_availabilities(self):
+        self.seeder.seed_tutor_availabilities(6)
+        self.assertEqual(TutorAvailability.objects.count(), 6)
+
+    def test_seed_users_uses_consecutive_primary_keys(self):
+        self.seeder.seed_users([], 20)
+        self.assertEqual(list(User.objects.order_by('id').values_list('id', flat=True)), list(range(2, 22)))
+
+    def test_same_seed_generates_same_rows_in_any_worker_count(self):
+        rows = []
+        for workers in [1, 2]:
+            seeder = BulkSeeder('Password123', seed=3, workers=workers, shard_size=4, log=lambda message: None)
+            seeder.seed_users([], 20)
+            seeder.seed_meetings(15)
+            rows.append((
+                list(User.objects.order_by('id').values_list('id', 'username', 'user_type')),
+                list(Meeting.objects.order_by('id').values_list('tutor_id', 'student_id', 'date', 'start_time')),
+            ))
+            User.objects.filter(id__gt=6).delete()
+            Meeting.objects.all().delete()
+        self.assertEqual(rows[0], rows[1])
+
+    def test_tutor_ratio_controls_user_types(self):
+        seeder = BulkSeeder('Password123', seed=1, tutor_ratio=0, log=lambda message: None)
+        seeder.seed_users([], 30)
+        self.assertFalse(User.objects.filter(id__gt=6, user_type='Tutor').exists())
+
+class PurgeQuerysetTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/fixtures/test_meetings.json',
+                'tutorials/tests/fixtures/lessons.json',
+                'tutorials/tests/fixtures/tutor_profile.json']
+
+    def setUp(self):
+        self.student = User.objects.get(username='@charlie')
+        Review.objects.create(student=self.student, content='Great', review_text='Great tutor', rating=5)
+
+    def test_purge_deletes_rows_in_batches(self):
+        messages = []
+        purged = purge_queryset(Meeting.objects.all(), batch_size=2, log=messages.append)
+        self.assertEqual(purged, 5)
+        self.assertEqual(len(messages), 3)
+        self.assertFalse(Meeting.objects.exists())
+
+    def test_purge_cascades_to_dependents(self):
+        purge_queryset(User.objects.filter(user_type='Student'), batch_size=1, log=lambda message: None)
+        self.assertFalse(User.objects.filter(user_type='Student').exists())
+        self.assertFalse(Meeting.objects.exists())
+        self.assertFalse(Lesson.objects.exists())
+        self.assertFalse(Review.objects.exists())
+        self.assertEqual(TutorProfile.objects.count(), 2)
+
+    def test_purge_leaves_other_rows(self):
+        purge_queryset(User.objects.filter(username='@charlie'), log=lambda message: None)
+        self.assertTrue(User.objects.filter(username='@mikemiles').exists())
+        self.assertEqual(Meeting.objects.exclude(student__username='@mikemiles').count(), 0)
+        self.assertTrue(Meeting.objects.filter(student__username='@mikemiles').exists())
+
+class SnapshotTests(TransactionTestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/fixtures/test_meetings.json',
+                'tutorials/tests/fixtures/tutor_profile.json']
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_snapshot_path_rejects_unsafe_names(self):
+        with self.assertRaises(ValueError):
+            snapshot_path('../db', self.directory.name)
+
+    def test_save_and_restore_snapshot(self):
+        path = save_snapshot('base', self.directory.name)
+        self.assertTrue(path.exists())
+
+        User.objects.filter(username='@charlie').delete()
+        restore_snapshot('base', self.directory.name)
+        self.assertTrue(User.objects.filter(username='@charlie').exists())
+        self.assertEqual(User.objects.count(), 5)
+
+    def test_save_and_restore_fixture_snapshot(self):
+        rebuild_stats()
+        # Other backends dump and load a fixture rather than copying the database
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            path = save_snapshot('base', self.directory.name)
+            User.objects.filter(username='@charlie').delete()
+            restore_snapshot('base', self.directory.name)
+        self.assertEqual(path.suffix, '.xz')
+        self.assertTrue(User.objects.filter(username='@charlie').exists())
+        self.assertEqual(TutorProfile.objects.get(tutor__username='@janedoe').subject_index.count(), 3)
+        self.assertFalse(DashboardStat.objects.exists())
+
+        rebuild_stats()
+        for stat in DashboardStat.objects.all():
+            self.assertEqual(stat.value, count_stat(stat.name))
+
+    def test_restore_missing_snapshot(self):
+        with self.assertRaises(FileNotFoundError):
+            restore_snapshot('missing', self.directory.name)
@@ -57,6 +57,17 @@ class AnnotateStudentsWithTutorsTests(TestCase):
         self.assertTrue(hasattr(self.student2, 'current_tutors'))
         self.assertEqual(self.student2.current_tutors, [self.tutor.username])
 
+    def test_annotate_students_with_tutors_runs_one_query(self):
+        users = [self.student1, self.student2, User.objects.get(username="@petrapickles")]
+        with self.assertNumQueries(1):
+            annotate_students_with_tutors(users)
+        self.assertEqual(users[2].current_tutors, [])
+
+    def test_annotate_students_with_tutors_skips_unscheduled_meetings(self):
+        Meeting.objects.filter(student=self.student1).update(status='cancelled')
+        annotate_students_with_tutors([self.student1])
+        self.assertEqual(self.student1.current_tutors, [])
+
 class GetAllTutorsTests(TestCase):
     fixtures = ['tutorials/tests/fixtures/other_users.json']
 
@@ -0,0 +1,165 @@
+from datetime import date, time
+from io import StringIO
+from contextlib import redirect_stdout
+from django.core.management import call_command
+from django.test import TestCase
+from tutorials.assignment import assign_outstanding_lessons
+from tutorials.availability import save_weekly_availability
+from tutorials.models import DashboardStat, Lesson, Meeting, User
+from tutorials.scheduling import book_meetings
+from tutorials.seed_utils import purge_queryset
+from tutorials.stats import (
+    OUTSTANDING_REQUESTS,
+    STUDENTS,
+    TUTORS,
+    count_rows,
+    count_stat,
+    get_stats,
+    rebuild_stats,
+    scheduled_meetings_stat,
+)
+
+class DashboardStatsTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/fixtures/test_meetings.json',
+                'tutorials/tests/fixtures/lessons.json']
+
+    def setUp(self):
+        rebuild_stats()
+        self.tutor = User.objects.get(username='@janedoe')
+        self.student = User.objects.get(username='@charlie')
+        self.week = scheduled_meetings_stat(date(2024, 12, 9))
+
+    def stat(self, name):
+        return DashboardStat.objects.get(name=name).value
+
+    def assertStatsMatchCounts(self):
+        for stat in DashboardStat.objects.all():
+            self.assertEqual(stat.value, count_stat(stat.name), stat.name)
+
+    def test_rebuild_counts_everything(self):
+        self.assertEqual(self.stat(STUDENTS), 2)
+        self.assertEqual(self.stat(TUTORS), 2)
+        self.assertEqual(self.stat(OUTSTANDING_REQUESTS), 2)
+        self.assertEqual(self.stat(self.week), 2)
+        self.assertTrue(DashboardStat.objects.filter(name=scheduled_meetings_stat(date.today())).exists())
+
+    def test_user_create_change_and_delete(self):
+        user = User.objects.create_user('@newbie', email='newbie@example.org', password='Password123')
+        self.assertEqual(self.stat(STUDENTS), 3)
+
+        user.user_type = 'Tutor'
+        user.save()
+        self.assertEqual((self.stat(STUDENTS), self.stat(TUTORS)), (2, 3))
+
+        user.first_name = 'New'
+        user.save()
+        self.assertEqual(self.stat(TUTORS), 3)
+
+        user.delete()
+        self.assertEqual(self.stat(TUTORS), 2)
+
+    def test_reloaded_user_change(self):
+        user = User.objects.get(username='@charlie')
+        user.user_type = 'Admin'
+        user.save()
+        self.assertEqual(self.stat(STUDENTS), 1)
+
+    def test_deferred_user_change(self):
+        user = User.objects.only('id').get(username='@charlie')
+        user.user_type = 'Admin'
+        user.save()
+        self.assertEqual(self.stat(STUDENTS), 1)
+
+    def test_meeting_status_and_week_changes(self):
+        meeting = Meeting.objects.get(pk=1)
+        meeting.date = date(2024, 12, 16)
+        meeting.save()
+        self.assertEqual(self.stat(self.week), 1)
+
+        meeting.status = 'cancelled'
+        meeting.save()
+        self.assertStatsMatchCounts()
+
+    def test_meeting_with_string_date(self):
+        Meeting.objects.create(tutor=self.tutor, student=self.student, date='2024-12-10',
+                               start_time=time(9, 0), end_time=time(10, 0))
+        self.assertEqual(self.stat(self.week), 3)
+
+    def test_lesson_create_and_delete(self):
+        lesson = Lesson.objects.create(student=self.student, knowledge_area='java', term='may-july',
+                                       duration=60, days=['mon'], venue_preference='online')
+        self.assertEqual(self.stat(OUTSTANDING_REQUESTS), 3)
+        lesson.delete()
+        self.assertEqual(self.stat(OUTSTANDING_REQUESTS), 2)
+
+    def test_cascading_delete_updates_every_counter(self):
+        self.student.delete()
+        self.assertStatsMatchCounts()
+
+    def test_missing_counter_is_counted(self):
+        DashboardStat.objects.all().delete()
+        Meeting.objects.filter(pk=1).delete()
+        self.assertEqual(self.stat(self.week), 1)
+        self.assertEqual(get_stats(STUDENTS, TUTORS), {STUDENTS: 2, TUTORS: 2})
+        self.assertEqual(self.stat(STUDENTS), 2)
+
+    def test_reconcile_command_repairs_counters(self):
+        DashboardStat.objects.filter(name=STUDENTS).update(value=99)
+        with redirect_stdout(StringIO()) as output:
+            call_command('reconcile_stats')
+        self.assertEqual(self.stat(STUDENTS), 2)
+        self.assertIn('students: 2', output.getvalue())
+
+class BulkWriteStatsTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/fixtures/test_meetings.json',
+                'tutorials/tests/fixtures/lessons.json',
+                'tutorials/tests/fixtures/tutor_profile.json',
+                'tutorials/tests/fixtures/tutor_availability.json']
+
+    def setUp(self):
+        rebuild_stats()
+        self.tutor = User.objects.get(username='@janedoe')
+        self.student = User.objects.get(username='@charlie')
+
+    def assertReconcileFindsNoDrift(self):
+        stored = dict(DashboardStat.objects.values_list('name', 'value'))
+        with redirect_stdout(StringIO()):
+            call_command('reconcile_stats')
+        recounted = dict(DashboardStat.objects.values_list('name', 'value'))
+        for name in stored.keys() | recounted.keys():
+            self.assertEqual(stored.get(name, 0), recounted.get(name, 0), name)
+
+    def test_count_rows_writes_a_batch_at_once(self):
+        meetings = Meeting.objects.bulk_create([
+            Meeting(tutor=self.tutor, student=self.student, date=day, start_time=time(9), end_time=time(10))
+            for day in (date(2024, 12, 9), date(2024, 12, 10), date(2030, 1, 7), date(2030, 1, 14))
+        ])
+        # Reads which counters exist, updates those, then counts and inserts the missing weeks
+        with self.assertNumQueries(4):
+            count_rows(Meeting, meetings)
+        self.assertEqual(DashboardStat.objects.get(name=scheduled_meetings_stat(date(2024, 12, 9))).value, 4)
+        self.assertReconcileFindsNoDrift()
+
+        purge_queryset(Meeting.objects.filter(pk__in=[meeting.pk for meeting in meetings]), log=lambda message: None)
+        with self.assertNumQueries(2):
+            count_rows(Meeting, meetings, -1)
+        self.assertReconcileFindsNoDrift()
+
+    def test_book_meetings(self):
+        book_meetings([
+            Meeting(tutor=self.tutor, student=self.student, date=date(2030, 1, day), start_time=time(9), end_time=time(10))
+            for day in (7, 8, 14)
+        ] + [Meeting(tutor=self.tutor, student=self.student, date=date(2030, 1, 9), start_time=time(9),
+                     end_time=time(10), status='cancelled')])
+        self.assertReconcileFindsNoDrift()
+
+    def test_assign_outstanding_lessons(self):
+        meetings, unassigned = assign_outstanding_lessons(date(2030, 1, 7))
+        self.assertTrue(meetings)
+        self.assertReconcileFindsNoDrift()
+
+    def test_save_weekly_availability(self):
+        save_weekly_availability(self.tutor, {('Tuesday', time(9), time(12))})
+        self.assertReconcileFindsNoDrift()
@@ -0,0 +1,91 @@
+from django.db.models import QuerySet
+from django.test import TestCase
+from tutorials.forms import TutorSubjectsForm
+from tutorials.helpers import get_all_tutors
+from tutorials.models import Lesson, Subject, TutorProfile, User
+from tutorials.subjects import (
+    filter_by_subjects,
+    normalise_subject,
+    normalise_subjects,
+    rebuild_subject_index,
+    taught_subjects,
+)
+
+class SubjectIndexTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/tests/fixtures/tutor_profile.json']
+
+    def setUp(self):
+        self.tutor1 = User.objects.get(username='@janedoe')
+        self.tutor2 = User.objects.get(username='@leslielowe')
+
+    def indexed(self, tutor):
+        return list(TutorProfile.objects.get(tutor=tutor).subject_index.values_list('name', flat=True))
+
+    def test_normalise_subject(self):
+        self.assertEqual(normalise_subject('  Python/ Tensorflow '), 'python/ tensorflow')
+        self.assertEqual(normalise_subject('RUBY'), 'ruby')
+        self.assertEqual(normalise_subjects(['Java', 'java ', '']), ['java'])
+
+    def test_form_subjects_cover_their_knowledge_areas(self):
+        areas = {area for area, _ in Lesson.KNOWLEDGE_AREAS}
+        for subject, _ in TutorSubjectsForm.SUBJECT_CHOICES:
+            name = normalise_subject(subject)
+            # A subject such as 'Python/Tensorflow' must be matched to the 'python' lessons
+            area = name.split('/')[0]
+            if area in areas:
+                self.assertIn(area, taught_subjects(name), subject)
+        self.assertEqual(taught_subjects('ruby'), ['ruby'])
+
+    def test_fixture_profiles_are_indexed(self):
+        self.assertEqual(self.indexed(self.tutor1), ['c++', 'java', 'python'])
+
+    def test_saving_subjects_updates_index(self):
+        profile = TutorProfile.objects.get(tutor=self.tutor1)
+        profile.subjects = ['Swift', 'Java']
+        profile.save()
+        self.assertEqual(self.indexed(self.tutor1), ['java', 'swift'])
+
+    def test_subjects_changed_in_place_update_index(self):
+        profile = TutorProfile.objects.get(tutor=self.tutor1)
+        profile.subjects.append('Swift')
+        profile.save()
+        self.assertEqual(self.indexed(self.tutor1), ['c++', 'java', 'python', 'swift'])
+
+        profile.subjects.remove('Swift')
+        profile.save()
+        self.assertEqual(self.indexed(self.tutor1), ['c++', 'java', 'python'])
+
+    def test_saving_unchanged_subjects_skips_index(self):
+        profile = TutorProfile.objects.get(tutor=self.tutor1)
+        profile.hourly_rate = 40
+        with self.assertNumQueries(1):
+            profile.save()
+
+    def test_rebuild_subject_index(self):
+        TutorProfile.objects.filter(tutor=self.tutor1).update(subjects=['Scala'])
+        rebuild_subject_index()
+        self.assertEqual(self.indexed(self.tutor1), ['scala'])
+        self.assertEqual(self.indexed(self.tutor2), ['java', 'python', 'ruby'])
+
+    def test_filter_any_subject(self):
+        tutors = filter_by_subjects(get_all_tutors(), ['Ruby', 'C++'])
+        self.assertIsInstance(tutors, QuerySet)
+        self.assertEqual(list(tutors), [self.tutor1, self.tutor2])
+
+    def test_filter_all_subjects(self):
+        tutors = filter_by_subjects(get_all_tutors(), ['Python', 'Ruby'], match_all=True)
+        self.assertEqual(list(tutors), [self.tutor2])
+        tutors = filter_by_subjects(get_all_tutors(), ['Ruby', 'C++'], match_all=True)
+        self.assertEqual(list(tutors), [])
+
+    def test_filter_without_subjects_returns_all(self):
+        self.assertEqual(filter_by_subjects(get_all_tutors(), []).count(), 2)
+
+    def test_filter_is_one_query(self):
+        with self.assertNumQueries(1):
+            list(filter_by_subjects(get_all_tutors(), ['Java', 'Python'], match_all=True))
+
+    def test_subjects_are_shared(self):
+        self.assertEqual(Subject.objects.filter(name='java').count(), 1)
+        self.assertEqual(Subject.objects.get(name='java').tutor_profiles.count(), 2)
@@ -0,0 +1,43 @@
+from datetime import date, time
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from tutorials.models import Meeting
+from tutorials.terms import next_occurrence, term_dates, term_meetings, weekly_dates
+
+class TermCalendarTests(TestCase):
+    def test_term_dates(self):
+        self.assertEqual(term_dates('sept-dec', date(2030, 1, 7)), (date(2030, 9, 1), date(2030, 12, 31)))
+        self.assertEqual(term_dates('jan-april', date(2030, 4, 30)), (date(2030, 1, 1), date(2030, 4, 30)))
+        self.assertEqual(term_dates('may-july', date(2030, 8, 1)), (date(2031, 5, 1), date(2031, 7, 31)))
+
+    def test_next_occurrence(self):
+        monday = date(2025, 1, 6)
+        self.assertEqual(next_occurrence(monday, 'mon'), monday)
+        self.assertEqual(next_occurrence(date(2025, 1, 9), 'mon'), date(2025, 1, 13))
+
+    def test_weekly_dates(self):
+        dates = weekly_dates(['wed', 'mon', 'mon', 'noday'], date(2025, 1, 7), date(2025, 1, 20))
+        self.assertEqual(dates, [date(2025, 1, 8), date(2025, 1, 13), date(2025, 1, 15), date(2025, 1, 20)])
+
+class TermMeetingsTests(TestCase):
+    def meeting(self, meeting_date):
+        return Meeting(tutor_id=1, student_id=2, date=meeting_date, day='fri',
+                       start_time=time(10), end_time=time(11), topic='Python')
+
+    def test_meeting_repeats_to_the_end_of_the_term(self):
+        meetings = term_meetings(self.meeting(date(2030, 11, 20)), 'sept-dec', ['mon', 'wed'])
+        self.assertEqual(len(meetings), 12)
+        self.assertEqual((meetings[0].date, meetings[0].day), (date(2030, 11, 20), 'wed'))
+        self.assertEqual((meetings[-1].date, meetings[-1].day), (date(2030, 12, 30), 'mon'))
+        self.assertTrue(all(meeting.pk is None and meeting.start_time == time(10) for meeting in meetings))
+
+    def test_meeting_before_the_term_starts_with_the_term(self):
+        meetings = term_meetings(self.meeting(date(2030, 8, 1)), 'sept-dec', ['mon'])
+        self.assertEqual(meetings[0].date, date(2030, 9, 2))
+        self.assertEqual(len(meetings), 18)
+
+    def test_no_requested_day_left_in_the_term(self):
+        # 29 December 2026 is a Tuesday, and the term ends before the next Monday
+        with self.assertRaises(ValidationError) as raised:
+            term_meetings(self.meeting(date(2026, 12, 29)), 'sept-dec', ['mon'])
+        self.assertEqual(raised.exception.code, 'no_occurrences')
@@ -1,3 +1,6 @@
+import time
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from with_asserts.mixin import AssertHTMLMixin
 
@@ -34,4 +37,22 @@ class MenuTesterMixin(AssertHTMLMixin):
         """Check that no menu is present."""
         
         for url in self.menu_urls:
-            self.assertNotHTML(response, f'a[href="{url}"]')
\ No newline at end of file
+            self.assertNotHTML(response, f'a[href="{url}"]')
+
+class QueryBudgetTester:
+    """Class to extend tests with query-count and wall-clock budgets for requests."""
+
+    def assert_within_budget(self, max_queries, max_seconds, make_request):
+        """Run `make_request`, failing with the executed SQL if it exceeds either budget."""
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = make_request()
+            elapsed = time.perf_counter() - start
+
+        executed = '\n'.join(f"{index}. {query['sql']}" for index, query in enumerate(queries.captured_queries, 1))
+        if len(queries) > max_queries:
+            self.fail(f"{len(queries)} queries executed, budget is {max_queries}:\n{executed}")
+        if elapsed > max_seconds:
+            self.fail(f"Request took {elapsed:.3f}s, budget is {max_seconds}s:\n{executed}")
+        return response
@@ -60,3 +60,16 @@ class MeetingModelTestCase(TestCase):
             topic='Java'
         )
         self.assertEqual(meeting_evening.time_of_day, 'evening')
+
+
+    def test_saved_state_tracks_the_stored_row(self):
+        meeting = Meeting(tutor=self.tutor, student=self.student, date='2024-12-15',
+                          start_time=time(9, 0), end_time=time(10, 0), topic='Java')
+        self.assertIsNone(meeting.saved_state())
+        meeting.save()
+
+        meeting = Meeting.objects.get(pk=meeting.pk)
+        meeting.status = 'cancelled'
+        self.assertEqual(meeting.saved_state().status, 'scheduled')
+        meeting.save()
+        self.assertEqual(meeting.saved_state().status, 'cancelled')
@@ -0,0 +1,31 @@
+import random
+from datetime import date, time, timedelta
+from decimal import Decimal
+from django.test import SimpleTestCase
+from tutorials.availability import AvailabilityMatrix
+
+SUBJECTS = ['c++', 'scala', 'java', 'python', 'ruby']
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+class LargeMatrixTestCase(SimpleTestCase):
+    """Class to build one availability matrix of 10,000 generated tutors for the speed tests."""
+
+    tutor_count = 10000
+    meeting_count = 30000
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        generator = random.Random(2024)
+        count = cls.tutor_count
+        cls.today = date.today()
+        cls.matrix = AvailabilityMatrix(
+            [(pk, f'@tutor{pk}', 'Tutor', str(pk), Decimal(generator.randint(10, 60))) for pk in range(count)],
+            [(pk, subject) for pk in range(count) for subject in generator.sample(SUBJECTS, 3)],
+            [(pk, day, time(generator.randint(8, 12)), time(generator.randint(13, 20)))
+             for pk in range(count) for day in generator.sample(DAYS, 3)],
+            [(generator.randrange(count), cls.today + timedelta(days=generator.randrange(60)), time(hour), time(hour + 1))
+             for hour in [generator.randint(8, 19) for _ in range(cls.meeting_count)]],
+            cls.today,
+        )
@@ -0,0 +1,20 @@
+import time as clock
+from datetime import time
+from tutorials.tests.performance.helpers import LargeMatrixTestCase
+
+class AvailabilityMatrixSpeedTests(LargeMatrixTestCase):
+    """Free-slot lookups must stay interactive over a large tutor base."""
+
+    def test_free_tutors_within_25ms(self):
+        started = clock.perf_counter()
+        tutors = self.matrix.free_tutors('tue', time(14), time(15, 30), 'java')
+        elapsed = clock.perf_counter() - started
+        self.assertTrue(tutors)
+        self.assertLess(elapsed, 0.025)
+
+    def test_free_tutors_of_any_subject_within_25ms(self):
+        started = clock.perf_counter()
+        tutors = self.matrix.free_tutors('tue', time(14), time(15, 30))
+        elapsed = clock.perf_counter() - started
+        self.assertTrue(tutors)
+        self.assertLess(elapsed, 0.025)
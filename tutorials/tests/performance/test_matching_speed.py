@@ -0,0 +1,44 @@
+import random
+import time as clock
+from datetime import time, timedelta
+from tutorials.assignment import AssignmentPlanner
+from tutorials.matching import match
+from tutorials.models import Lesson
+from tutorials.tests.performance.helpers import SUBJECTS, LargeMatrixTestCase
+
+class TutorMatchingSpeedTests(LargeMatrixTestCase):
+    """Matching must stay interactive over a large tutor base, and batch assignment quick at term start."""
+
+    def test_top_matches_within_50ms(self):
+        started = clock.perf_counter()
+        matches = match(self.matrix, 'python', ['mon', 'wed', 'fri'], time(10), 60, limit=10)
+        elapsed = clock.perf_counter() - started
+        self.assertEqual(len(matches), 10)
+        self.assertLess(elapsed, 0.05)
+
+    def test_booking_then_matching_within_50ms(self):
+        # A booking is applied to the shared matrix in place, so the next
+        # match pays for that update and not for a rebuild
+        meeting = (1, self.today + timedelta(days=7 - self.today.weekday()), time(10), time(11))
+        started = clock.perf_counter()
+        self.matrix.add_meeting(*meeting)
+        matches = match(self.matrix, 'python', ['mon', 'wed', 'fri'], time(10), 60, limit=10)
+        elapsed = clock.perf_counter() - started
+        self.matrix.add_meeting(*meeting, delta=-1)
+        self.assertEqual(len(matches), 10)
+        self.assertLess(elapsed, 0.05)
+
+    def test_term_start_queue_assigned_within_budget(self):
+        generator = random.Random(7)
+        lessons = [
+            Lesson(pk=pk, student_id=100000 + pk // 2, knowledge_area=generator.choice(SUBJECTS),
+                   days=generator.sample(['mon', 'tue', 'wed', 'thu', 'fri'], 2),
+                   start_time=time(generator.randint(8, 18), generator.choice([0, 10, 20, 30])),
+                   duration=generator.choice([30, 60, 90, 120]))
+            for pk in range(2000)
+        ]
+        started = clock.perf_counter()
+        plan = AssignmentPlanner(self.matrix).plan(lessons)
+        elapsed = clock.perf_counter() - started
+        self.assertGreater(len(plan), 1900)
+        self.assertLess(elapsed, 5)
@@ -0,0 +1,204 @@
+from datetime import date, time
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from tutorials.ics import feed_token
+from tutorials.management.commands.seed import user_fixtures
+from tutorials.models import User, Meeting
+from tutorials.search import rebuild_search_index
+from tutorials.seed_utils import BulkSeeder
+from tutorials.stats import rebuild_stats
+from tutorials.tests.helpers import QueryBudgetTester
+
+# Wall-clock budget for every request, generous enough for slow CI machines
+# but far below what an N+1 over the seeded dataset costs.
+MAX_SECONDS = 0.5
+
+
+class QueryBudgetTests(QueryBudgetTester, TestCase):
+    """Query-count and latency budgets for every named route, over a seeded dataset."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seeder = BulkSeeder('Password123', seed=2024, shard_size=500, log=lambda message: None)
+        seeder.seed_users(user_fixtures, 400)
+        cls.admin = User.objects.get(username='@johndoe')
+        cls.tutor = User.objects.get(username='@janedoe')
+        cls.student = User.objects.get(username='@charlie')
+
+        today = date.today()
+        seeder.seed_lessons(120, fixtures=[{
+            'student_id': cls.student.id,
+            'knowledge_area': 'python',
+            'term': 'sept-dec',
+            'start_time': time(10, 0),
+            'duration': 60,
+            'end_time': time(11, 0),
+            'days': ['mon', 'wed'],
+            'time_of_day': 'morning',
+            'venue_preference': 'online',
+        }])
+        seeder.seed_meetings(600, fixtures=[{
+            'tutor_id': cls.tutor.id,
+            'student_id': cls.student.id,
+            'date': today.replace(day=day),
+            'day': today.replace(day=day).strftime('%a').lower(),
+            'start_time': time(10, 0),
+            'end_time': time(11, 0),
+            'time_of_day': 'morning',
+            'topic': 'Python',
+        } for day in range(1, 21)])
+        seeder.seed_tutor_profiles(400)
+        seeder.seed_tutor_availabilities(300)
+        # As the seed command does, since bulk inserts skip the signals that maintain these
+        rebuild_stats()
+        rebuild_search_index()
+        cls.meeting = Meeting.objects.filter(tutor=cls.tutor).first()
+
+    def get(self, user, url_name, max_queries, *args, data=None):
+        if user is not None:
+            self.client.force_login(user)
+        url = reverse(url_name, args=args)
+        response = self.assert_within_budget(max_queries, MAX_SECONDS, lambda: self.client.get(url, data))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def post(self, user, url_name, max_queries, data):
+        self.client.force_login(user)
+        url = reverse(url_name)
+        response = self.assert_within_budget(max_queries, MAX_SECONDS, lambda: self.client.post(url, data))
+        self.assertEqual(response.status_code, 302)
+        return response
+
+    """ Public and account pages """
+
+    def test_home(self):
+        self.get(None, 'home', 0)
+
+    def test_log_in(self):
+        self.get(None, 'log_in', 0)
+
+    def test_sign_up(self):
+        self.get(None, 'sign_up', 0)
+
+    def test_log_out(self):
+        self.client.force_login(self.student)
+        # Logging out reads the session and user, then deletes the session
+        response = self.assert_within_budget(4, MAX_SECONDS, lambda: self.client.get(reverse('log_out')))
+        self.assertRedirects(response, reverse('home'))
+
+    def test_profile(self):
+        self.get(self.student, 'profile', 2)
+
+    def test_password(self):
+        self.get(self.student, 'password', 2)
+
+    def test_submit_review(self):
+        self.get(self.student, 'submit_review', 2)
+
+    """ Dashboards """
+
+    def test_tutor_dashboard(self):
+        self.get(self.tutor, 'dashboard', 5)
+
+    def test_student_dashboard(self):
+        self.get(self.student, 'dashboard', 3)
+
+    def test_admin_dashboard(self):
+        self.get(self.admin, 'dashboard', 4)
+
+    """ User lists """
+
+    def test_student_list_as_admin(self):
+        self.get(self.admin, 'user_list', 5, 'students')
+
+    def test_student_list_deep_page(self):
+        self.client.force_login(self.admin)
+        cursor = self.client.get(reverse('user_list', args=['students'])).context['users'].next_cursor
+        for _ in range(5):
+            cursor = self.client.get(reverse('user_list', args=['students']), {'cursor': cursor}).context['users'].next_cursor
+        self.get(self.admin, 'user_list', 5, 'students', data={'cursor': cursor})
+
+    def test_student_list_as_tutor(self):
+        self.get(self.tutor, 'user_list', 5, 'students')
+
+    def test_tutor_list(self):
+        self.get(self.admin, 'user_list', 5, 'tutors')
+
+    def test_tutor_list_filtered_by_subjects(self):
+        self.get(self.admin, 'user_list', 5, 'tutors', data={'subjects': ['Java', 'Ruby'], 'match': 'all'})
+
+    def test_student_list_searched(self):
+        self.get(self.admin, 'user_list', 5, 'students', data={'q': 'a'})
+
+    def test_student_list_export(self):
+        self.client.force_login(self.admin)
+        url = reverse('user_list', args=['students'])
+        self.assert_within_budget(4, MAX_SECONDS, lambda: b''.join(self.client.get(url, {'format': 'csv'}).streaming_content))
+
+    def test_tutor_list_export(self):
+        self.client.force_login(self.admin)
+        url = reverse('user_list', args=['tutors'])
+        self.assert_within_budget(4, MAX_SECONDS, lambda: b''.join(self.client.get(url, {'format': 'ndjson'}).streaming_content))
+
+    """ Lesson requests and scheduling """
+
+    def test_lesson_request_form(self):
+        self.get(self.student, 'lesson_request', 2)
+
+    def test_view_lesson_request(self):
+        self.get(self.student, 'view_lesson_request', 5)
+
+    def test_schedule_session(self):
+        # The first visit builds the availability matrix that matching reads in four queries
+        self.get(self.admin, 'schedule_session', 10, self.student.id)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_schedule_session_with_availability_matrix_built(self):
+        self.get(self.admin, 'schedule_session', 10, self.student.id)
+        self.get(self.admin, 'schedule_session', 6, self.student.id)
+
+    def test_free_tutors(self):
+        # The lookup reads the availability matrix, built here in four queries
+        self.get(self.admin, 'free_tutors', 6, data={'day': 'mon', 'start_time': '10:00', 'end_time': '11:00'})
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_free_tutors_with_availability_matrix_built(self):
+        data = {'day': 'mon', 'start_time': '10:00', 'end_time': '11:00', 'subject': 'Python'}
+        self.get(self.admin, 'free_tutors', 6, data=data)
+        self.get(self.admin, 'free_tutors', 2, data=data)
+
+    def test_schedule_all_sessions(self):
+        # Four queries build the availability matrix and one reads the students' meetings; the term's
+        # meetings go in a few batched inserts, and the counters and placed requests are each written once
+        self.post(self.admin, 'schedule_all_sessions', 25, {})
+
+    def test_tutor_calendar_json(self):
+        today = date.today()
+        self.get(self.tutor, 'tutor_calendar_json', 4, today.year, today.month)
+
+    def test_meeting_feed(self):
+        url = reverse('meeting_feed', args=[feed_token(self.tutor)])
+        # Consume the stream inside the budget, since its queries run while it is read
+        self.assert_within_budget(3, MAX_SECONDS, lambda: b''.join(self.client.get(url).streaming_content))
+
+    """ Tutor save endpoints """
+
+    def test_save_availability(self):
+        data = {}
+        for day in ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']:
+            data.update({f'{day}_enabled': 'on', f'{day}_start_time': '09:00', f'{day}_end_time': '17:00'})
+        # The save reads the tutor's slots once and writes only the difference: one bulk insert and one
+        # delete, which reads the dropped slots again to send the cache-invalidating post_delete signals
+        self.post(self.tutor, 'tutor_availability', 8, data)
+        # Saving the same week again writes nothing
+        self.post(self.tutor, 'tutor_availability', 5, data)
+
+    def test_save_hourly_rate(self):
+        self.post(self.tutor, 'tutor_hourly_rate', 4, {'hourly_rate': '25.00'})
+
+    def test_save_subjects(self):
+        # Syncing the subject index reads the subjects and current links, then deletes and inserts links
+        self.post(self.tutor, 'tutor_subjects', 8, {'subjects': ['Java', 'Ruby']})
+
+    def test_save_lesson_notes(self):
+        self.post(self.tutor, 'save_lesson_notes', 4, {'lesson_id': self.meeting.id, 'notes': 'Recursion'})
@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from tutorials.models import Meeting, TutorAvailability
-from tutorials.calendar_utils import TutorCalendar
+from tutorials.calendar_utils import TutorCalendar, month_skeleton
 from datetime import datetime, date, time, timedelta
 
 class TutorCalendarTest(TestCase):
@@ -155,3 +155,54 @@ class TutorCalendarTest(TestCase):
             for day in week:
                 if day['day'] == 15:
                     self.assertEqual(day['meetings'][0]['notes'], '')
+
+    def test_month_skeleton_is_memoised(self):
+        """Test that the month layout is computed once per month"""
+        month_skeleton.cache_clear()
+        TutorCalendar(2024, 3).get_calendar_data([], [])
+        TutorCalendar(2024, 3).get_calendar_data([], [])
+        self.assertEqual(month_skeleton.cache_info().hits, 1)
+        self.assertIsNone(month_skeleton(2024, 3)[0][0])
+        self.assertEqual(month_skeleton(2024, 3)[0][4], date(2024, 3, 1))
+
+    def test_range_helpers(self):
+        """Test the month and week bounds"""
+        self.assertEqual(TutorCalendar.month_range(2024, 2), (date(2024, 2, 1), date(2024, 2, 29)))
+        self.assertEqual(TutorCalendar.week_range(date(2024, 3, 14)), (date(2024, 3, 11), date(2024, 3, 17)))
+
+    def test_get_meetings_in_range(self):
+        """Test that meetings in a span are fetched in one query with their students"""
+        self.create_test_meeting(date(2024, 2, 28), time(9, 0), time(10, 0))
+        self.create_test_meeting(date(2024, 3, 2), time(9, 0), time(10, 0))
+        self.create_test_meeting(date(2024, 4, 1), time(9, 0), time(10, 0))
+        with self.assertNumQueries(1):
+            meetings = list(TutorCalendar.get_meetings(date(2024, 2, 26), date(2024, 3, 31), tutor=self.tutor))
+            [meeting.student.first_name for meeting in meetings]
+        self.assertEqual([meeting.date for meeting in meetings], [date(2024, 2, 28), date(2024, 3, 2)])
+
+    def test_iter_days_spans_months(self):
+        """Test that a span yields one cell per day with its meetings"""
+        self.create_test_meeting(date(2024, 2, 29), time(9, 0), time(10, 0))
+        self.create_test_meeting(date(2024, 3, 1), time(9, 0), time(10, 0))
+        self.create_test_meeting(date(2024, 3, 1), time(11, 0), time(12, 0))
+        start, end = date(2024, 2, 28), date(2024, 3, 2)
+        meetings = TutorCalendar.get_meetings(start, end, tutor=self.tutor).iterator()
+        days = list(TutorCalendar.iter_days(start, end, meetings, today=date(2024, 3, 1)))
+        self.assertEqual([day['date'] for day in days], [start + timedelta(days=offset) for offset in range(4)])
+        self.assertEqual([len(day['meetings']) for day in days], [0, 1, 2, 0])
+        self.assertEqual([day['is_today'] for day in days], [False, False, True, False])
+        self.assertEqual(days[2]['weekday'], 'Friday')
+
+    def test_iter_days_is_lazy(self):
+        """Test that day cells are produced on demand"""
+        days = TutorCalendar.iter_days(date(2024, 1, 1), date(2099, 12, 31), [])
+        self.assertEqual(next(days)['date'], date(2024, 1, 1))
+
+    def test_iter_weeks_pads_to_monday(self):
+        """Test that weeks start on Monday and are padded at both ends"""
+        weeks = list(TutorCalendar.iter_weeks(date(2024, 3, 14), date(2024, 3, 19), []))
+        self.assertEqual(len(weeks), 2)
+        self.assertTrue(all(len(week) == 7 for week in weeks))
+        self.assertEqual(weeks[0][3]['day'], 14)
+        self.assertEqual(weeks[1][1]['day'], 19)
+        self.assertEqual(weeks[1][2]['day'], '')
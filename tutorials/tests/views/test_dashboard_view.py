@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from tutorials.stats import rebuild_stats
 
 class DashboardViewTests(TestCase):
     fixtures = ['tutorials/tests/fixtures/other_users.json']
@@ -47,3 +48,33 @@ class DashboardViewTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'student/dashboard_student.html')
         self.assertIsNone(response.context.get('lesson'))
+
+class DashboardQueryCountTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/fixtures/test_meetings.json',
+                'tutorials/tests/fixtures/lessons.json',
+                'tutorials/tests/fixtures/tutor_profile.json',
+                'tutorials/tests/fixtures/tutor_availability.json']
+
+    def test_tutor_dashboard_query_count(self):
+        self.client.login(username='@janedoe', password='Password123')
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('dashboard'), {'month': 12, 'year': 2024})
+        self.assertEqual(len(response.context['meetings']), 5)
+
+    def test_tutor_dashboard_query_count_creating_profile(self):
+        get_user_model().objects.get(username='@janedoe').tutor_profile.delete()
+        self.client.login(username='@janedoe', password='Password123')
+        with self.assertNumQueries(8):
+            self.client.get(reverse('dashboard'))
+
+    def test_student_dashboard_query_count(self):
+        self.client.login(username='@charlie', password='Password123')
+        with self.assertNumQueries(3):
+            self.client.get(reverse('dashboard'))
+
+    def test_admin_dashboard_query_count(self):
+        rebuild_stats()
+        self.client.login(username='@petrapickles', password='Password123')
+        with self.assertNumQueries(4):
+            self.client.get(reverse('dashboard'))
@@ -0,0 +1,34 @@
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import User
+
+class FreeTutorsViewTests(TestCase):
+    """Tests of the free tutor lookup."""
+
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/tests/fixtures/tutor_profile.json',
+                'tutorials/tests/fixtures/tutor_availability.json']
+
+    def setUp(self):
+        self.url = reverse('free_tutors')
+        self.tutor = User.objects.get(username='@leslielowe')
+
+    def test_lists_free_tutors_teaching_the_subject(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        response = self.client.get(self.url, {'day': 'tue', 'start_time': '14:00', 'end_time': '15:30', 'subject': 'Java'})
+        self.assertEqual(response.json(), {'tutors': [
+            {'tutor_id': self.tutor.id, 'username': '@leslielowe', 'full_name': 'Leslie Lowe'},
+        ]})
+        response = self.client.get(self.url, {'day': 'tue', 'start_time': '14:00', 'end_time': '15:30', 'subject': 'c++'})
+        self.assertEqual(response.json(), {'tutors': []})
+
+    def test_invalid_lookup(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        response = self.client.get(self.url, {'day': 'tue', 'start_time': '15:30', 'end_time': '14:00'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('__all__', response.json()['errors'])
+
+    def test_non_admin_access_denied(self):
+        self.client.login(username='@janedoe', password='Password123')
+        response = self.client.get(self.url, {'day': 'tue', 'start_time': '14:00', 'end_time': '15:30'})
+        self.assertEqual(response.status_code, 403)
@@ -1,6 +1,9 @@
+import json
+from django.http import StreamingHttpResponse
 from django.test import TestCase
 from django.urls import reverse
 from tutorials.models import User
+from tutorials.search import rebuild_search_index
 
 class UserListViewAccessTests(TestCase):
     fixtures = ['tutorials/tests/fixtures/other_users.json']
@@ -44,3 +47,134 @@ class UserListViewAccessTests(TestCase):
         response = self.client.get(reverse('user_list', args=['tutors']))
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "partials/lists.html")
+
+class UserListQueryCountTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/fixtures/test_meetings.json',
+                'tutorials/tests/fixtures/tutor_profile.json',
+                'tutorials/tests/fixtures/tutor_availability.json']
+
+    def setUp(self):
+        rebuild_search_index()
+
+    def add_tutors(self, count):
+        for index in range(count):
+            User.objects.create(username=f'@tutor{index}', email=f'tutor{index}@example.org', user_type='Tutor')
+
+    def test_tutor_list_query_count_does_not_grow(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('user_list', args=['tutors']))
+        self.assertEqual(len(response.context['users'][0].availability), 1)
+
+        self.add_tutors(30)
+        with self.assertNumQueries(5):
+            self.client.get(reverse('user_list', args=['tutors']))
+
+    def test_filtered_tutor_list_query_count(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('user_list', args=['tutors']), {'subjects': ['Ruby']})
+        self.assertEqual([user.username for user in response.context['users']], ['@leslielowe'])
+
+    def test_student_list_query_count(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('user_list', args=['students']))
+        self.assertEqual(response.context['users'][0].current_tutors, ['@janedoe'])
+
+    def test_student_list_follows_cursor(self):
+        User.objects.bulk_create([
+            User(username=f'@student{index}', email=f'student{index}@example.org',
+                 first_name='Student', last_name=f'Zed{index:02d}', user_type='Student')
+            for index in range(30)
+        ])
+        self.client.login(username='@petrapickles', password='Password123')
+        first = self.client.get(reverse('user_list', args=['students']))
+        self.assertContains(first, f'?cursor={first.context["users"].next_cursor}')
+        second = self.client.get(reverse('user_list', args=['students']), {'cursor': first.context['users'].next_cursor})
+        self.assertEqual(len(first.context['users']) + len(second.context['users']), 32)
+        self.assertEqual(second.context['users'][-1].last_name, 'Zed29')
+
+    def test_student_list_search(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('user_list', args=['students']), {'q': 'mike'})
+        self.assertEqual([user.username for user in response.context['users']], ['@mikemiles'])
+        self.assertContains(response, 'value="mike"')
+
+    def test_tutor_list_search_combines_with_subjects(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        response = self.client.get(reverse('user_list', args=['tutors']), {'q': 'jane', 'subjects': ['Ruby']})
+        self.assertEqual(list(response.context['users']), [])
+        response = self.client.get(reverse('user_list', args=['tutors']), {'q': 'les', 'subjects': ['Ruby']})
+        self.assertEqual([user.username for user in response.context['users']], ['@leslielowe'])
+
+class UserListExportTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/fixtures/test_meetings.json',
+                'tutorials/tests/fixtures/tutor_profile.json',
+                'tutorials/tests/fixtures/tutor_availability.json']
+
+    def setUp(self):
+        rebuild_search_index()
+
+    def export(self, list_type, data):
+        response = self.client.get(reverse('user_list', args=[list_type]), data)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_student_list_csv(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        response, content = self.export('students', {'format': 'csv'})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="students.csv"', response['Content-Disposition'])
+        lines = content.splitlines()
+        self.assertEqual(lines[0], 'username,email,first_name,last_name,current_tutors')
+        self.assertTrue(lines[1].startswith("'@charlie,"))
+        self.assertTrue(lines[1].endswith(",'@janedoe"))
+        self.assertEqual(len(lines), 3)
+
+    def test_csv_cells_are_not_formulas(self):
+        User.objects.filter(username='@charlie').update(first_name='=HYPERLINK("http://example.org")', last_name='-1+2')
+        self.client.login(username='@petrapickles', password='Password123')
+        response, content = self.export('students', {'format': 'csv', 'q': 'charlie'})
+        self.assertEqual(content.splitlines()[1].split(',', 2)[2], '"\'=HYPERLINK(""http://example.org"")",\'-1+2,\'@janedoe')
+        response, content = self.export('students', {'format': 'ndjson', 'q': 'charlie'})
+        self.assertEqual(json.loads(content)['first_name'], '=HYPERLINK("http://example.org")')
+
+    def test_tutor_list_ndjson(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        response, content = self.export('tutors', {'format': 'ndjson'})
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['username'] for row in rows], ['@janedoe', '@leslielowe'])
+        self.assertEqual(rows[0]['subjects'], ['c++', 'python', 'java'])
+        self.assertEqual(rows[0]['hourly_rate'], '17.50')
+        self.assertEqual(rows[0]['availability'], ['Monday 09:00-18:00'])
+
+    def test_export_applies_filters(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        response, content = self.export('tutors', {'format': 'ndjson', 'subjects': ['Ruby']})
+        self.assertEqual([json.loads(line)['username'] for line in content.splitlines()], ['@leslielowe'])
+        response, content = self.export('students', {'format': 'csv', 'q': 'mike'})
+        self.assertEqual(len(content.splitlines()), 2)
+
+    def test_export_annotates_per_chunk(self):
+        User.objects.bulk_create([
+            User(username=f'@tutor{index}', email=f'tutor{index}@example.org', user_type='Tutor')
+            for index in range(30)
+        ])
+        self.client.login(username='@petrapickles', password='Password123')
+        with self.assertNumQueries(4):
+            response, content = self.export('tutors', {'format': 'csv'})
+        self.assertEqual(len(content.splitlines()), 33)
+
+    def test_tutor_cannot_export_tutors(self):
+        self.client.login(username='@janedoe', password='Password123')
+        response = self.client.get(reverse('user_list', args=['tutors']), {'format': 'csv'})
+        self.assertNotIsInstance(response, StreamingHttpResponse)
+
+    def test_unknown_format_renders_page(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        response = self.client.get(reverse('user_list', args=['students']), {'format': 'xml'})
+        self.assertTemplateUsed(response, 'partials/lists.html')
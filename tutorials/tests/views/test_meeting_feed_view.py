@@ -0,0 +1,78 @@
+from datetime import time
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.ics import feed_token, fold
+from tutorials.models import Meeting, User
+
+class MeetingFeedViewTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/fixtures/test_meetings.json']
+
+    def setUp(self):
+        self.tutor = User.objects.get(username='@janedoe')
+        self.student = User.objects.get(username='@charlie')
+        self.url = reverse('meeting_feed', args=[feed_token(self.tutor)])
+
+    def get_body(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_feed_streams_every_meeting(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = self.get_body(response)
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(body.endswith('END:VCALENDAR\r\n'))
+        self.assertEqual(body.count('BEGIN:VEVENT'), 5)
+        self.assertIn('DTSTART:20241209T140000', body)
+        self.assertIn('SUMMARY:Python Basics', body)
+
+    def test_student_feed_has_only_their_meetings(self):
+        url = reverse('meeting_feed', args=[feed_token(self.student)])
+        body = self.get_body(self.client.get(url))
+        self.assertEqual(body.count('BEGIN:VEVENT'), Meeting.objects.filter(student=self.student).count())
+
+    def test_text_is_escaped(self):
+        Meeting.objects.filter(pk=1).update(topic='Loops, lists; and more', notes='Line one\nLine two')
+        body = self.get_body(self.client.get(self.url))
+        self.assertIn('SUMMARY:Loops\\, lists\\; and more', body)
+        self.assertIn('Line one\\nLine two', body.replace('\r\n ', ''))
+
+    def test_long_lines_are_folded(self):
+        line = fold('DESCRIPTION:' + 'é' * 80)
+        self.assertTrue(all(len(part.encode()) <= 75 for part in line.rstrip('\r\n').split('\r\n')))
+        self.assertEqual(line.replace('\r\n ', ''), 'DESCRIPTION:' + 'é' * 80 + '\r\n')
+
+    def test_not_modified_since_latest_update(self):
+        response = self.client.get(self.url)
+        last_modified = response['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_modified_after_meeting_changes(self):
+        response = self.client.get(self.url)
+        Meeting.objects.create(tutor=self.tutor, student=self.student, date='2024-12-30',
+                               start_time=time(9, 0), end_time=time(10, 0))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_deleted_meeting_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        Meeting.objects.filter(pk=1).delete()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_invalid_token(self):
+        response = self.client.get(reverse('meeting_feed', args=['not-a-token']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_admin_has_no_feed(self):
+        admin = User.objects.get(username='@petrapickles')
+        response = self.client.get(reverse('meeting_feed', args=[feed_token(admin)]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_dashboard_links_to_feed(self):
+        self.client.login(username='@charlie', password='Password123')
+        response = self.client.get(reverse('dashboard'))
+        self.assertIn(reverse('meeting_feed', args=[feed_token(self.student)]), response.context['calendar_feed_url'])
+        self.assertContains(response, 'calendarFeedUrl')
@@ -0,0 +1,40 @@
+from django.contrib.messages import get_messages
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import Lesson, Meeting
+
+class ScheduleAllSessionsViewTests(TestCase):
+    """Tests of the batch scheduling view."""
+
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/tests/fixtures/lessons.json',
+                'tutorials/tests/fixtures/tutor_profile.json',
+                'tutorials/tests/fixtures/tutor_availability.json']
+
+    def setUp(self):
+        self.url = reverse('schedule_all_sessions')
+
+    def test_schedules_outstanding_requests(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        response = self.client.post(self.url)
+        self.assertRedirects(response, reverse('dashboard'))
+        self.assertEqual(Meeting.objects.values('student').distinct().count(), 2)
+        self.assertFalse(Lesson.objects.exists())
+        messages = [str(message) for message in get_messages(response.wsgi_request)]
+        self.assertEqual(messages, [f'Scheduled {Meeting.objects.count()} sessions. 0 requests could not be placed.'])
+
+    def test_get_not_allowed(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 405)
+
+    def test_non_admin_access_denied(self):
+        self.client.login(username='@janedoe', password='Password123')
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Lesson.objects.count(), 2)
+
+    def test_dashboard_shows_batch_button(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, f'action="{self.url}"')
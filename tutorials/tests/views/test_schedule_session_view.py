@@ -7,7 +7,8 @@ from tutorials.forms import MeetingForm
 class ScheduleSessionViewTests(TestCase):
     """Tests of the session scheduling view."""
 
-    fixtures = ['tutorials/tests/fixtures/other_users.json', 'tutorials/tests/fixtures/lessons.json']
+    fixtures = ['tutorials/tests/fixtures/other_users.json', 'tutorials/tests/fixtures/lessons.json',
+                'tutorials/tests/fixtures/tutor_profile.json']
     def setUp(self):
         self.admin = User.objects.get(username='@petrapickles')
         self.tutor = User.objects.get(username='@janedoe')
@@ -34,6 +35,14 @@ class ScheduleSessionViewTests(TestCase):
         self.assertEqual(form.initial['start_time'], self.lesson.start_time)
         self.assertEqual(form.initial['end_time'], self.lesson.end_time)
     
+    def test_get_schedule_session_suggests_tutors(self):
+        self.client.login(username=self.admin.username, password="Password123")
+        response = self.client.get(self.schedule_session_url)
+        matches = response.context['tutor_matches']
+        self.assertEqual([match['username'] for match in matches], ['@janedoe', '@leslielowe'])
+        self.assertEqual(response.context['form'].initial['tutor'], self.tutor.id)
+        self.assertContains(response, 'data-tutor="%d"' % self.tutor.id)
+
     def test_successful_schedule_meeting(self):
         self.client.login(username=self.admin.username, password="Password123")
         form_data = {
@@ -66,3 +75,113 @@ class ScheduleSessionViewTests(TestCase):
         form = response.context['form']
         self.assertTrue(isinstance(form, MeetingForm))
         self.assertTrue(form.errors)
+
+    def test_overlapping_meeting_is_rejected(self):
+        Meeting.objects.create(
+            tutor=self.tutor, student=User.objects.get(username='@mikemiles'), date='2024-12-12', day='thu',
+            start_time='10:30', end_time='11:30', topic='Python'
+        )
+        self.client.login(username=self.admin.username, password="Password123")
+        form_data = {
+            'tutor': self.tutor.id,
+            'date': '2024-12-12',
+            'day': 'thu',
+            'start_time': self.lesson.start_time,
+            'end_time': self.lesson.end_time,
+            'time_of_day': 'morning',
+            'topic': 'Test meeting',
+            'status': 'scheduled',
+        }
+        response = self.client.post(self.schedule_session_url, form_data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('@janedoe already has a meeting from 10:30 to 11:30', str(response.context['form'].non_field_errors()))
+        self.assertEqual(Meeting.objects.count(), 1)
+        self.assertTrue(Lesson.objects.filter(id=self.lesson.id).exists())
+
+    def test_repeat_weekly_books_the_rest_of_the_term(self):
+        self.client.login(username=self.admin.username, password="Password123")
+        form_data = {
+            'tutor': self.tutor.id,
+            'date': '2024-12-02',
+            'day': 'mon',
+            'start_time': self.lesson.start_time,
+            'end_time': self.lesson.end_time,
+            'time_of_day': 'morning',
+            'topic': 'Python',
+            'status': 'scheduled',
+            'repeat_weekly': 'on',
+        }
+        response = self.client.post(self.schedule_session_url, form_data)
+        self.assertRedirects(response, reverse('dashboard'))
+        # The request's Monday, Wednesday and Friday from 2 December to the end of the autumn term
+        meetings = Meeting.objects.filter(student=self.student)
+        self.assertEqual(meetings.count(), 13)
+        self.assertEqual([meeting.day for meeting in meetings[:3]], ['mon', 'wed', 'fri'])
+        self.assertEqual(meetings.last().date.isoformat(), '2024-12-30')
+        self.assertFalse(Lesson.objects.filter(id=self.lesson.id).exists())
+
+    def test_repeat_weekly_is_rejected_if_any_week_clashes(self):
+        Meeting.objects.create(
+            tutor=self.tutor, student=User.objects.get(username='@mikemiles'), date='2024-12-18', day='wed',
+            start_time='10:30', end_time='11:30', topic='Python'
+        )
+        self.client.login(username=self.admin.username, password="Password123")
+        form_data = {
+            'tutor': self.tutor.id,
+            'date': '2024-12-02',
+            'day': 'mon',
+            'start_time': self.lesson.start_time,
+            'end_time': self.lesson.end_time,
+            'time_of_day': 'morning',
+            'topic': 'Python',
+            'status': 'scheduled',
+            'repeat_weekly': 'on',
+        }
+        response = self.client.post(self.schedule_session_url, form_data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('2024-12-18', str(response.context['form'].non_field_errors()))
+        self.assertEqual(Meeting.objects.count(), 1)
+        self.assertTrue(Lesson.objects.filter(id=self.lesson.id).exists())
+
+    def test_repeat_weekly_ignores_a_clash_on_an_unbooked_entered_date(self):
+        # The entered Thursday is not one of the requested days, so only its clash is ignored
+        Meeting.objects.create(
+            tutor=self.tutor, student=User.objects.get(username='@mikemiles'), date='2024-12-05', day='thu',
+            start_time='10:30', end_time='11:30', topic='Python'
+        )
+        self.client.login(username=self.admin.username, password="Password123")
+        form_data = {
+            'tutor': self.tutor.id,
+            'date': '2024-12-05',
+            'day': 'thu',
+            'start_time': self.lesson.start_time,
+            'end_time': self.lesson.end_time,
+            'time_of_day': 'morning',
+            'topic': 'Python',
+            'status': 'scheduled',
+            'repeat_weekly': 'on',
+        }
+        response = self.client.post(self.schedule_session_url, form_data)
+        self.assertRedirects(response, reverse('dashboard'))
+        self.assertEqual(Meeting.objects.filter(student=self.student).first().date.isoformat(), '2024-12-06')
+
+    def test_repeat_weekly_is_rejected_if_no_requested_day_is_left(self):
+        self.lesson.days = ['mon']
+        self.lesson.save()
+        self.client.login(username=self.admin.username, password="Password123")
+        form_data = {
+            'tutor': self.tutor.id,
+            'date': '2026-12-29',
+            'day': 'tue',
+            'start_time': self.lesson.start_time,
+            'end_time': self.lesson.end_time,
+            'time_of_day': 'morning',
+            'topic': 'Python',
+            'status': 'scheduled',
+            'repeat_weekly': 'on',
+        }
+        response = self.client.post(self.schedule_session_url, form_data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('None of the requested days', str(response.context['form'].non_field_errors()))
+        self.assertFalse(Meeting.objects.exists())
+        self.assertTrue(Lesson.objects.filter(id=self.lesson.id).exists())
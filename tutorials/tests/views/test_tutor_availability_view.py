@@ -148,6 +148,45 @@ class TutorAvailabilityFunctionViewTests(TestCase):
         response = self.client.post(reverse('tutor_availability'), data) 
         self.assertEqual(TutorAvailability.objects.filter(tutor=self.tutor_user).count(), 0) 
          
+    def test_tutor_availability_keeps_unchanged_slots(self):
+        kept = TutorAvailability.objects.create(tutor=self.tutor_user, day='Monday', start_time=time(9), end_time=time(12))
+        data = {
+            'monday_enabled': 'on',
+            'monday_start_time': '09:00',
+            'monday_end_time': '12:00',
+            'tuesday_enabled': 'on',
+            'tuesday_start_time': '14:00',
+            'tuesday_end_time': '17:00',
+        }
+        self.client.login(username='@janedoe', password='Password123')
+        self.client.post(reverse('tutor_availability'), data)
+        self.assertTrue(TutorAvailability.objects.filter(pk=kept.pk).exists())
+        self.assertEqual(TutorAvailability.objects.filter(tutor=self.tutor_user).count(), 2)
+
+    def test_tutor_availability_unticked_day_is_removed(self):
+        TutorAvailability.objects.create(tutor=self.tutor_user, day='Monday', start_time=time(9), end_time=time(12))
+        data = {
+            'monday_start_time': '09:00',
+            'monday_end_time': '12:00',
+        }
+        self.client.login(username='@janedoe', password='Password123')
+        self.client.post(reverse('tutor_availability'), data)
+        self.assertFalse(TutorAvailability.objects.filter(tutor=self.tutor_user).exists())
+
+    def test_tutor_availability_invalid_slot_is_skipped(self):
+        data = {
+            'monday_enabled': 'on',
+            'monday_start_time': '10:00',
+            'monday_end_time': '12:00',
+            'tuesday_enabled': 'on',
+            'tuesday_start_time': 'noon',
+            'tuesday_end_time': '14:00',
+        }
+        self.client.login(username='@janedoe', password='Password123')
+        self.client.post(reverse('tutor_availability'), data)
+        slot = TutorAvailability.objects.get(tutor=self.tutor_user)
+        self.assertEqual((slot.day, slot.start_time, slot.end_time), ('Monday', time(10), time(12)))
+
     def test_tutor_availability_redirect_on_get(self):
         response = self.client.get(reverse('tutor_availability'))
         self.assertRedirects(response, reverse('log_in') + '?next=' + reverse('tutor_availability'))
@@ -0,0 +1,68 @@
+from datetime import time
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import Meeting, User
+
+class TutorCalendarJsonViewTests(TestCase):
+    fixtures = ['tutorials/tests/fixtures/other_users.json',
+                'tutorials/fixtures/test_meetings.json']
+
+    def setUp(self):
+        self.tutor = User.objects.get(username='@janedoe')
+        self.url = reverse('tutor_calendar_json', args=[2024, 12])
+
+    def get_days(self, response):
+        return {day['day']: day for week in response.json()['weeks'] for day in week if day['day']}
+
+    def test_tutor_gets_own_month(self):
+        self.client.login(username='@janedoe', password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['month_name'], 'December')
+        days = self.get_days(response)
+        self.assertEqual(days[9]['meetings'][0]['topic'], 'Python Basics')
+        self.assertEqual(days[9]['date'], '2024-12-09')
+        self.assertEqual(sum(len(day['meetings']) for day in days.values()), 5)
+        self.assertIn('ETag', response)
+
+    def test_unchanged_month_returns_not_modified(self):
+        self.client.login(username='@janedoe', password='Password123')
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_changed_month_returns_new_etag(self):
+        self.client.login(username='@janedoe', password='Password123')
+        etag = self.client.get(self.url)['ETag']
+        Meeting.objects.create(tutor=self.tutor, student=User.objects.get(username='@charlie'),
+                               date='2024-12-30', start_time=time(9, 0), end_time=time(10, 0))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_deleted_meeting_changes_etag(self):
+        self.client.login(username='@janedoe', password='Password123')
+        etag = self.client.get(self.url)['ETag']
+        Meeting.objects.filter(date='2024-12-09').delete()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_admin_chooses_tutor(self):
+        self.client.login(username='@petrapickles', password='Password123')
+        response = self.client.get(self.url, {'tutor': self.tutor.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.get(self.url, {'tutor': 4}).status_code, 404)
+
+    def test_tutor_cannot_choose_another_tutor(self):
+        self.client.login(username='@leslielowe', password='Password123')
+        response = self.client.get(self.url, {'tutor': self.tutor.id})
+        self.assertEqual(sum(len(day['meetings']) for day in self.get_days(response).values()), 0)
+
+    def test_student_is_forbidden(self):
+        self.client.login(username='@charlie', password='Password123')
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_invalid_month(self):
+        self.client.login(username='@janedoe', password='Password123')
+        self.assertEqual(self.client.get(reverse('tutor_calendar_json', args=[2024, 13])).status_code, 404)
@@ -5,7 +5,9 @@ from .login_views import LogInView, log_out
 from .signup_view import SignUpView
 from .profile_views import ProfileUpdateView, PasswordView
 from .student_views import view_lesson_request, create_lesson_request, submit_review
-from .admin_views import schedule_session
+from .admin_views import schedule_session, schedule_all_sessions, free_tutors
+from .calendar_views import tutor_calendar_json
+from .feed_views import meeting_feed
 from .tutor_views import(
     tutor_availability, 
     tutor_hourly_rate, 
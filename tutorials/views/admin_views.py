@@ -1,8 +1,16 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.core.exceptions import ValidationError
 from django.shortcuts import redirect, render, get_object_or_404
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET, require_POST
 from tutorials.models import User, Lesson, Meeting
-from tutorials.forms import MeetingForm
+from tutorials.forms import FreeTutorsForm, MeetingForm
+from tutorials.assignment import assign_outstanding_lessons
+from tutorials.availability import get_availability_matrix
+from tutorials.matching import match_tutors
+from tutorials.scheduling import book_meetings, save_meeting
+from tutorials.terms import term_meetings
 
 from tutorials.helpers import (
     user_role_required, 
@@ -18,20 +26,63 @@ def schedule_session(request, student_id):
     lesson_request = Lesson.objects.filter(student=student).first()
 
     lesson_start_time, lesson_end_time = get_lesson_times(lesson_request)
+    tutor_matches = match_tutors(lesson_request) if lesson_request else []
 
     if request.method == 'POST':
-        form = MeetingForm(request.POST)
+        form = MeetingForm(request.POST, instance=Meeting(student=student))
+        if not lesson_request:
+            del form.fields['repeat_weekly']
         if form.is_valid():
             meeting = form.save(commit=False)
-            meeting.student = student
-            meeting.save()
+            try:
+                if form.cleaned_data.get('repeat_weekly'):
+                    book_meetings(term_meetings(meeting, lesson_request.term, lesson_request.days or [meeting.day]))
+                else:
+                    save_meeting(meeting)
+            except ValidationError as error:
+                # Another booking for the tutor or student landed after the form was checked,
+                # a later week of the term clashes, or none of the requested days is left in the term
+                form.add_error(None, error)
+            else:
+                delete_lesson_request(lesson_request)
 
-            delete_lesson_request(lesson_request)
-
-            return redirect('dashboard')  # Redirect to the admin dashboard
+                return redirect('dashboard')  # Redirect to the admin dashboard
     else:
         form = MeetingForm(initial={'student': student, 
                                     'start_time': lesson_start_time, 
-                                    'end_time': lesson_end_time,})
+                                    'end_time': lesson_end_time,
+                                    'tutor': tutor_matches[0]['tutor_id'] if tutor_matches else None,
+                                    'repeat_weekly': True,})
+        if not lesson_request:
+            del form.fields['repeat_weekly']
+
+    return render(request, 'admin/schedule_session.html', {
+        'form': form,
+        'student': student,
+        'request': lesson_request,
+        'tutor_matches': tutor_matches,
+    })
+@login_required
+@user_role_required('Admin')
+@require_POST
+def schedule_all_sessions(request):
+    """Schedule every outstanding lesson request that fits a tutor, in one batch"""
+    meetings, unassigned = assign_outstanding_lessons()
+    messages.success(request, f"Scheduled {len(meetings)} sessions. {len(unassigned)} requests could not be placed.")
+    return redirect('dashboard')
 
-    return render(request, 'admin/schedule_session.html', {'form': form, 'student': student, 'request': lesson_request})
\ No newline at end of file
+@login_required
+@user_role_required('Admin')
+@require_GET
+def free_tutors(request):
+    """Return the tutors free every week on ?day= from ?start_time= to ?end_time=, teaching ?subject= if given, as JSON"""
+    form = FreeTutorsForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    tutors = get_availability_matrix().free_tutors(
+        form.cleaned_data['day'],
+        form.cleaned_data['start_time'],
+        form.cleaned_data['end_time'],
+        form.cleaned_data['subject'] or None,
+    )
+    return JsonResponse({'tutors': tutors})
@@ -0,0 +1,54 @@
+import hashlib
+from datetime import date
+from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Max
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import condition, require_GET
+from tutorials.calendar_utils import TutorCalendar
+from tutorials.helpers import user_role_required
+from tutorials.models import User
+
+def get_calendar_tutor(request):
+    """Return the tutor whose calendar is requested: the user themselves, or ?tutor=<id> for admins."""
+
+    if request.user.user_type == 'Admin' and request.GET.get('tutor'):
+        return get_object_or_404(User, id=request.GET['tutor'], user_type='Tutor')
+    if request.user.user_type != 'Tutor':
+        raise Http404("Choose a tutor.")
+    return request.user
+
+def get_calendar_range(year, month):
+    try:
+        return TutorCalendar.month_range(year, month)
+    except ValueError:
+        raise Http404("No such month.")
+
+def calendar_etag(request, year, month):
+    """Fingerprint a month's meetings by their latest update and count, plus today for the highlighted day."""
+
+    tutor = get_calendar_tutor(request)
+    start, end = get_calendar_range(year, month)
+    fingerprint = TutorCalendar.get_meetings(start, end, tutor=tutor).order_by().aggregate(
+        latest=Max('updated_at'),
+        total=Count('id')
+    )
+    raw = f"{tutor.pk}:{start}:{fingerprint['latest']}:{fingerprint['total']}:{date.today()}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+@login_required
+@user_role_required(['Tutor', 'Admin'])
+@require_GET
+@condition(etag_func=calendar_etag)
+def tutor_calendar_json(request, year, month):
+    """
+    Return a tutor's calendar for one month as JSON.
+
+    Responses carry an ETag built from one aggregate query, so a client
+    revisiting an unchanged month gets a 304 without the calendar being rebuilt.
+    """
+
+    tutor = get_calendar_tutor(request)
+    start, end = get_calendar_range(year, month)
+    meetings = TutorCalendar.get_meetings(start, end, tutor=tutor)
+    return JsonResponse(TutorCalendar(year, month).get_calendar_data([], meetings))
@@ -1,73 +1,46 @@
 
-from datetime import datetime
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
-from tutorials.models import Meeting, TutorProfile, TutorAvailability
+from django.urls import reverse
 
+from tutorials.ics import feed_token
 from tutorials.helpers import (
     admin_dashboard_context, 
     tutor_dashboard_context, 
-    get_meetings_sorted,
+    student_dashboard_context,
 )
 
-from tutorials.calendar_utils import TutorCalendar
+DASHBOARDS = {
+    'Tutor': ('tutor/dashboard_tutor.html', tutor_dashboard_context),
+    'Student': ('student/dashboard_student.html', student_dashboard_context),
+    'Admin': ('admin/dashboard_admin.html', lambda request, user: admin_dashboard_context(request.GET)),
+}
 
 @login_required
 def dashboard(request):
-    """Display the current user's dashboard."""
+    """
+    Display the current user's dashboard.
+
+    Each role's context is built once by its own builder. Including the two
+    queries that load the session and user, a page costs at most:
+        Tutor:   5 queries (8 on the first visit, which creates the profile)
+        Student: 3 queries
+        Admin:   4 queries
+    Tutor and student contexts are cached per user, so repeat visits with
+    unchanged data only cost the two session queries.
+    """
 
     current_user = request.user
-    user_type = current_user.user_type
-    meetings = get_meetings_sorted(current_user)
+    template, build_context = DASHBOARDS.get(current_user.user_type, DASHBOARDS['Student'])
 
     context = {
         'user': current_user,
         'days': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'],
-        'meetings_sorted': meetings,
     }
-
-    if user_type == 'Tutor':
-        context.update(tutor_dashboard_context(request, current_user))
-        tutor_profile, created = TutorProfile.objects.get_or_create(tutor=current_user)
-
-        current_date = datetime.now()
-        month = int(request.GET.get('month')) if request.GET.get('month') else current_date.month
-        year = int(request.GET.get('year')) if request.GET.get('year') else current_date.year
-
-        meetings = Meeting.objects.filter(
-            tutor=current_user, 
-            date__year=year,
-            date__month=month
-        ).select_related('student')
-        
-        availability_slots = TutorAvailability.objects.filter(tutor=request.user)
-
-        calendar = TutorCalendar(year, month)
-        calendar_data = calendar.get_calendar_data(
-            meetings=meetings,
-            availability_slots=availability_slots
+    context.update(build_context(request, current_user))
+    if current_user.user_type in ['Tutor', 'Student']:
+        context['calendar_feed_url'] = request.build_absolute_uri(
+            reverse('meeting_feed', args=[feed_token(current_user)])
         )
-
-        subject_choices = {
-            'Computer Programming' : ['Ruby', 'Swift', 'Scala', 'Java', 'Javascript/React', 'Python/Tensorflow', 'C++', 'C#'],
-        }
-
-        context.update({
-            'tutor_profile': tutor_profile,
-            'availability_slots': availability_slots,
-            'hourly_rate': tutor_profile.hourly_rate or '',
-            'subject_choices': subject_choices,
-            'selected_subjects': tutor_profile.subjects,
-            'calendar_data': calendar_data,
-            'meetings': meetings,
-        })
-        template = 'tutor/dashboard_tutor.html'
-    elif user_type == 'Student':
-        template = 'student/dashboard_student.html'
-    elif user_type == 'Admin':
-        context.update(admin_dashboard_context())
-        template = 'admin/dashboard_admin.html'
-    else:
-        template = 'student/dashboard_student.html'
     
-    return render(request, template, context)
\ No newline at end of file
+    return render(request, template, context)
@@ -0,0 +1,64 @@
+import hashlib
+from django.db.models import Count, Max, Q
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import condition, require_GET
+from tutorials.ics import feed_user_id, iter_calendar
+from tutorials.models import Meeting, User
+
+FEED_CHUNK_SIZE = 500
+
+def get_feed_user(request, token):
+    """Return the tutor or student the token belongs to, memoised on the request."""
+
+    if not hasattr(request, 'feed_user'):
+        user_id = feed_user_id(token)
+        if user_id is None:
+            raise Http404("Unknown feed.")
+        request.feed_user = get_object_or_404(User, pk=user_id, user_type__in=['Tutor', 'Student'])
+    return request.feed_user
+
+def get_feed_meetings(user):
+    return Meeting.objects.filter(Q(tutor=user) | Q(student=user))
+
+def feed_fingerprint(request, token):
+    """Return the latest update and count of the feed's meetings, memoised on the request."""
+
+    if not hasattr(request, 'feed_fingerprint'):
+        request.feed_fingerprint = get_feed_meetings(get_feed_user(request, token)).order_by().aggregate(
+            latest=Max('updated_at'),
+            total=Count('id')
+        )
+    return request.feed_fingerprint
+
+def feed_etag(request, token):
+    fingerprint = feed_fingerprint(request, token)
+    return hashlib.md5(f"{token}:{fingerprint['latest']}:{fingerprint['total']}".encode()).hexdigest()
+
+def feed_last_modified(request, token):
+    return feed_fingerprint(request, token)['latest']
+
+@require_GET
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+def meeting_feed(request, token):
+    """
+    Stream a user's meetings as an iCalendar subscription feed.
+
+    The feed is addressed by a signed token, since calendar apps cannot log
+    in. Meetings are read in chunks and written out event by event, and
+    unchanged feeds are answered with 304 from one aggregate query; the
+    ETag also covers the meeting count, so deletions are noticed.
+    """
+
+    user = get_feed_user(request, token)
+    meetings = get_feed_meetings(user).select_related('tutor', 'student').order_by('date', 'start_time', 'id')
+    response = StreamingHttpResponse(
+        iter_calendar(
+            meetings.iterator(chunk_size=FEED_CHUNK_SIZE),
+            f"{user.full_name()}'s tutoring sessions",
+            request.get_host().split(':')[0]
+        ),
+        content_type='text/calendar; charset=utf-8'
+    )
+    response['Content-Disposition'] = 'inline; filename="meetings.ics"'
+    return response
@@ -6,7 +6,9 @@ from django.http import JsonResponse
 from django.shortcuts import redirect, get_object_or_404
 from django.views.decorators.http import require_http_methods
 
-from tutorials.models import TutorProfile, TutorAvailability, Meeting
+from tutorials.availability import save_weekly_availability
+from tutorials.forms import TutorAvailabilityForm
+from tutorials.models import TutorProfile, Meeting
 
 
 # Dashboard views
@@ -16,24 +18,19 @@ from django.http import JsonResponse
 @login_required
 def tutor_availability(request):
     if request.method == 'POST':
-        # Clear existing availability
-        TutorAvailability.objects.filter(tutor=request.user).delete()
-        
-        # Process each day
+        # One slot per ticked day; days without both times, or with times that do not parse, are skipped
+        slots = set()
         for day in ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']:
             if request.POST.get(f'{day}_enabled'):
-                start_time = request.POST.get(f'{day}_start_time')
-                end_time = request.POST.get(f'{day}_end_time')
-                
-                if start_time and end_time:
-                    TutorAvailability.objects.create(
-                        tutor=request.user,
-                        day=day.capitalize(),
-                        start_time=start_time,
-                        end_time=end_time,
-                        is_available=True
-                    )
-        
+                form = TutorAvailabilityForm({
+                    'day': day.capitalize(),
+                    'start_time': request.POST.get(f'{day}_start_time'),
+                    'end_time': request.POST.get(f'{day}_end_time'),
+                })
+                if form.is_valid():
+                    slots.add((day.capitalize(), form.cleaned_data['start_time'], form.cleaned_data['end_time']))
+
+        save_weekly_availability(request.user, slots)
         messages.success(request, 'Availability updated successfully')
         return redirect('dashboard')
     
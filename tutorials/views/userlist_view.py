@@ -1,11 +1,16 @@
 
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponseForbidden
+from tutorials.exports import EXPORT_CONTENT_TYPES
 from tutorials.helpers import (
     handle_students_list,
     handle_tutors_list,
     handle_invalid_or_forbidden_list,
+    handle_user_search,
+    export_user_list,
     paginate_users,
+    annotate_students_with_tutors,
+    annotate_tutors_with_availability,
     render_user_list
 )
 
@@ -16,13 +21,24 @@ def user_list(request, list_type):
         return HttpResponseForbidden("You do not have permission to access this page.")
 
     users, title, filters = [], "Invalid List Type", {}
+    listed = list_type == 'students' or (list_type == 'tutors' and request.user.user_type == 'Admin')
 
     if list_type == 'students':
         users, title = handle_students_list(request)
-    elif list_type == 'tutors' and request.user.user_type == 'Admin':
+    elif listed:
         users, title, filters = handle_tutors_list(request)
     else:
         users, title, filters = handle_invalid_or_forbidden_list(list_type, request.user.user_type)
 
+    if listed:
+        users = handle_user_search(request, users, filters)
+        export_format = request.GET.get('format')
+        if export_format in EXPORT_CONTENT_TYPES:
+            return export_user_list(users, list_type, export_format)
     users = paginate_users(request, users)
+    # Annotate only the visible page, in one query however many users exist
+    if list_type == 'students':
+        annotate_students_with_tutors(users.object_list)
+    elif listed:
+        annotate_tutors_with_availability(users.object_list)
     return render_user_list(request, users, title, filters)
\ No newline at end of file